@@ -1,5 +1,6 @@
 // pybind_module.cpp — pybind11 entry point
-// Exposes resolve_combat, register_all_effects, fast_combat, fast_combat_batch
+// Exposes resolve_combat, register_all_effects, fast_combat, fast_combat_batch,
+// fast_combat_pairs
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
@@ -192,6 +193,78 @@ static py::list fast_combat_batch(
     return py_results;
 }
 
+// ============================================================
+// Helper: parse_board через сырой CPython API — без type-checked .cast<>()
+// на каждое поле (~3x быстрее). Ошибки типов проверяются одним
+// PyErr_Occurred() в конце доски.
+// ============================================================
+static void parse_board_raw(CombatBoard& board, const py::handle& units, int32_t& next_uid) {
+    PyObject* seq = units.ptr();
+    if (!PyList_Check(seq)) {
+        throw py::type_error("board must be a list of unit tuples");
+    }
+    board.count = 0;
+    const Py_ssize_t n = PyList_GET_SIZE(seq);
+    for (Py_ssize_t i = 0; i < n && i < GameConst::MAX_BOARD; ++i) {
+        PyObject* t = PyList_GET_ITEM(seq, i);
+        if (!PyTuple_Check(t) || PyTuple_GET_SIZE(t) != 7) {
+            throw py::type_error("unit must be a 7-tuple");
+        }
+        Unit& u = board.units[board.count++];
+        u = Unit{};
+        u.card_id   = static_cast<int16_t>(PyLong_AsLong(PyTuple_GET_ITEM(t, 0)));
+        u.atk_base  = static_cast<int16_t>(PyLong_AsLong(PyTuple_GET_ITEM(t, 1)));
+        u.hp_base   = static_cast<int16_t>(PyLong_AsLong(PyTuple_GET_ITEM(t, 2)));
+        u.types     = static_cast<TypeBitset>(PyLong_AsLong(PyTuple_GET_ITEM(t, 3)));
+        u.tags      = static_cast<TagBitset>(PyLong_AsLong(PyTuple_GET_ITEM(t, 4)));
+        u.tier      = static_cast<int8_t>(PyLong_AsLong(PyTuple_GET_ITEM(t, 5)));
+        u.is_golden = PyObject_IsTrue(PyTuple_GET_ITEM(t, 6)) == 1;
+        u.uid       = next_uid++;
+    }
+    if (PyErr_Occurred()) {
+        throw py::error_already_set();
+    }
+}
+
+// ============================================================
+// fast_combat_pairs — one combat per (side0, side1, seed, tier0, tier1)
+// item, e.g. all pairings of a lobby round. Boards parsed with the GIL,
+// combats run in one GIL-free loop. Returns [(outcome, damage), ...].
+// ============================================================
+static py::list fast_combat_pairs(py::list combats) {
+    const size_t count = combats.size();
+    std::vector<CombatState> states(count);
+    for (size_t i = 0; i < count; ++i) {
+        py::tuple item = combats[i].cast<py::tuple>();
+        if (item.size() != 5) {
+            throw py::value_error("each combat must be (side0, side1, seed, tier0, tier1)");
+        }
+        CombatState& state = states[i];
+        state = CombatState{};
+        rng_seed(state.rng, item[2].cast<uint64_t>());
+        parse_board_raw(state.boards[0], item[0], state.next_uid);
+        parse_board_raw(state.boards[1], item[1], state.next_uid);
+        state.boards[0].tavern_tier = item[3].cast<int8_t>();
+        state.boards[1].tavern_tier = item[4].cast<int8_t>();
+    }
+
+    struct Result { int outcome; int damage; };
+    std::vector<Result> results(count);
+    {
+        py::gil_scoped_release release;
+        for (size_t i = 0; i < count; ++i) {
+            BattleResult r = resolve_combat(states[i]);
+            results[i] = {static_cast<int>(r.outcome), static_cast<int>(r.damage)};
+        }
+    }
+
+    py::list py_results;
+    for (size_t i = 0; i < count; ++i) {
+        py_results.append(py::make_tuple(results[i].outcome, results[i].damage));
+    }
+    return py_results;
+}
+
 PYBIND11_MODULE(hs_engine_cpp, m) {
     m.doc() = "Hearthstone Battlegrounds C++ engine core";
 
@@ -219,6 +292,11 @@ PYBIND11_MODULE(hs_engine_cpp, m) {
           py::arg("base_seed"), py::arg("count"),
           py::arg("tavern_tier_0") = 1, py::arg("tavern_tier_1") = 1);
 
+    m.def("fast_combat_pairs", &fast_combat_pairs,
+          "Run one combat per (side0, side1, seed, tavern_tier_0, tavern_tier_1) item "
+          "in a single GIL-free loop. Returns [(outcome, damage), ...].",
+          py::arg("combats"));
+
     // ==========================================================
     // Debug helpers — inspect subscribers/taunt_mask state.
     // Used by unit tests to verify shift-correctness of insert_at/remove_at.
@@ -12,8 +12,14 @@ Output: artifacts/bc_dataset.npz with arrays:
     masks:  [N, 34]      bool
     actions:[N]          int64
 
+or, with --format replay, artifacts/bc_replays.hsr: one ActionLog (seed +
+varint action ids, see hearthstone/env/replay.py) per episode, ~100x smaller.
+bc_train.py regenerates (obs, masks, actions) from it with the current
+observation layout.
+
 Usage:
     python scripts/bc_collect.py --episodes 1000 --weights artifacts/es_kaggle/artifacts/best.npz
+    python scripts/bc_collect.py --episodes 1000 --format replay
 """
 
 from __future__ import annotations
@@ -34,6 +40,7 @@ from hearthstone.env.es_bot import (
     score_unit_es,
 )
 from hearthstone.env.hs_env import HearthstoneEnv
+from hearthstone.env.replay import ActionLog, save_logs, weights_id
 
 
 # ============================================================
@@ -70,13 +77,19 @@ def _action_kwargs_to_int(action_type: str, kwargs: dict) -> int:
     return 0  # safety: end turn
 
 
-def es_pick_action(env: HearthstoneEnv, weights: np.ndarray) -> int:
-    """Return the action_int the ES bot would take on the current env state."""
+def es_pick_action(
+    env: HearthstoneEnv, weights: np.ndarray, mask: np.ndarray | None = None
+) -> int:
+    """Return the action_int the ES bot would take on the current env state.
+
+    ``mask`` is the info["action_mask"] from the last reset/step (recomputed if None).
+    """
     game = env.game
     p_idx = env.my_player_id
     player = game.players[p_idx]
     turn = game.turn_count
-    mask = env.action_masks()
+    if mask is None:
+        mask = env.action_masks()
 
     # ---- Targeting mode (env is waiting for spell/magnetize target) ----
     if env.is_targeting:
@@ -146,30 +159,67 @@ def es_pick_action(env: HearthstoneEnv, weights: np.ndarray) -> int:
 
 def collect_episode(env: HearthstoneEnv, weights: np.ndarray, seed: int):
     """Run one episode end-to-end. Returns (obs_list, mask_list, action_list, board_power)."""
-    obs, _ = env.reset(seed=seed)
+    obs, info = env.reset(seed=seed)
     obs_buf, mask_buf, act_buf = [], [], []
     done = False
     truncated = False
     while not (done or truncated):
-        mask = env.action_masks()
-        action = es_pick_action(env, weights)
+        mask = info["action_mask"]
+        action = es_pick_action(env, weights, mask)
 
         obs_buf.append(obs.astype(np.float32, copy=True))
         mask_buf.append(mask.astype(np.bool_, copy=True))
         act_buf.append(np.int64(action))
 
-        obs, _, done, truncated, _ = env.step(action)
+        obs, _, done, truncated, info = env.step(action)
 
     return obs_buf, mask_buf, act_buf, env.get_board_power()
 
 
+def collect_episode_log(env: HearthstoneEnv, weights: np.ndarray, seed: int):
+    """Same episode as collect_episode, recorded as an ActionLog. Returns (log, board_power)."""
+    _, info = env.reset(seed=seed)
+    log = ActionLog(seed=seed, max_tier=env._max_tier, bot_id=weights_id(weights))
+    done = False
+    truncated = False
+    while not (done or truncated):
+        action = es_pick_action(env, weights, info["action_mask"])
+        log.actions.append(action)
+        _, _, done, truncated, info = env.step(action)
+    return log, env.get_board_power()
+
+
+def save_replays(args, env: HearthstoneEnv, weights: np.ndarray) -> None:
+    logs, all_bp = [], []
+    t0 = time.time()
+    for ep in range(args.episodes):
+        log, bp = collect_episode_log(env, weights, args.seed + ep)
+        logs.append(log)
+        all_bp.append(bp)
+        if (ep + 1) % args.log_every == 0:
+            steps = sum(len(lg.actions) for lg in logs)
+            print(
+                f"[ep {ep+1}/{args.episodes}] steps={steps:,} "
+                f"avg_bp={np.mean(all_bp):.1f} fps={steps/(time.time() - t0):.0f}"
+            )
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    save_logs(out_path, logs)
+    steps = sum(len(lg.actions) for lg in logs)
+    print(f"[done] {steps:,} steps from {args.episodes} episodes, avg_bp={np.mean(all_bp):.2f}")
+    print(f"  saved: {out_path} ({out_path.stat().st_size/1e3:.1f} KB)")
+
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--weights", default="artifacts/es_kaggle/artifacts/best.npz")
     p.add_argument("--episodes", type=int, default=1000)
     p.add_argument("--seed", type=int, default=0)
     p.add_argument("--max-tier", type=int, default=6)
-    p.add_argument("--out", default="artifacts/bc_dataset.npz")
+    p.add_argument("--format", choices=("npz", "replay"), default="npz")
+    p.add_argument("--out", default=None,
+                   help="default: artifacts/bc_dataset.npz / artifacts/bc_replays.hsr (replay)")
     p.add_argument("--log-every", type=int, default=50)
     args = p.parse_args()
 
@@ -178,6 +228,12 @@ def main():
 
     env = HearthstoneEnv(max_tier=args.max_tier)
 
+    if args.format == "replay":
+        args.out = args.out or "artifacts/bc_replays.hsr"
+        save_replays(args, env, weights)
+        return
+    args.out = args.out or "artifacts/bc_dataset.npz"
+
     all_obs, all_masks, all_acts, all_bp = [], [], [], []
     t0 = time.time()
     for ep in range(args.episodes):
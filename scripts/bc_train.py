@@ -1,6 +1,7 @@
 """Behavior cloning pretrain on ES bot trajectories.
 
-Loads (obs, masks, actions) from artifacts/bc_dataset.npz and trains the actor
+Loads (obs, masks, actions) from artifacts/bc_dataset.npz (or regenerates them
+from a `bc_collect.py --format replay` action-log file, *.hsr) and trains the actor
 of HSTransformerAgent via masked cross-entropy. Critic head is left untouched
 (zero-init from model.py; PPO will train it from scratch with a clean optimizer).
 
@@ -31,11 +32,14 @@ sys.path.insert(0, str(ROOT / "scripts"))
 
 from model import HSTransformerAgent
 from hearthstone.env.hs_env import HearthstoneEnv
+from hearthstone.env.replay import load_logs, replay_dataset
 
 
 def parse_args():
     p = argparse.ArgumentParser()
     p.add_argument("--dataset", default="artifacts/bc_dataset.npz")
+    p.add_argument("--replay-workers", type=int, default=0,
+                   help="processes for regenerating obs from a *.hsr replay dataset")
     p.add_argument("--out", default="artifacts/bc/bc_pretrain.pt")
     # Train
     p.add_argument("--epochs", type=int, default=10)
@@ -67,10 +71,18 @@ def main():
     print(f"[device] {device}")
 
     # ---- Load dataset ----
-    data = np.load(args.dataset)
-    obs = torch.from_numpy(data["obs"]).float()
-    masks = torch.from_numpy(data["masks"]).bool()
-    actions = torch.from_numpy(data["actions"]).long()
+    if args.dataset.endswith(".hsr"):
+        t0 = time.time()
+        obs_np, masks_np, actions_np = replay_dataset(
+            load_logs(args.dataset), processes=args.replay_workers
+        )
+        print(f"[data] replayed {args.dataset} in {time.time() - t0:.1f}s")
+    else:
+        data = np.load(args.dataset)
+        obs_np, masks_np, actions_np = data["obs"], data["masks"], data["actions"]
+    obs = torch.from_numpy(obs_np).float()
+    masks = torch.from_numpy(masks_np).bool()
+    actions = torch.from_numpy(actions_np).long()
     print(f"[data] {len(actions):,} samples, obs_dim={obs.shape[1]}")
 
     # ---- Sanity: every recorded action must be legal under its mask ----
@@ -9,6 +9,10 @@ Usage:
     from scripts.model import HSTransformerAgent
     agent = HSTransformerAgent(num_card_ids=200)
     action_logits, value_logits = agent(obs_batch)
+
+obs_batch is either the flat [B, 1036] float tensor or a compact observation
+(obs_mode="compact", hearthstone/env/compact_obs.py): a dict of card_ids
+[B, 27] int16, flags [B, 27, 5] uint8, stats [B, 27, 4] float16, context [B, 10].
 """
 
 from __future__ import annotations
@@ -227,6 +231,12 @@ class HSTransformerAgent(nn.Module):
     _ENEMY_SIZE = 3
     _EF = 38  # features per entity slot
 
+    # Compact obs layout (mirrors hearthstone/env/compact_obs.py; the model stays
+    # importable without the hearthstone package)
+    _FLAG_COLS = [0, 1, 5] + list(range(8, 38))
+    _STAT_COLS = [3, 4, 6, 7]  # cost, tier, ATK, HP as raw integers
+    _STAT_SCALE = (10.0, 6.0, 100.0, 100.0)
+
     def __init__(
         self,
         n_actions: int = 34,
@@ -273,9 +283,28 @@ class HSTransformerAgent(nn.Module):
 
         # Register bin centers as buffer (auto device placement)
         self.register_buffer("bins", BIN_CENTERS.clone())
-
-    def _parse_obs(self, flat: torch.Tensor):
+        self.register_buffer("stat_scale", torch.tensor(self._STAT_SCALE), persistent=False)
+        self.register_buffer("bit_shifts", torch.arange(8, dtype=torch.uint8), persistent=False)
+        zone_ids = torch.cat([torch.full((n,), z, dtype=torch.long) for n, z in self._ZONES])
+        self.register_buffer("zone_ids", zone_ids, persistent=False)
+
+    def _parse_compact(self, obs: dict[str, torch.Tensor]):
+        """Compact dict → val [B, 27, 38], team_id [B, 27], context [B, 10] (same as flat)."""
+        card_ids = obs["card_ids"]
+        B, n_slots = card_ids.shape
+        val = torch.zeros(B, n_slots, self._EF, device=card_ids.device)
+        val[..., 2] = card_ids.float()
+        val[..., self._STAT_COLS] = obs["stats"].float() / self.stat_scale
+        # uint8 [B, 27, 5] → bits [B, 27, 40], little-endian like np.packbits(bitorder="little")
+        bits = (obs["flags"].unsqueeze(-1) >> self.bit_shifts) & 1
+        val[..., self._FLAG_COLS] = bits.flatten(-2)[..., : len(self._FLAG_COLS)].float()
+        team_id = self.zone_ids * (val[:, :, 0] > 0.5).long()
+        return val, team_id, obs["context"].float()
+
+    def _parse_obs(self, flat: torch.Tensor | dict[str, torch.Tensor]):
         """[B, 1036] → val [B, 27, 38], team_id [B, 27], context [B, 10]"""
+        if isinstance(flat, dict):
+            return self._parse_compact(flat)
         B, device = flat.shape[0], flat.device
         global_vec = flat[:, :self._GLOBAL_SIZE]
         pos = self._GLOBAL_SIZE
@@ -294,8 +323,8 @@ class HSTransformerAgent(nn.Module):
         context = torch.cat([global_vec, enemy_vec], dim=-1)
         return val, team_id, context
 
-    def _encode(self, flat: torch.Tensor) -> torch.Tensor:
-        """Flat obs → pooled features [B, d_model]."""
+    def _encode(self, flat: torch.Tensor | dict[str, torch.Tensor]) -> torch.Tensor:
+        """Flat or compact obs → pooled features [B, d_model]."""
         val, team_id, context = self._parse_obs(flat)
 
         # Symlog continuous features, preserve card_id
@@ -340,7 +369,7 @@ class HSTransformerAgent(nn.Module):
         """PPO interface: returns (action, log_prob, entropy, value, value_logits).
 
         Args:
-            obs: [B, 1036] flat observations
+            obs: [B, 1036] flat observations (or a compact obs dict)
             action_mask: [B, 34] bool mask (True = legal)
             action: [B] actions to evaluate (None = sample new)
         """
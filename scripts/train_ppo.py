@@ -5,6 +5,10 @@ Single-file training loop. No SB3, no abstractions. Everything visible.
 Usage:
     python scripts/train_ppo.py
     python scripts/train_ppo.py --total-timesteps 1000000 --n-envs 4
+    python scripts/train_ppo.py --n-envs 32 --n-shards 4   # 4 processes x 8 games
+    python scripts/train_ppo.py --obs-mode compact          # int16/uint8/float16 rollout obs
+    python scripts/train_ppo.py --perf-stats                # env time per step phase in the log
+    python scripts/train_ppo.py --self-play --n-envs 16     # 8 games, the agent plays both seats
     python scripts/train_ppo.py --wandb --run-name my_experiment
 """
 
@@ -35,6 +39,12 @@ from model import (
     decode_value,
 )
 from hearthstone.env.hs_env import HearthstoneEnv
+from hearthstone.env.perf_stats import PERF_PHASES, format_perf_stats, merge_perf_stats
+from hearthstone.env.vector_env import (
+    HearthstoneVectorEnv,
+    SelfPlayVectorEnv,
+    ShardedHearthstoneVectorEnv,
+)
 
 
 # ============================================================
@@ -57,6 +67,20 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--target-kl", type=float, default=0.03)
     # Rollout
     p.add_argument("--n-envs", type=int, default=8)
+    p.add_argument("--vec-env", choices=("native", "async"), default="native",
+                   help="native: HearthstoneVectorEnv (games in-process, no obs IPC); "
+                        "async: gymnasium AsyncVectorEnv, one process per env")
+    p.add_argument("--n-shards", type=int, default=1,
+                   help="native only: split the envs over this many processes")
+    p.add_argument("--obs-mode", choices=("flat", "compact"), default="flat",
+                   help="compact: tokenized obs (int16 ids, packed flags, float16 stats), "
+                        "~9x fewer bytes per step through IPC and the rollout buffer")
+    p.add_argument("--perf-stats", action="store_true",
+                   help="time env.step phases (engine, enemy turn, combat, oracle, obs, "
+                        "masks) and log them every --log-interval updates")
+    p.add_argument("--self-play", action="store_true",
+                   help="native only: n-envs/2 games, the policy plays both players "
+                        "(SelfPlayVectorEnv rows 2g / 2g+1) instead of the bot")
     p.add_argument("--n-steps", type=int, default=2048)
     p.add_argument("--n-minibatches", type=int, default=4)
     p.add_argument("--update-epochs", type=int, default=4)
@@ -87,22 +111,93 @@ def parse_args() -> argparse.Namespace:
 # Environment
 # ============================================================
 
-def make_env(rank: int, seed: int, max_tier: int):
+def make_env(
+    rank: int, seed: int, max_tier: int, obs_mode: str = "flat", perf_stats: bool = False
+):
     def thunk():
-        env = HearthstoneEnv(max_tier=max_tier)
+        env = HearthstoneEnv(max_tier=max_tier, obs_mode=obs_mode, perf_stats=perf_stats)
         env.reset(seed=seed + rank)
         return env
 
     return thunk
 
 
-def get_action_masks(envs) -> torch.Tensor:
-    """Get action masks from all envs. Returns [n_envs, n_actions] bool tensor.
+def make_vector_env(args):
+    if args.self_play:
+        if args.vec_env != "native" or args.n_shards > 1 or args.n_envs % 2:
+            raise ValueError("--self-play needs --vec-env native, one shard and even --n-envs")
+        return SelfPlayVectorEnv(
+            args.n_envs // 2,
+            max_tier=args.max_tier,
+            obs_mode=args.obs_mode,
+            perf_stats=args.perf_stats,
+        )
+    if args.vec_env == "async":
+        return gymnasium.vector.AsyncVectorEnv(
+            [
+                make_env(i, args.seed, args.max_tier, args.obs_mode, args.perf_stats)
+                for i in range(args.n_envs)
+            ]
+        )
+    if args.n_shards > 1:
+        return ShardedHearthstoneVectorEnv(
+            args.n_envs,
+            args.n_shards,
+            max_tier=args.max_tier,
+            obs_mode=args.obs_mode,
+            perf_stats=args.perf_stats,
+        )
+    return HearthstoneVectorEnv(
+        args.n_envs, max_tier=args.max_tier, obs_mode=args.obs_mode, perf_stats=args.perf_stats
+    )
 
-    Works for both Sync and Async vector envs via the .call() RPC.
+
+def get_action_masks(infos: dict) -> torch.Tensor:
+    """Next-state masks delivered with reset()/step() as infos["action_mask"].
+
+    HearthstoneEnv puts the mask into its info, so Async workers return it in the
+    same round trip as the observation; native vector envs pass their mask buffer.
+    Returns [n_envs, n_actions] bool tensor (a copy).
     """
-    masks = envs.call("action_masks")
-    return torch.tensor(np.array(masks), dtype=torch.bool)
+    return torch.tensor(infos["action_mask"], dtype=torch.bool)
+
+
+# Observations: flat [.., 1036] float tensor or compact dict of tensors (--obs-mode)
+
+def make_obs_buffer(space, n_steps: int, n_envs: int, device) -> torch.Tensor | dict:
+    """Rollout storage [n_steps, n_envs, ...]; compact obs keep their int16/uint8/f16 dtypes."""
+    if isinstance(space, gymnasium.spaces.Dict):
+        return {
+            key: torch.zeros(
+                (n_steps, n_envs, *sub.shape),
+                dtype=torch.from_numpy(np.zeros(0, sub.dtype)).dtype,
+                device=device,
+            )
+            for key, sub in space.items()
+        }
+    return torch.zeros((n_steps, n_envs, *space.shape), device=device)
+
+
+def obs_to_tensor(obs, device) -> torch.Tensor | dict:
+    """Env batch -> tensors (a copy: vector envs return their live buffers)."""
+    if isinstance(obs, dict):
+        return {key: torch.tensor(value, device=device) for key, value in obs.items()}
+    return torch.tensor(obs, dtype=torch.float32, device=device)
+
+
+def map_obs(fn, obs):
+    """Apply fn to a flat obs tensor or to every tensor of a compact obs."""
+    if isinstance(obs, dict):
+        return {key: fn(value) for key, value in obs.items()}
+    return fn(obs)
+
+
+def store_obs(buf, step: int, obs) -> None:
+    if isinstance(buf, dict):
+        for key, value in buf.items():
+            value[step] = obs[key]
+    else:
+        buf[step] = obs
 
 
 def get_board_powers(envs) -> list[float]:
@@ -183,15 +278,14 @@ def main():
             config=vars(args),
         )
 
-    # Envs (Async = env.step parallelized with model inference, +50-100% FPS)
-    envs = gymnasium.vector.AsyncVectorEnv(
-        [make_env(i, args.seed, args.max_tier) for i in range(args.n_envs)]
-    )
+    # Envs: native = all games stepped in-process into preallocated arrays
+    # (optionally sharded over --n-shards processes); async = one process per env
+    envs = make_vector_env(args)
     n_actions = 34
-    obs_dim = envs.single_observation_space.shape[0]
+    obs_space = envs.single_observation_space
 
     num_card_ids = envs.get_attr("num_card_ids")[0]
-    print(f"[env] obs_dim={obs_dim} n_actions={n_actions} card_ids={num_card_ids}")
+    print(f"[env] obs={args.obs_mode} n_actions={n_actions} card_ids={num_card_ids}")
 
     # Model
     agent = HSTransformerAgent(
@@ -228,7 +322,7 @@ def main():
     n_updates = args.total_timesteps // batch_size
     print(f"[train] batch={batch_size} minibatch={minibatch_size} updates={n_updates}")
 
-    obs_buf = torch.zeros((args.n_steps, args.n_envs, obs_dim), device=device)
+    obs_buf = make_obs_buffer(obs_space, args.n_steps, args.n_envs, device)
     act_buf = torch.zeros((args.n_steps, args.n_envs), dtype=torch.long, device=device)
     logp_buf = torch.zeros((args.n_steps, args.n_envs), device=device)
     rew_buf = torch.zeros((args.n_steps, args.n_envs), device=device)
@@ -238,8 +332,9 @@ def main():
     mask_buf = torch.zeros((args.n_steps, args.n_envs, n_actions), dtype=torch.bool, device=device)
 
     # Init envs
-    next_obs_np, _ = envs.reset(seed=args.seed)
-    next_obs = torch.tensor(next_obs_np, dtype=torch.float32, device=device)
+    next_obs_np, infos = envs.reset(seed=args.seed)
+    next_mask = get_action_masks(infos)
+    next_obs = obs_to_tensor(next_obs_np, device)
     next_done = torch.zeros(args.n_envs, device=device)
 
     out_dir = Path(args.out_dir)
@@ -258,9 +353,9 @@ def main():
         for step in range(args.n_steps):
             global_step += args.n_envs
 
-            obs_buf[step] = next_obs
+            store_obs(obs_buf, step, next_obs)
             done_buf[step] = next_done
-            action_mask = get_action_masks(envs).to(device)
+            action_mask = next_mask.to(device)
             mask_buf[step] = action_mask
 
             with torch.no_grad():
@@ -277,8 +372,9 @@ def main():
             )
             done_np = np.logical_or(terminated, truncated)
             rew_buf[step] = torch.tensor(reward_np, dtype=torch.float32, device=device)
-            next_obs = torch.tensor(next_obs_np, dtype=torch.float32, device=device)
+            next_obs = obs_to_tensor(next_obs_np, device)
             next_done = torch.tensor(done_np, dtype=torch.float32, device=device)
+            next_mask = get_action_masks(infos)
 
         # --- GAE ---
         with torch.no_grad():
@@ -288,7 +384,7 @@ def main():
         )
 
         # --- Flatten ---
-        b_obs = obs_buf.reshape(-1, obs_dim)
+        b_obs = map_obs(lambda t: t.reshape(-1, *t.shape[2:]), obs_buf)
         b_actions = act_buf.reshape(-1)
         b_logprobs = logp_buf.reshape(-1)
         b_advantages = advantages.reshape(-1)
@@ -310,7 +406,7 @@ def main():
                 mb = b_inds[start:end]
 
                 _, newlogprob, entropy, newvalue, new_vlogits = agent.get_action_and_value(
-                    b_obs[mb], b_masks[mb], b_actions[mb]
+                    map_obs(lambda t: t[mb], b_obs), b_masks[mb], b_actions[mb]
                 )
 
                 logratio = newlogprob - b_logprobs[mb]
@@ -368,6 +464,10 @@ def main():
                 f"kl={approx_kl:.4f} clip={np.mean(clipfracs):.3f} "
                 f"avg_r={avg_reward:.3f}"
             )
+            # Env phase timers, summed over envs since the last log line
+            perf = merge_perf_stats(list(envs.call("get_perf_stats"))) if args.perf_stats else {}
+            if perf:
+                print(f"  [perf] {format_perf_stats(perf)}")
 
             if run is not None:
                 run.log({
@@ -381,6 +481,11 @@ def main():
                     "config/ent_coef": ent_coef,
                     "config/lr": optimizer.param_groups[0]["lr"],
                 }, step=global_step)
+                if perf:
+                    steps = max(perf["step_calls"], 1)
+                    run.log({
+                        f"perf/{p}_us": perf[f"{p}_ns"] / steps / 1e3 for p in PERF_PHASES
+                    }, step=global_step)
 
         # --- Eval ---
         if update % args.eval_interval == 0:
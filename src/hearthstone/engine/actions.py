@@ -0,0 +1,181 @@
+"""
+actions.py — flat integer action space of a recruit turn and its legality bitmask.
+
+Ids match HearthstoneEnv's Discrete(34):
+
+  0        END_TURN
+  1        ROLL
+  2..8     BUY store[i]          (во время discover: 2..4 = DISCOVER_CHOICE i)
+  9..15    SELL board[i]
+  16..25   PLAY hand[i] (в конец доски)
+  26..31   SWAP board[i] <-> board[i + 1]
+  32       UPGRADE
+  33       FREEZE + END_TURN
+
+Legality is a plain int (bit i = action i is legal), kept on the Player by
+TavernManager.  Each action only recomputes the bit segments of the zones it
+changes (ZONE_GOLD / HAND / BOARD / STORE), and a cheap stamp of the zone
+sizes catches direct state edits outside the tavern (tests, scripts), so
+reading the mask is O(1).
+"""
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from .entities import Player
+from .spells import SPELLS_REQUIRE_TARGET
+
+NUM_ACTIONS = 34
+
+END_TURN = 0
+ROLL = 1
+BUY = 2
+SELL = 9
+PLAY = 16
+SWAP = 26
+UPGRADE = 32
+FREEZE_END_TURN = 33
+
+MAX_STORE = 7
+MAX_BOARD = 7
+MAX_HAND = 10
+
+ROLL_BIT = 1 << ROLL
+BUY_BITS = ((1 << MAX_STORE) - 1) << BUY
+SELL_BITS = ((1 << MAX_BOARD) - 1) << SELL
+PLAY_BITS = ((1 << MAX_HAND) - 1) << PLAY
+SWAP_BITS = ((1 << (MAX_BOARD - 1)) - 1) << SWAP
+UPGRADE_BIT = 1 << UPGRADE
+# Конец хода (с заморозкой и без) легален всегда вне discover
+ALWAYS_BITS = (1 << END_TURN) | (1 << FREEZE_END_TURN)
+
+# Zones a mutation touched -> which bit segments to recompute
+ZONE_GOLD = 1
+ZONE_HAND = 2
+ZONE_BOARD = 4
+ZONE_STORE = 8
+ZONE_ALL = ZONE_GOLD | ZONE_HAND | ZONE_BOARD | ZONE_STORE
+
+# Zones each successful action can change (эффекты карт могут менять всё, поэтому
+# SELL / PLAY / DISCOVER_CHOICE пересчитывают маску целиком)
+ACTION_ZONES: Dict[str, int] = {
+    "ROLL": ZONE_GOLD | ZONE_STORE,
+    "BUY": ZONE_GOLD | ZONE_HAND | ZONE_STORE,
+    "SELL": ZONE_ALL,
+    "PLAY": ZONE_ALL,
+    "UPGRADE": ZONE_GOLD,
+    "FREEZE": 0,
+    "SWAP": 0,
+    "DISCOVER_CHOICE": ZONE_ALL,
+}
+
+_NO_KWARGS: Dict[str, int] = {}
+
+
+def _build_action_table() -> Tuple[Tuple[str, Dict[str, int]], ...]:
+    table = [("END_TURN", _NO_KWARGS), ("ROLL", _NO_KWARGS)]
+    table += [("BUY", {"index": i}) for i in range(MAX_STORE)]
+    table += [("SELL", {"index": i}) for i in range(MAX_BOARD)]
+    table += [("PLAY", {"hand_index": i, "insert_index": -1}) for i in range(MAX_HAND)]
+    table += [("SWAP", {"index_a": i, "index_b": i + 1}) for i in range(MAX_BOARD - 1)]
+    table += [("UPGRADE", _NO_KWARGS), ("FREEZE_END_TURN", _NO_KWARGS)]
+    assert len(table) == NUM_ACTIONS
+    return tuple(table)
+
+
+# action id -> (Game.step action_type, kwargs); kwargs dicts are shared, never mutate them
+ACTION_TABLE = _build_action_table()
+DISCOVER_TABLE: Dict[int, Tuple[str, Dict[str, int]]] = {
+    BUY + i: ("DISCOVER_CHOICE", {"index": i}) for i in range(3)
+}
+_DURING_DISCOVERY = ("INVALID_DURING_DISCOVERY", _NO_KWARGS)
+
+
+def decode_action(player: Player, action_id: int) -> Tuple[str, Dict[str, int]]:
+    """Action id -> (action_type, kwargs) for Game.step, by table lookup."""
+    if not 0 <= action_id < NUM_ACTIONS:
+        raise ValueError(f"Unknown action id {action_id}")
+    if player.discovery.is_active:
+        return DISCOVER_TABLE.get(action_id, _DURING_DISCOVERY)
+    return ACTION_TABLE[action_id]
+
+
+def mask_stamp(player: Player) -> Tuple[int, int, int, int, bool]:
+    return (
+        player.economy.gold,
+        len(player.hand),
+        len(player.board),
+        len(player.economy.store),
+        player.discovery.is_active,
+    )
+
+
+def stamp_zones(old: Tuple, new: Tuple) -> int:
+    """Zones whose size changed between two stamps (ZONE_ALL if discover mode flipped)."""
+    if not old or old[4] != new[4]:
+        return ZONE_ALL
+    zones = ZONE_GOLD if old[0] != new[0] else 0
+    if old[1] != new[1]:
+        zones |= ZONE_HAND
+    if old[2] != new[2]:
+        zones |= ZONE_BOARD
+    if old[3] != new[3]:
+        zones |= ZONE_STORE
+    return zones
+
+
+def _buy_bits(player: Player) -> int:
+    if len(player.hand) >= MAX_HAND:
+        return 0
+    gold = player.economy.gold
+    bits = 0
+    for i, item in enumerate(player.economy.store[:MAX_STORE]):
+        cost = item.spell.cost - player.economy.spell_discount if item.spell else 3
+        if gold >= cost:
+            bits |= 1 << (BUY + i)
+    return bits
+
+
+def _gold_bits(player: Player, max_tier: int) -> int:
+    eco = player.economy
+    bits = ROLL_BIT if eco.gold >= 1 else 0
+    if eco.gold >= eco.up_cost and eco.tavern_tier < min(6, max_tier):
+        bits |= UPGRADE_BIT
+    return bits
+
+
+def _board_bits(player: Player) -> int:
+    n = min(len(player.board), MAX_BOARD)
+    return (((1 << n) - 1) << SELL) | (((1 << max(n - 1, 0)) - 1) << SWAP)
+
+
+def _play_bits(player: Player) -> int:
+    board_len = len(player.board)
+    bits = 0
+    for i, card in enumerate(player.hand[:MAX_HAND]):
+        if card.spell:
+            # Спелл с целью без юнитов на доске не сыграть
+            legal = board_len > 0 or card.spell.card_id not in SPELLS_REQUIRE_TARGET
+        else:
+            legal = card.unit is not None and board_len < MAX_BOARD
+        if legal:
+            bits |= 1 << (PLAY + i)
+    return bits
+
+
+def compute_legal_actions(
+    player: Player, max_tier: int, zones: int = ZONE_ALL, prev: int = 0
+) -> int:
+    """Legal-action bits; only segments of ``zones`` are recomputed, the rest come from prev."""
+    if player.discovery.is_active:
+        return ((1 << min(len(player.discovery.options), 3)) - 1) << BUY
+    bits = prev | ALWAYS_BITS
+    if zones & ZONE_GOLD:
+        bits = (bits & ~(ROLL_BIT | UPGRADE_BIT)) | _gold_bits(player, max_tier)
+    if zones & (ZONE_GOLD | ZONE_HAND | ZONE_STORE):
+        bits = (bits & ~BUY_BITS) | _buy_bits(player)
+    if zones & ZONE_BOARD:
+        bits = (bits & ~(SELL_BITS | SWAP_BITS)) | _board_bits(player)
+    if zones & (ZONE_HAND | ZONE_BOARD):
+        bits = (bits & ~PLAY_BITS) | _play_bits(player)
+    return bits
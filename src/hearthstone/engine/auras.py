@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, SupportsIndex
 
 from .entities import Unit
 
@@ -40,13 +40,156 @@ def _type_buff_aura(unit_type: UnitType, atk: int, hp: int) -> AuraEffectFn:
         for i, unit in enumerate(board):
             if i == idx:
                 continue
-            if unit_type in unit.types:
+            if unit.has_type(unit_type):
                 unit.aura_atk_add += bonus_atk
                 unit.aura_hp_add += bonus_hp
     return _aura
 
 
+def is_aura_source(unit: Unit) -> bool:
+    """True if the unit (or one of its attached effects) has a registered aura."""
+    if not AURA_REGISTRY:
+        return False
+    if unit.card_id in AURA_REGISTRY:
+        return True
+    for attached_layer in (unit.attached_perm, unit.attached_turn, unit.attached_combat):
+        for effect_id in attached_layer:
+            if effect_id in AURA_REGISTRY:
+                return True
+    return False
+
+
+class Board(List[Unit]):
+    """List of units that tracks aura sources, like CombatBoard.aura_source_mask in C++.
+
+    ``aura_sources`` counts units for which ``is_aura_source`` was true on
+    insertion. ``aura_dirty`` is raised by any structural change while a
+    source is (or was) on the board; ``recalculate_board_auras`` skips
+    boards that are not dirty. Changes that turn an existing unit into a
+    source (magnetize, attached effects) must call ``refresh_aura_sources``.
+
+    ``card_counts`` — card_id -> copies on the board (golden included), kept
+    up to date by every mutation, for triplet checks and bot scoring.
+    """
+
+    __slots__ = ("aura_sources", "aura_dirty", "card_counts")
+
+    def __init__(self, units: Iterable[Unit] = ()) -> None:
+        super().__init__(units)
+        self.aura_sources = 0
+        self.aura_dirty = False
+        self.card_counts: Dict[str, int] = {}
+        self._recount()
+
+    def _recount(self) -> None:
+        counts: Dict[str, int] = {}
+        for unit in self:
+            counts[unit.card_id] = counts.get(unit.card_id, 0) + 1
+        self.card_counts = counts
+        self.refresh_aura_sources()
+
+    def refresh_aura_sources(self) -> None:
+        """Recount sources from scratch and mark the board dirty if it has any."""
+        had_sources = self.aura_sources
+        self.aura_sources = sum(1 for unit in self if is_aura_source(unit))
+        if had_sources or self.aura_sources:
+            self.aura_dirty = True
+
+    def __reduce__(self):  # type: ignore[no-untyped-def]
+        # Стандартный reduce для list-наследника вызывает extend() до установки слотов
+        return (Board, (list(self),), (None, {"aura_dirty": self.aura_dirty}))
+
+    def clone(self) -> Board:
+        """Copy with cloned units; aura bookkeeping is carried over, not recounted."""
+        board = Board.__new__(Board)
+        list.extend(board, [unit.clone() for unit in self])
+        board.aura_sources = self.aura_sources
+        board.aura_dirty = self.aura_dirty
+        board.card_counts = self.card_counts.copy()
+        return board
+
+    def _added(self, unit: Unit) -> None:
+        counts = self.card_counts
+        counts[unit.card_id] = counts.get(unit.card_id, 0) + 1
+        if is_aura_source(unit):
+            self.aura_sources += 1
+        if self.aura_sources:
+            self.aura_dirty = True
+
+    def _removed(self, unit: Unit) -> None:
+        counts = self.card_counts
+        left = counts[unit.card_id] - 1
+        if left:
+            counts[unit.card_id] = left
+        else:
+            del counts[unit.card_id]
+        if self.aura_sources:
+            # Позиции соседей сдвинулись либо ушёл сам источник
+            self.aura_dirty = True
+            if is_aura_source(unit):
+                self.aura_sources -= 1
+
+    def append(self, unit: Unit) -> None:
+        super().append(unit)
+        self._added(unit)
+
+    def insert(self, index: SupportsIndex, unit: Unit) -> None:
+        super().insert(index, unit)
+        self._added(unit)
+
+    def pop(self, index: SupportsIndex = -1) -> Unit:
+        unit = super().pop(index)
+        self._removed(unit)
+        return unit
+
+    def remove(self, unit: Unit) -> None:
+        super().remove(unit)
+        self._removed(unit)
+
+    def clear(self) -> None:
+        super().clear()
+        self._recount()
+
+    def extend(self, units: Iterable[Unit]) -> None:
+        super().extend(units)
+        self._recount()
+
+    def __iadd__(self, units: Iterable[Unit]) -> Board:  # type: ignore[override, misc]
+        self.extend(units)
+        return self
+
+    def __setitem__(self, index, value) -> None:  # type: ignore[no-untyped-def]
+        super().__setitem__(index, value)
+        self._recount()
+
+    def __delitem__(self, index) -> None:  # type: ignore[no-untyped-def]
+        super().__delitem__(index)
+        self._recount()
+
+    def sort(self, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        super().sort(*args, **kwargs)
+        if self.aura_sources:
+            self.aura_dirty = True
+
+    def reverse(self) -> None:
+        super().reverse()
+        if self.aura_sources:
+            self.aura_dirty = True
+
+
+def refresh_aura_sources(board: List[Unit]) -> None:
+    """Notify the board that a unit on it may have become (or stopped being) an aura source."""
+    if isinstance(board, Board):
+        board.refresh_aura_sources()
+
+
 def recalculate_board_auras(board: List[Unit]) -> None:
+    if isinstance(board, Board):
+        # Fast path: ни одного источника и нечего сбрасывать — выходим сразу
+        if not board.aura_dirty:
+            return
+        board.aura_dirty = False
+
     for unit in board:
         unit.reset_aura_layer()
 
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
-
-from .enums import CardIDs, EffectIDs, MechanicType, SpellIDs, Tags, UnitType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from .enums import (
+    CardIDs,
+    EffectIDs,
+    MechanicType,
+    SpellIDs,
+    Tags,
+    UnitType,
+    tags_to_mask,
+    types_to_mask,
+)
 
 if TYPE_CHECKING:
     from .event_system import EffectContext, Event
@@ -2822,6 +2830,8 @@ def build_card_db() -> Dict[str, Any]:
             "atk": card.atk,
             "hp": card.hp,
             "type": card.types,
+            "type_mask": types_to_mask(card.types),
+            "tag_mask": tags_to_mask(card.tags),
         }
         if card.tags:
             entry["tags"] = card.tags
@@ -2864,7 +2874,7 @@ def _make_dr_summon_with_tag(token_id: str, count: int, tag: Tags):
             if ref:
                 unit = ctx.resolve_unit(ref)
                 if unit:
-                    unit.tags.add(tag)
+                    unit.add_tag(tag)
 
     return _effect
 
@@ -3087,7 +3097,7 @@ def _make_on_play_type_buff(trigger_type: UnitType, atk: int, hp: int, exclude_s
     def _effect(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         es = _event_system()
         played = ctx.resolve_unit(event.source)
-        if not played or trigger_type not in played.types:
+        if not played or not played.has_type(trigger_type):
             return
         if exclude_self and event.source and event.source.uid == trigger_uid:
             return
@@ -3107,7 +3117,7 @@ def _make_on_play_type_damage_hero(
     def _effect(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         es = _event_system()
         played = ctx.resolve_unit(event.source)
-        if not played or trigger_type not in played.types:
+        if not played or not played.has_type(trigger_type):
             return
         if exclude_self and event.source and event.source.uid == trigger_uid:
             return
@@ -3158,15 +3168,15 @@ def _make_dr_random_enemy_damage(damage: int):
         if not enemy_player or not enemy_player.board:
             return
 
-        target = random.choice(enemy_player.board)
+        target = ctx.rng.choice(enemy_player.board)
 
         if target.has_divine_shield:
-            target.tags.discard(Tags.DIVINE_SHIELD)
+            target.remove_tag(Tags.DIVINE_SHIELD)
             ctx.emit_event(
                 es.Event(
                     event_type=es.EventType.DIVINE_SHIELD_LOST,
                     source=es.EntityRef(target.uid),
-                    source_pos=es.PosRef(side=enemy_side, zone=es.Zone.BOARD, slot=-1),
+                    source_pos=es.pos_ref(enemy_side, es.Zone.BOARD, -1),
                 )
             )
         else:
@@ -3199,7 +3209,7 @@ def _make_on_friendly_summoned_type_buff(
         summoned_unit = ctx.resolve_unit(event.source)
         if not summoned_unit:
             return
-        if trigger_type not in summoned_unit.types:
+        if not summoned_unit.has_type(trigger_type):
             return
         if exclude_self and summoned_unit.uid == trigger_uid:
             return
@@ -3211,7 +3221,7 @@ def _make_on_friendly_summoned_type_buff(
         else:
             ctx.buff_perm(es.EntityRef(trigger_uid), atk, hp)
         if gain_divine_shield:
-            deflecto.tags.add(Tags.DIVINE_SHIELD)
+            deflecto.add_tag(Tags.DIVINE_SHIELD)
 
     return _effect
 
@@ -3296,7 +3306,7 @@ def _make_eot_buff_board_by_type(trigger_type: UnitType, atk: int, hp: int):
         if not pos:
             return
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if trigger_type in unit.types:
+            if unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(unit.uid), atk, hp)
 
     return _effect
@@ -3311,7 +3321,7 @@ def _make_soc_buff_friendly_type(trigger_type: UnitType, atk: int, hp: int):
         if not pos:
             return
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if trigger_type in unit.types:
+            if unit.has_type(trigger_type):
                 ctx.buff_combat(es.EntityRef(unit.uid), atk, hp)
 
     return _effect
@@ -3326,7 +3336,7 @@ def _make_bc_buff_all_by_type(trigger_type: UnitType, atk: int, hp: int):
         if not pos:
             return
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if trigger_type in unit.types:
+            if unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(unit.uid), atk, hp)
 
     return _effect
@@ -3340,7 +3350,7 @@ def _make_on_play_type_add_spell(
     def _effect(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         es = _event_system()
         played = ctx.resolve_unit(event.source)
-        if not played or trigger_type not in played.types:
+        if not played or not played.has_type(trigger_type):
             return
         if exclude_self and event.source and event.source.uid == trigger_uid:
             return
@@ -3359,7 +3369,7 @@ def _make_on_summoned_buff_random_other(trigger_type: UnitType, atk: int, hp: in
     def _effect(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         es = _event_system()
         summoned = ctx.resolve_unit(event.source)
-        if not summoned or trigger_type not in summoned.types:
+        if not summoned or not summoned.has_type(trigger_type):
             return
         # Determine side of the summoned unit
         source_pos = event.source_pos
@@ -3369,11 +3379,11 @@ def _make_on_summoned_buff_random_other(trigger_type: UnitType, atk: int, hp: in
         candidates = [
             unit
             for _slot, unit in ctx.iter_board_units(source_pos.side)
-            if trigger_type in unit.types and unit.uid != summoned.uid
+            if unit.has_type(trigger_type) and unit.uid != summoned.uid
         ]
         if not candidates:
             return
-        target = random.choice(candidates)
+        target = ctx.rng.choice(candidates)
         ctx.buff_perm(es.EntityRef(target.uid), atk, hp)
 
     return _effect
@@ -3405,11 +3415,11 @@ def _make_rally_buff_random_type(trigger_type: UnitType, atk: int, hp: int):
         candidates = [
             unit
             for _slot, unit in ctx.iter_board_units(pos.side)
-            if trigger_type in unit.types and unit.uid != trigger_uid
+            if unit.has_type(trigger_type) and unit.uid != trigger_uid
         ]
         if not candidates:
             return
-        target = random.choice(candidates)
+        target = ctx.rng.choice(candidates)
         ctx.buff_combat(es.EntityRef(target.uid), atk, hp)
 
     return _effect
@@ -3419,8 +3429,6 @@ def _make_sell_get_random_by_type(unit_type: UnitType):
     """On sell: get a random unit of specific type from pool into hand."""
 
     def _effect(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
-        from .configs import CARD_DB
-
         if event.source_pos:
             side = event.source_pos.side
         else:
@@ -3432,21 +3440,10 @@ def _make_sell_get_random_by_type(unit_type: UnitType):
         player = ctx.players_by_uid.get(side)
         if not player or len(player.hand) >= 10:
             return
-        # Collect all candidates from pool tiers matching the type
-        candidates: list[str] = []
-        for tier_cards in ctx.card_pool.tiers.values():
-            for cid in tier_cards:
-                data = CARD_DB.get(cid)
-                if data and unit_type in data.get("type", []):
-                    candidates.append(cid)
-        if not candidates:
+        # Weighted by copies left in the pool; the drawn copy leaves the pool
+        chosen = ctx.card_pool.draw_matching(lambda data: unit_type in data.get("type", []))
+        if chosen is None:
             return
-        chosen = random.choice(candidates)
-        # Remove from pool
-        for tier_cards in ctx.card_pool.tiers.values():
-            if chosen in tier_cards:
-                tier_cards.remove(chosen)
-                break
         from .entities import HandCard, Unit
 
         uid = ctx._uid_provider()
@@ -3469,11 +3466,11 @@ def _make_consume_for_random_friendly(trigger_type: UnitType):
             return
         gained_atk, gained_hp = result
         candidates = [
-            unit for _slot, unit in ctx.iter_board_units(pos.side) if trigger_type in unit.types
+            unit for _slot, unit in ctx.iter_board_units(pos.side) if unit.has_type(trigger_type)
         ]
         if not candidates:
             return
-        target = random.choice(candidates)
+        target = ctx.rng.choice(candidates)
         ctx.buff_perm(es.EntityRef(target.uid), gained_atk, gained_hp)
 
     return _effect
@@ -3512,7 +3509,7 @@ def _make_on_tavern_refresh_buff_rightmost_shop(
         else:
             ctx.buff_perm(es.EntityRef(target.uid), atk, hp)
         if give_reborn:
-            target.tags.add(Tags.REBORN)
+            target.add_tag(Tags.REBORN)
 
     return _effect
 
@@ -3725,10 +3722,10 @@ def _make_bc_buff_all_by_type_include_hand(trigger_type: UnitType, atk: int, hp:
             return
         targets = []
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if trigger_type in unit.types and unit.uid != trigger_uid:
+            if unit.has_type(trigger_type) and unit.uid != trigger_uid:
                 targets.append(unit)
         for hc in player.hand:
-            if hc.unit and trigger_type in hc.unit.types and hc.unit.uid != trigger_uid:
+            if hc.unit and hc.unit.has_type(trigger_type) and hc.unit.uid != trigger_uid:
                 targets.append(hc.unit)
         for unit in targets:
             ctx.buff_perm(es.EntityRef(unit.uid), atk, hp)
@@ -3777,13 +3774,13 @@ def _make_soc_buff_random_friendly_type_and_ds(trigger_type: UnitType, atk: int,
         candidates = [
             unit
             for _slot, unit in ctx.iter_board_units(pos.side)
-            if trigger_type in unit.types and unit.uid != trigger_uid
+            if unit.has_type(trigger_type) and unit.uid != trigger_uid
         ]
         if not candidates:
             return
-        target = random.choice(candidates)
+        target = ctx.rng.choice(candidates)
         ctx.buff_combat(es.EntityRef(target.uid), atk, hp)
-        target.tags.add(Tags.DIVINE_SHIELD)
+        target.add_tag(Tags.DIVINE_SHIELD)
 
     return _effect
 
@@ -3865,10 +3862,10 @@ def _make_dr_buff_friendly_type_global(trigger_type: UnitType, atk: int, hp: int
         if not player:
             return
         for unit in player.board:
-            if trigger_type in unit.types:
+            if unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(unit.uid), atk, hp)
         for hc in player.hand:
-            if hc.unit and trigger_type in hc.unit.types:
+            if hc.unit and hc.unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(hc.unit.uid), atk, hp)
 
     return _effect
@@ -3906,7 +3903,7 @@ def _make_dr_buff_hand_random(atk: int, hp: int):
         candidates = [hc.unit for hc in player.hand if hc.unit is not None]
         if not candidates:
             return
-        target = random.choice(candidates)
+        target = ctx.rng.choice(candidates)
         ctx.buff_perm(es.EntityRef(target.uid), atk, hp)
 
     return _effect
@@ -3918,7 +3915,7 @@ def _make_on_friendly_attack_buff_attacker(trigger_type: UnitType, atk: int, hp:
     def _effect(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         es = _event_system()
         attacker = ctx.resolve_unit(event.source)
-        if not attacker or trigger_type not in attacker.types:
+        if not attacker or not attacker.has_type(trigger_type):
             return
         if attacker.uid == trigger_uid:
             return
@@ -3940,7 +3937,7 @@ def _make_on_friendly_attack_buff_trigger(trigger_type: UnitType, atk: int, hp:
     def _effect(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         es = _event_system()
         attacker = ctx.resolve_unit(event.source)
-        if not attacker or trigger_type not in attacker.types:
+        if not attacker or not attacker.has_type(trigger_type):
             return
         if attacker.uid == trigger_uid:
             return
@@ -3961,7 +3958,7 @@ def _make_on_friendly_play_type_buff_self_in_hand(trigger_type: UnitType, atk: i
     def _effect(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         es = _event_system()
         played = ctx.resolve_unit(event.source)
-        if not played or trigger_type not in played.types:
+        if not played or not played.has_type(trigger_type):
             return
         # Find the trigger unit in the player's hand
         for side, player in ctx.players_by_uid.items():
@@ -4029,12 +4026,12 @@ def _make_dr_damage_all_minions(damage: int):
                 continue
             for unit in list(player.board):
                 if unit.has_divine_shield:
-                    unit.tags.discard(Tags.DIVINE_SHIELD)
+                    unit.remove_tag(Tags.DIVINE_SHIELD)
                     ctx.emit_event(
                         es.Event(
                             event_type=es.EventType.DIVINE_SHIELD_LOST,
                             source=es.EntityRef(unit.uid),
-                            source_pos=es.PosRef(side=side, zone=es.Zone.BOARD, slot=-1),
+                            source_pos=es.pos_ref(side, es.Zone.BOARD, -1),
                         )
                     )
                 else:
@@ -4052,7 +4049,7 @@ def _make_soc_buff_all_friendly_type(trigger_type: UnitType, atk: int, hp: int):
         if not pos:
             return
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if trigger_type in unit.types:
+            if unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(unit.uid), atk, hp)
 
     return _effect
@@ -4069,14 +4066,14 @@ def _make_soc_give_friendly_type_reborn(trigger_type: UnitType):
         candidates = [
             unit
             for _slot, unit in ctx.iter_board_units(pos.side)
-            if trigger_type in unit.types
+            if unit.has_type(trigger_type)
             and unit.uid != trigger_uid
-            and Tags.REBORN not in unit.tags
+            and not unit.has_reborn
         ]
         if not candidates:
             return
-        target = random.choice(candidates)
-        target.tags.add(Tags.REBORN)
+        target = ctx.rng.choice(candidates)
+        target.add_tag(Tags.REBORN)
 
     return _effect
 
@@ -4085,8 +4082,6 @@ def _make_bc_add_random_unit(unit_type: Optional[UnitType], tier: Optional[int])
     """BC: add a random unit of type (or tier) from pool to hand."""
 
     def _effect(ctx: EffectContext, _event: Event, trigger_uid: int) -> None:
-        from .configs import CARD_DB
-
         es = _event_system()
         pos = ctx.resolve_pos(es.EntityRef(trigger_uid))
         if not pos:
@@ -4094,24 +4089,12 @@ def _make_bc_add_random_unit(unit_type: Optional[UnitType], tier: Optional[int])
         player = ctx.players_by_uid.get(pos.side)
         if not player or not ctx.card_pool:
             return
-        candidates: list[str] = []
-        for t, tier_cards in ctx.card_pool.tiers.items():
-            if tier is not None and t != tier:
-                continue
-            for cid in tier_cards:
-                data = CARD_DB.get(cid)
-                if data and data.get("is_token"):
-                    continue
-                if unit_type is not None and unit_type not in data.get("type", []):
-                    continue
-                candidates.append(cid)
-        if not candidates:
+        chosen = ctx.card_pool.draw_matching(
+            lambda data: unit_type is None or unit_type in data.get("type", []),
+            tier=tier,
+        )
+        if chosen is None:
             return
-        chosen = random.choice(candidates)
-        for tier_cards in ctx.card_pool.tiers.values():
-            if chosen in tier_cards:
-                tier_cards.remove(chosen)
-                break
         from .entities import Unit, HandCard
 
         uid = ctx._uid_provider()
@@ -4192,7 +4175,7 @@ def _make_eot_add_random_spell():
         ]
         if not pool_spells:
             pool_spells = [SpellIDs.TAVERN_COIN]
-        chosen = random.choice(pool_spells)
+        chosen = ctx.rng.choice(pool_spells)
         ctx.add_spell_to_hand(pos.side, chosen)
 
     return _effect
@@ -4216,8 +4199,6 @@ def _make_avenge_add_random_unit():
     """Avenge fires: add a random battlecry unit to hand (Witchwing Nestmatron)."""
 
     def _effect(ctx: EffectContext, _event: Event, trigger_uid: int) -> None:
-        from .configs import CARD_DB
-
         es = _event_system()
         pos = ctx.resolve_pos(es.EntityRef(trigger_uid))
         if not pos:
@@ -4225,19 +4206,9 @@ def _make_avenge_add_random_unit():
         player = ctx.players_by_uid.get(pos.side)
         if not player or not ctx.card_pool:
             return
-        candidates: list[str] = []
-        for tier_cards in ctx.card_pool.tiers.values():
-            for cid in tier_cards:
-                data = CARD_DB.get(cid)
-                if data and not data.get("is_token"):
-                    candidates.append(cid)
-        if not candidates:
+        chosen = ctx.card_pool.draw_matching(lambda data: True)
+        if chosen is None:
             return
-        chosen = random.choice(candidates)
-        for tier_cards in ctx.card_pool.tiers.values():
-            if chosen in tier_cards:
-                tier_cards.remove(chosen)
-                break
         from .entities import Unit, HandCard
 
         uid = ctx._uid_provider()
@@ -4265,7 +4236,7 @@ def _make_on_spell_cast_buff_board(atk: int, hp: int, trigger_type: Optional[Uni
         if source_pos and source_pos.side != unit_pos.side:
             return
         for _slot, unit in ctx.iter_board_units(unit_pos.side):
-            if trigger_type is None or trigger_type in unit.types:
+            if trigger_type is None or unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(unit.uid), atk, hp)
 
     return _effect
@@ -4283,7 +4254,7 @@ def _make_dr_summon_taunt_token(token_id: str, count: int):
             if ref:
                 unit = ctx.resolve_unit(ref)
                 if unit:
-                    unit.tags.add(Tags.TAUNT)
+                    unit.add_tag(Tags.TAUNT)
 
     return _effect
 
@@ -4359,7 +4330,7 @@ def _make_bc_make_golden_friendly_by_tier(max_tier: int):
         ]
         if not candidates:
             return
-        target = random.choice(candidates)
+        target = ctx.rng.choice(candidates)
         target.is_golden = True
         # Double stats for golden
         ctx.buff_perm(es.EntityRef(target.uid), target.cur_atk, target.cur_hp)
@@ -4376,7 +4347,7 @@ def _make_rally_buff_friendly_type_atk(trigger_type: UnitType, atk: int):
         if not pos:
             return
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if unit.uid != trigger_uid and trigger_type in unit.types:
+            if unit.uid != trigger_uid and unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(unit.uid), atk, 0)
 
     return _effect
@@ -4391,7 +4362,7 @@ def _make_on_friendly_beast_damaged_buff_self(hp: int):
         if not event.target:
             return
         target = ctx.resolve_unit(event.target)
-        if not target or UnitType.BEAST not in target.types:
+        if not target or not target.has_type(UnitType.BEAST):
             return
         if target.uid == trigger_uid:
             return
@@ -4415,7 +4386,7 @@ def _make_on_friendly_beast_damaged_buff_other(atk: int, hp: int):
         if not event.target:
             return
         damaged = ctx.resolve_unit(event.target)
-        if not damaged or UnitType.BEAST not in damaged.types:
+        if not damaged or not damaged.has_type(UnitType.BEAST):
             return
         unit_pos = ctx.resolve_pos(es.EntityRef(trigger_uid))
         if not unit_pos:
@@ -4426,11 +4397,11 @@ def _make_on_friendly_beast_damaged_buff_other(atk: int, hp: int):
         candidates = [
             unit
             for _slot, unit in ctx.iter_board_units(unit_pos.side)
-            if unit.uid != damaged.uid and UnitType.BEAST in unit.types
+            if unit.uid != damaged.uid and unit.has_type(UnitType.BEAST)
         ]
         if not candidates:
             return
-        target = random.choice(candidates)
+        target = ctx.rng.choice(candidates)
         ctx.buff_perm(es.EntityRef(target.uid), atk, hp)
 
     return _effect
@@ -4452,10 +4423,10 @@ def _make_avenge_buff_friendly_type_global(
         if not player:
             return
         for unit in player.board:
-            if trigger_type in unit.types:
+            if unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(unit.uid), atk, hp)
         for hc in player.hand:
-            if hc.unit and trigger_type in hc.unit.types:
+            if hc.unit and hc.unit.has_type(trigger_type):
                 ctx.buff_perm(es.EntityRef(hc.unit.uid), atk, hp)
 
     return _effect
@@ -4507,7 +4478,7 @@ def _make_dr_buff_all_friendlies_global(trigger_type: UnitType, atk: int, hp: in
         if not pos:
             return
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if trigger_type in unit.types or trigger_type == UnitType.ALL:
+            if unit.has_type(trigger_type) or trigger_type == UnitType.ALL:
                 ctx.buff_combat(es.EntityRef(unit.uid), atk, hp)
 
     return _effect
@@ -4522,7 +4493,7 @@ def _make_eot_buff_friendly_type_naga(atk: int, hp: int):
         if not pos:
             return
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if unit.uid != trigger_uid and UnitType.NAGA in unit.types:
+            if unit.uid != trigger_uid and unit.has_type(UnitType.NAGA):
                 ctx.buff_perm(es.EntityRef(unit.uid), atk, hp)
 
     return _effect
@@ -4540,7 +4511,7 @@ def _make_on_friendly_demon_damage_buff(atk: int, hp: int):
         if not event.source:
             return
         src = ctx.resolve_unit(event.source)
-        if not src or UnitType.DEMON not in src.types:
+        if not src or not src.has_type(UnitType.DEMON):
             return
         src_pos = ctx.resolve_pos(event.source)
         if not src_pos or src_pos.side != unit_pos.side:
@@ -4561,7 +4532,7 @@ def _make_eot_consume_tavern_for_demon():
         if not pos:
             return
         demons = [
-            unit for _slot, unit in ctx.iter_board_units(pos.side) if UnitType.DEMON in unit.types
+            unit for _slot, unit in ctx.iter_board_units(pos.side) if unit.has_type(UnitType.DEMON)
         ]
         for demon in demons:
             result = ctx.consume_random_store_unit(pos.side)
@@ -4581,7 +4552,7 @@ def _make_soc_buff_friendly_type_scaling(trigger_type: UnitType, atk: int, hp: i
         if not pos:
             return
         for _slot, unit in ctx.iter_board_units(pos.side):
-            if trigger_type in unit.types and unit.uid != trigger_uid:
+            if unit.has_type(trigger_type) and unit.uid != trigger_uid:
                 ctx.buff_combat(es.EntityRef(unit.uid), atk, hp)
 
     return _effect
@@ -4601,7 +4572,7 @@ def _make_eot_trigger_adjacent_battlecry():
                 es.Event(
                     event_type=es.EventType.MINION_PLAYED,
                     source=es.EntityRef(unit.uid),
-                    source_pos=es.PosRef(side=pos.side, zone=es.Zone.BOARD, slot=_slot),
+                    source_pos=es.pos_ref(pos.side, es.Zone.BOARD, _slot),
                 )
             )
 
@@ -4623,7 +4594,7 @@ def _make_rally_deal_damage_equal_to_atk():
         candidates = [unit for _slot, unit in ctx.iter_board_units(enemy_side) if unit.is_alive]
         if not candidates:
             return
-        target = random.choice(candidates)
+        target = ctx.rng.choice(candidates)
         target.cur_hp -= attacker.cur_atk
 
     return _effect
@@ -5718,51 +5689,68 @@ def build_trigger_registry() -> Dict[str, list]:
 # Module-level registries (importable by combat.py, game.py, tavern.py)
 # Lazy-initialized to avoid circular import:
 #   card_def → event_system → auras → entities → configs → card_def
+# and so that importing the engine (every env worker) doesn't pay for them.
 # =====================================================================
 
-_TRIGGER_REGISTRY = None
 GOLDEN_TRIGGER_REGISTRY: dict = {}
 
 
-def _get_trigger_registry():
-    global _TRIGGER_REGISTRY
-    if _TRIGGER_REGISTRY is None:
-        _TRIGGER_REGISTRY = build_trigger_registry()
-    return _TRIGGER_REGISTRY
+class _LazyRegistry:
+    """Dict-like proxy that builds its registry on first access.
+
+    After the build ``get`` is rebound to the dict's own method, so the hot
+    lookup in collect_triggers costs a single call, like a plain dict.
+    Pickles / deep-copies as a reference to the module global ``name``."""
+
+    def __init__(self, name: str, builder: Callable[[], Dict[str, Any]]) -> None:
+        self._name = name
+        self._builder = builder
+        self._registry: Optional[Dict[str, Any]] = None
+
+    @property
+    def built(self) -> bool:
+        return self._registry is not None
 
+    def _build(self) -> Dict[str, Any]:
+        if self._registry is None:
+            self._registry = self._builder()
+            self.get = self._registry.get  # type: ignore[method-assign]
+        return self._registry
 
-class _LazyTriggerRegistry:
-    """Dict-like proxy that builds TRIGGER_REGISTRY on first access."""
+    def __reduce__(self) -> str:
+        return self._name
 
     def __getattr__(self, name):
-        return getattr(_get_trigger_registry(), name)
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self._build(), name)
 
     def __getitem__(self, key):
-        return _get_trigger_registry()[key]
+        return self._build()[key]
 
     def __contains__(self, key):
-        return key in _get_trigger_registry()
+        return key in self._build()
 
     def __iter__(self):
-        return iter(_get_trigger_registry())
+        return iter(self._build())
 
     def __len__(self):
-        return len(_get_trigger_registry())
+        return len(self._build())
 
     def keys(self):
-        return _get_trigger_registry().keys()
+        return self._build().keys()
 
     def values(self):
-        return _get_trigger_registry().values()
+        return self._build().values()
 
     def items(self):
-        return _get_trigger_registry().items()
+        return self._build().items()
 
     def get(self, key, default=None):
-        return _get_trigger_registry().get(key, default)
+        return self._build().get(key, default)
 
 
-TRIGGER_REGISTRY = _LazyTriggerRegistry()
+TRIGGER_REGISTRY = _LazyRegistry("TRIGGER_REGISTRY", build_trigger_registry)
 
 
 # ---------------------------------------------------------------------------
@@ -5793,4 +5781,4 @@ def build_avenge_registry() -> Dict[str, AvengeEffect]:
     return registry
 
 
-AVENGE_REGISTRY: Dict[str, AvengeEffect] = build_avenge_registry()
+AVENGE_REGISTRY = _LazyRegistry("AVENGE_REGISTRY", build_avenge_registry)
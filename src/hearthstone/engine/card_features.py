@@ -0,0 +1,112 @@
+"""
+card_features.py — static per-card features for observation encoding, cached on disk.
+
+The table is derived from card_def.py by introspecting TRIGGER_REGISTRY, so the
+on-disk copy is keyed by the SHA-1 of that file: a stale or unreadable cache is
+rebuilt and rewritten.  With a fresh cache an env worker never builds the
+trigger registry just to construct HearthstoneEnv.
+
+Cache dir: $HS_CACHE_DIR, по умолчанию ~/.cache/hearthstone.  Запись атомарная
+(tmp + os.replace), so parallel workers can race on it safely; an unwritable
+dir only means the table is rebuilt in every process.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+FEATURE_TABLE_VERSION = 1
+
+# Order of the flags in every trigger_flags() row
+TRIGGER_FLAG_NAMES = ("battlecry", "end_of_turn", "start_of_combat", "sell", "synergy")
+NO_TRIGGER_FLAGS = (False, False, False, False, False)
+
+TriggerFlags = Tuple[bool, bool, bool, bool, bool]
+
+_CARD_DEF_PATH = Path(__file__).with_name("card_def.py")
+_TRIGGER_FLAGS: Optional[Dict[str, TriggerFlags]] = None
+
+
+def card_def_hash() -> str:
+    return hashlib.sha1(_CARD_DEF_PATH.read_bytes()).hexdigest()
+
+
+def cache_path() -> Path:
+    root = os.environ.get("HS_CACHE_DIR") or Path.home() / ".cache" / "hearthstone"
+    return Path(root) / f"card_features_v{FEATURE_TABLE_VERSION}.json"
+
+
+def _key(card_id: Any) -> str:
+    return card_id.value if isinstance(card_id, Enum) else str(card_id)
+
+
+def build_trigger_flags() -> Dict[str, TriggerFlags]:
+    """card_id -> TRIGGER_FLAG_NAMES flags, from the trigger registry (builds it)."""
+    from .card_def import TRIGGER_REGISTRY
+    from .event_system import EventType
+
+    table: Dict[str, TriggerFlags] = {}
+    for cid, triggers in TRIGGER_REGISTRY.items():
+        bc = eot = soc = sell = syn = False
+        for trig_def in triggers:
+            evt = trig_def.event_type
+            cond_name = trig_def.condition.__name__
+            if evt == EventType.MINION_PLAYED:
+                if cond_name == "_is_self_play":
+                    bc = True
+                else:
+                    syn = True
+            elif evt == EventType.MINION_SUMMONED:
+                syn = True
+            elif evt == EventType.END_OF_TURN:
+                eot = True
+            elif evt == EventType.START_OF_COMBAT:
+                soc = True
+            elif evt == EventType.MINION_SOLD:
+                sell = True
+        table[_key(cid)] = (bc, eot, soc, sell, syn)
+    return table
+
+
+def _read_cache(path: Path, key: str) -> Optional[Dict[str, TriggerFlags]]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("card_def_sha1") != key:
+        return None
+    return {cid: tuple(flags) for cid, flags in data["trigger_flags"].items()}  # type: ignore
+
+
+def _write_cache(path: Path, key: str, table: Dict[str, TriggerFlags]) -> None:
+    payload = json.dumps({"card_def_sha1": key, "trigger_flags": table}, sort_keys=True)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def trigger_flags() -> Dict[str, TriggerFlags]:
+    """Per-card trigger flags: in-process memo, then disk cache, then a fresh build.
+
+    Keys are plain card id strings; CardIDs members hash and compare equal to
+    them, so ``table.get(unit.card_id)`` works directly."""
+    global _TRIGGER_FLAGS
+    if _TRIGGER_FLAGS is None:
+        key = card_def_hash()
+        path = cache_path()
+        table = _read_cache(path, key)
+        if table is None:
+            table = build_trigger_flags()
+            _write_cache(path, key, table)
+        _TRIGGER_FLAGS = table
+    return _TRIGGER_FLAGS
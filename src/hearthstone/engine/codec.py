@@ -0,0 +1,513 @@
+"""
+codec.py — compact versioned binary encoding of Game / Player state.
+
+Replaces pickle of nested dataclasses for cross-process transfer (vector env
+workers, evolve_bot workers), ghost pool saves and replays. Everything is
+a fixed-width little-endian struct record; card ids are interned to the
+CARD_ID_MAP ints used by the C++ engine, spells to their SpellIDs index,
+and every other string (effect ids, scaling keys, spell names) goes to a
+per-payload atom table.
+
+Payload layout:
+  header  : b"HSG" | version u8 | kind u8 (game/player) | layout crc32 u32
+  atoms   : count u16, then kind u8 | len u16 | utf-8 bytes
+  body    : game record (+ RNG state, pool counts) and player records
+
+The layout crc covers card/spell codes and tiers, so a payload written by a
+tree with different card tables is rejected instead of silently decoded.
+Bump CODEC_VERSION whenever a record layout below changes.
+"""
+from __future__ import annotations
+
+import random
+import struct
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .auras import Board
+from .configs import CARD_DB, SPELL_DB
+from .cpp_bridge import CARD_ID_MAP
+from .entities import (
+    DiscoveryRequest,
+    DiscoveryState,
+    EconomyState,
+    HandCard,
+    MechanicState,
+    Player,
+    Spell,
+    StoreItem,
+    Unit,
+)
+from .enums import CardIDs, MechanicType, SpellIDs
+
+if TYPE_CHECKING:
+    from .game import Game
+
+CODEC_VERSION = 2
+_MAGIC = b"HSG"
+_KIND_GAME = 1
+_KIND_PLAYER = 2
+
+# Токены без числового кода в CARD_ID_MAP ("t001", ...) получают 2000 + индекс в CardIDs
+_CARD_CODE: Dict[str, int] = dict(CARD_ID_MAP)
+for _i, _card in enumerate(CardIDs):
+    _CARD_CODE.setdefault(_card, 2000 + _i)
+_CODE_CARD: Dict[int, CardIDs] = {code: CardIDs(cid) for cid, code in _CARD_CODE.items()}
+
+_SPELL_CODE: Dict[str, int] = {spell: i for i, spell in enumerate(SpellIDs, start=1)}
+_CODE_SPELL: Dict[int, SpellIDs] = {code: SpellIDs(spell) for spell, code in _SPELL_CODE.items()}
+
+LAYOUT_CRC = zlib.crc32(
+    "|".join(
+        [
+            f"{CardIDs(cid).value}:{code}:{CARD_DB[cid]['tier']}:{CARD_DB[cid].get('is_token', 0)}"
+            for cid, code in _CARD_CODE.items()
+            if cid in CARD_DB
+        ]
+        + [f"{spell.value}:{code}" for code, spell in _CODE_SPELL.items()]
+    ).encode()
+)
+
+# Atom kinds: строки словарей хранятся с типом, чтобы ключи CardIDs остались CardIDs
+_ATOM_STR = 0
+_ATOM_CARD = 1
+_ATOM_SPELL = 2
+_ATOM_MECHANIC = 3
+
+_HEADER = struct.Struct("<3sBBI")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_ATOM = struct.Struct("<BH")
+_GAME = struct.Struct("<BHBbII")
+_RNG = struct.Struct("<B625IBd")
+# uid, card, owner, tier, 15 stat ints, type_mask, tag_mask, flags, 4 dict sizes
+_UNIT = struct.Struct("<IHBb15iHIB4H")
+_ENTRY = struct.Struct("<Hi")
+_MODIFIER = struct.Struct("<Hii")
+# code, tier, cost, is_temporary, name atom, effect atom, changed params size
+_SPELL = struct.Struct("<HbiBHHB")
+_ITEM = struct.Struct("<BB")  # kind (0 empty / 1 unit / 2 spell), is_frozen
+_HAND = struct.Struct("<IB")  # uid, kind
+# uid, health, free_refreshes, lost_last_combat, gold, gold_next_turn, tavern_tier,
+# spell_discount, up_cost, aura_dirty, board / hand / store / modifiers / scaling sizes
+_PLAYER = struct.Struct("<BiHBiiBiiBBBBBH")
+_DISCOVERY = struct.Struct("<BbHBB")  # is_active, tier, source atom, exact, options
+_REQUEST = struct.Struct("<BbBH")  # pending discovery request: present, tier, exact, source atom
+
+_UNIT_FLAG_GOLDEN = 1
+_UNIT_FLAG_FROZEN = 2
+
+
+class _Encoder:
+    __slots__ = ("parts", "atoms")
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+        self.atoms: Dict[Tuple[int, str], int] = {}
+
+    def atom(self, value: Any) -> int:
+        if isinstance(value, CardIDs):
+            key = (_ATOM_CARD, value.value)
+        elif isinstance(value, SpellIDs):
+            key = (_ATOM_SPELL, value.value)
+        elif isinstance(value, MechanicType):
+            key = (_ATOM_MECHANIC, value.value)
+        else:
+            key = (_ATOM_STR, str(value))
+        idx = self.atoms.get(key)
+        if idx is None:
+            idx = self.atoms[key] = len(self.atoms)
+        return idx
+
+    def counter(self, values: Dict[Any, int]) -> None:
+        pack, atom, parts = _ENTRY.pack, self.atom, self.parts
+        for key, value in values.items():
+            parts.append(pack(atom(key), value))
+
+    def unit(self, u: Unit) -> None:
+        flags = (_UNIT_FLAG_GOLDEN if u.is_golden else 0) | (
+            _UNIT_FLAG_FROZEN if u.is_frozen else 0
+        )
+        self.parts.append(
+            _UNIT.pack(
+                u.uid,
+                _CARD_CODE[u.card_id],
+                u.owner_id,
+                u.tier,
+                u.base_hp,
+                u.base_atk,
+                u.max_hp,
+                u.max_atk,
+                u.cur_hp,
+                u.cur_atk,
+                u.perm_hp_add,
+                u.perm_atk_add,
+                u.turn_hp_add,
+                u.turn_atk_add,
+                u.combat_hp_add,
+                u.combat_atk_add,
+                u.aura_hp_add,
+                u.aura_atk_add,
+                u.avenge_counter,
+                u.type_mask,
+                u.tag_mask,
+                flags,
+                len(u.attached_perm),
+                len(u.attached_turn),
+                len(u.attached_combat),
+                len(u.absorbed_pool_copies),
+            )
+        )
+        for values in (u.attached_perm, u.attached_turn, u.attached_combat):
+            if values:
+                self.counter(values)
+        if u.absorbed_pool_copies:
+            self.counter(u.absorbed_pool_copies)
+
+    def spell(self, s: Spell) -> None:
+        # params храним как отличия от SPELL_DB (там бывают set[Tags] и EffectIDs)
+        defaults = SPELL_DB[s.card_id].get("params", {})
+        changed = {k: v for k, v in s.params.items() if k not in defaults or defaults[k] != v}
+        self.parts.append(
+            _SPELL.pack(
+                _SPELL_CODE[s.card_id],
+                s.tier,
+                s.cost,
+                s.is_temporary,
+                self.atom(s.name),
+                self.atom(s.effect),
+                len(changed),
+            )
+        )
+        if changed:
+            self.counter(changed)
+
+    def item(self, item: StoreItem) -> None:
+        if item.unit is not None:
+            self.parts.append(_ITEM.pack(1, item.is_frozen))
+            self.unit(item.unit)
+        elif item.spell is not None:
+            self.parts.append(_ITEM.pack(2, item.is_frozen))
+            self.spell(item.spell)
+        else:
+            self.parts.append(_ITEM.pack(0, item.is_frozen))
+
+    def player(self, p: Player) -> None:
+        request = p.pending_discovery_request
+        if request is not None and request.predicate is not None:
+            # predicate — произвольная функция, её не закодировать
+            raise ValueError("Cannot encode a discovery request with a predicate")
+        eco, mech, disc = p.economy, p.mechanics, p.discovery
+        self.parts.append(
+            _PLAYER.pack(
+                p.uid,
+                p.health,
+                p.free_refreshes,
+                p.lost_last_combat,
+                eco.gold,
+                eco.gold_next_turn,
+                eco.tavern_tier,
+                eco.spell_discount,
+                eco.up_cost,
+                getattr(p.board, "aura_dirty", False),
+                len(p.board),
+                len(p.hand),
+                len(eco.store),
+                len(mech.modifiers),
+                len(mech.scaling_counters),
+            )
+        )
+        for u in p.board:
+            self.unit(u)
+        for card in p.hand:
+            if card.unit is not None:
+                self.parts.append(_HAND.pack(card.uid, 1))
+                self.unit(card.unit)
+            elif card.spell is not None:
+                self.parts.append(_HAND.pack(card.uid, 2))
+                self.spell(card.spell)
+            else:
+                self.parts.append(_HAND.pack(card.uid, 0))
+        for item in eco.store:
+            self.item(item)
+        for key, (atk, hp) in mech.modifiers.items():
+            self.parts.append(_MODIFIER.pack(self.atom(key), atk, hp))
+        self.counter(mech.scaling_counters)
+        self.parts.append(
+            _DISCOVERY.pack(
+                disc.is_active,
+                disc.discover_tier,
+                self.atom(disc.source),
+                disc.is_exact_tier,
+                len(disc.options),
+            )
+        )
+        for item in disc.options:
+            self.item(item)
+        if request is None:
+            self.parts.append(_REQUEST.pack(0, 0, 0, 0))
+        else:
+            self.parts.append(
+                _REQUEST.pack(1, request.tier, request.exact_tier, self.atom(request.source))
+            )
+
+    def finish(self, kind: int) -> bytes:
+        head = [_HEADER.pack(_MAGIC, CODEC_VERSION, kind, LAYOUT_CRC), _U16.pack(len(self.atoms))]
+        for atom_kind, text in self.atoms:
+            raw = text.encode()
+            head.append(_ATOM.pack(atom_kind, len(raw)))
+            head.append(raw)
+        return b"".join(head + self.parts)
+
+
+class _Decoder:
+    __slots__ = ("buf", "off", "atoms")
+
+    def __init__(self, data: bytes, kind: int) -> None:
+        self.buf = memoryview(data)
+        self.off = 0
+        magic, version, got_kind, crc = self.read(_HEADER)
+        if magic != _MAGIC:
+            raise ValueError("Not a hearthstone state payload")
+        if version != CODEC_VERSION:
+            raise ValueError(f"Unsupported codec version {version} (expected {CODEC_VERSION})")
+        if got_kind != kind:
+            raise ValueError(f"Payload kind {got_kind} does not match expected {kind}")
+        if crc != LAYOUT_CRC:
+            raise ValueError("Card layout mismatch: payload was written with other card tables")
+        (n_atoms,) = self.read(_U16)
+        atoms: List[Any] = []
+        for _ in range(n_atoms):
+            atom_kind, size = self.read(_ATOM)
+            text = bytes(self.buf[self.off : self.off + size]).decode()
+            self.off += size
+            if atom_kind == _ATOM_CARD:
+                atoms.append(CardIDs(text))
+            elif atom_kind == _ATOM_SPELL:
+                atoms.append(SpellIDs(text))
+            elif atom_kind == _ATOM_MECHANIC:
+                atoms.append(MechanicType(text))
+            else:
+                atoms.append(text)
+        self.atoms = atoms
+
+    def read(self, record: struct.Struct) -> Tuple[Any, ...]:
+        values = record.unpack_from(self.buf, self.off)
+        self.off += record.size
+        return values
+
+    def counter(self, n: int) -> Dict[Any, int]:
+        if not n:
+            return {}
+        atoms, buf, unpack, size = self.atoms, self.buf, _ENTRY.unpack_from, _ENTRY.size
+        out: Dict[Any, int] = {}
+        off = self.off
+        for _ in range(n):
+            key, value = unpack(buf, off)
+            out[atoms[key]] = value
+            off += size
+        self.off = off
+        return out
+
+    def unit(self) -> Unit:
+        v = _UNIT.unpack_from(self.buf, self.off)
+        self.off += _UNIT.size
+        counter = self.counter
+        flags = v[21]
+        # Горячий путь: __dict__ собирается напрямую, без dataclass __init__ с kwargs
+        unit = object.__new__(Unit)
+        unit.__dict__ = {
+            "uid": v[0],
+            "card_id": _CODE_CARD[v[1]],
+            "owner_id": v[2],
+            "tier": v[3],
+            "base_hp": v[4],
+            "base_atk": v[5],
+            "max_hp": v[6],
+            "max_atk": v[7],
+            "cur_hp": v[8],
+            "cur_atk": v[9],
+            "perm_hp_add": v[10],
+            "perm_atk_add": v[11],
+            "turn_hp_add": v[12],
+            "turn_atk_add": v[13],
+            "combat_hp_add": v[14],
+            "combat_atk_add": v[15],
+            "aura_hp_add": v[16],
+            "aura_atk_add": v[17],
+            "avenge_counter": v[18],
+            "attached_perm": counter(v[22]),
+            "attached_turn": counter(v[23]),
+            "attached_combat": counter(v[24]),
+            "type_mask": v[19],
+            "is_golden": bool(flags & _UNIT_FLAG_GOLDEN),
+            "is_frozen": bool(flags & _UNIT_FLAG_FROZEN),
+            "tag_mask": v[20],
+            "absorbed_pool_copies": counter(v[25]),
+        }
+        return unit
+
+    def spell(self) -> Spell:
+        code, tier, cost, temporary, name, effect, n_params = self.read(_SPELL)
+        spell_id = _CODE_SPELL[code]
+        params = dict(SPELL_DB[spell_id].get("params", {}))
+        params.update(self.counter(n_params))
+        return Spell(
+            card_id=spell_id,
+            name=self.atoms[name],
+            tier=tier,
+            cost=cost,
+            effect=self.atoms[effect],
+            params=params,
+            is_temporary=bool(temporary),
+        )
+
+    def item(self) -> StoreItem:
+        kind, frozen = self.read(_ITEM)
+        if kind == 1:
+            return StoreItem(unit=self.unit(), is_frozen=bool(frozen))
+        if kind == 2:
+            return StoreItem(spell=self.spell(), is_frozen=bool(frozen))
+        return StoreItem(is_frozen=bool(frozen))
+
+    def hand_card(self) -> HandCard:
+        uid, kind = self.read(_HAND)
+        if kind == 1:
+            return HandCard(uid=uid, unit=self.unit())
+        if kind == 2:
+            return HandCard(uid=uid, spell=self.spell())
+        return HandCard(uid=uid)
+
+    def player(self) -> Player:
+        (
+            uid,
+            health,
+            free_refreshes,
+            lost,
+            gold,
+            gold_next_turn,
+            tavern_tier,
+            spell_discount,
+            up_cost,
+            aura_dirty,
+            n_board,
+            n_hand,
+            n_store,
+            n_modifiers,
+            n_scaling,
+        ) = self.read(_PLAYER)
+        board = Board([self.unit() for _ in range(n_board)])
+        # Счётчик источников пересчитан конструктором, флаг берём как был
+        board.aura_dirty = bool(aura_dirty)
+        hand = [self.hand_card() for _ in range(n_hand)]
+        store = [self.item() for _ in range(n_store)]
+        modifiers: Dict[MechanicType, Tuple[int, int]] = {}
+        for _ in range(n_modifiers):
+            key, atk, hp = self.read(_MODIFIER)
+            modifiers[self.atoms[key]] = (atk, hp)
+        scaling = self.counter(n_scaling)
+        active, disc_tier, source, exact, n_options = self.read(_DISCOVERY)
+        discovery = DiscoveryState(
+            is_active=bool(active),
+            options=[self.item() for _ in range(n_options)],
+            discover_tier=disc_tier,
+            source=self.atoms[source],
+            is_exact_tier=bool(exact),
+        )
+        pending, req_tier, req_exact, req_source = self.read(_REQUEST)
+        request = (
+            DiscoveryRequest(
+                tier=req_tier, exact_tier=bool(req_exact), source=self.atoms[req_source]
+            )
+            if pending
+            else None
+        )
+        return Player(
+            uid=uid,
+            board=board,
+            hand=hand,
+            economy=EconomyState(
+                gold=gold,
+                gold_next_turn=gold_next_turn,
+                tavern_tier=tavern_tier,
+                spell_discount=spell_discount,
+                up_cost=up_cost,
+                store=store,
+            ),
+            mechanics=MechanicState(modifiers=modifiers, scaling_counters=scaling),
+            health=health,
+            discovery=discovery,
+            free_refreshes=free_refreshes,
+            lost_last_combat=bool(lost),
+            pending_discovery_request=request,
+        )
+
+
+def encode_player(player: Player) -> bytes:
+    enc = _Encoder()
+    enc.player(player)
+    return enc.finish(_KIND_PLAYER)
+
+
+def decode_player(data: bytes) -> Player:
+    return _Decoder(data, _KIND_PLAYER).player()
+
+
+def encode_game(game: Game) -> bytes:
+    enc = _Encoder()
+    parts = enc.parts
+    ready = game.players_ready
+    flags = (
+        (1 if game.game_over else 0)
+        | (2 if ready.get(0, False) else 0)
+        | (4 if ready.get(1, False) else 0)
+    )
+    parts.append(
+        _GAME.pack(
+            game.max_tier,
+            game.turn_count,
+            flags,
+            -1 if game.winner_id is None else game.winner_id,
+            game.tavern._uid_counter,
+            game.combat.uid,
+        )
+    )
+    rng_version, internal, gauss = game.rng.getstate()
+    parts.append(_RNG.pack(rng_version, *internal, gauss is not None, gauss or 0.0))
+    counts_by_tier = game.pool.counts_by_tier()
+    parts.append(_U8.pack(len(counts_by_tier)))
+    for counts in counts_by_tier:
+        parts.append(struct.pack(f"<H{len(counts)}H", len(counts), *counts))
+    parts.append(_U8.pack(len(game.players)))
+    for p in game.players:
+        enc.player(p)
+    return enc.finish(_KIND_GAME)
+
+
+def decode_game(data: bytes, game: Game) -> Game:
+    """Fill a bare ``Game.__new__(Game)`` from ``encode_game`` output."""
+    dec = _Decoder(data, _KIND_GAME)
+    max_tier, turn_count, flags, winner, tavern_uid, combat_uid = dec.read(_GAME)
+    rng_state = dec.read(_RNG)
+    rng = random.Random(0)  # состояние сразу перезаписывается; без сида — лишний urandom
+    gauss: Optional[float] = rng_state[627] if rng_state[626] else None
+    rng.setstate((rng_state[0], tuple(rng_state[1:626]), gauss))
+    game._init_managers(max_tier, rng)
+
+    (n_tiers,) = dec.read(_U8)
+    counts_by_tier = []
+    for _ in range(n_tiers):
+        (n,) = dec.read(_U16)
+        counts_by_tier.append(struct.unpack_from(f"<{n}H", dec.buf, dec.off))
+        dec.off += 2 * n
+    game.pool.set_counts(counts_by_tier)
+
+    (n_players,) = dec.read(_U8)
+    game.players = [dec.player() for _ in range(n_players)]
+    game.tavern._uid_counter = tavern_uid
+    game.combat.uid = combat_uid
+    game.turn_count = turn_count
+    game.game_over = bool(flags & 1)
+    game.winner_id = None if winner < 0 else winner
+    game.players_ready = {0: bool(flags & 2), 1: bool(flags & 4)}
+    return game
@@ -1,9 +1,12 @@
+import itertools
 import random
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .auras import recalculate_board_auras
 from .card_def import AVENGE_REGISTRY, GOLDEN_TRIGGER_REGISTRY, TRIGGER_REGISTRY, AvengeEffect
-from .cpp_bridge import CARD_ID_MAP, TAG_TO_BIT, TYPE_TO_BIT, get_cpp_engine
+from .cpp_bridge import CARD_ID_MAP, get_cpp_engine
 from .entities import Player, Unit
 from .enums import BattleOutcome, Tags
 from .event_system import (
@@ -17,7 +20,9 @@ from .event_system import (
     TriggerDef,
     TriggerInstance,
     Zone,
+    pos_ref,
 )
+from .rng import default_rng
 
 
 def _execute_avenge(
@@ -25,8 +30,11 @@ def _execute_avenge(
     avenge_def: AvengeEffect,
     combat_players: dict[int, Player],
     dead_side_uid: int,
+    rng: random.Random | None = None,
 ) -> None:
     """Apply avenge buff based on the AvengeEffect definition."""
+    if rng is None:
+        rng = default_rng()
     side_uid = dead_side_uid
     player = combat_players.get(side_uid)
     if not player:
@@ -56,14 +64,14 @@ def _execute_avenge(
     elif target == "friendly_type":
         t = avenge_def.target_type
         for unit in board:
-            if t is None or t in unit.types:
+            if t is None or unit.has_type(t):
                 _apply_buff(unit)
 
     elif target == "random_friendly_type":
         t = avenge_def.target_type
-        candidates = [u for u in board if (t is None or t in u.types) and u.is_alive]
+        candidates = [u for u in board if (t is None or u.has_type(t)) and u.is_alive]
         if candidates:
-            _apply_buff(random.choice(candidates))
+            _apply_buff(rng.choice(candidates))
 
     elif target == "adjacent":
         # find avenger index in board
@@ -78,8 +86,6 @@ def _execute_avenge(
         player.free_refreshes += 1
 
     elif target == "add_spell":
-        import random as _random
-
         from .configs import SPELL_DB as _SPELL_DB
         from .entities import HandCard as _HandCard
         from .entities import Spell as _Spell
@@ -92,13 +98,11 @@ def _execute_avenge(
             if data.get("pool", True) and sid != _SpellIDs.TRIPLET_REWARD
         ]
         if pool_spells:
-            spell_id = _random.choice(pool_spells)
+            spell_id = rng.choice(pool_spells)
         spell = _Spell.create_from_db(spell_id)
         player.hand.append(_HandCard(uid=0, spell=spell))
 
     elif target == "add_unit":
-        import random as _random
-
         from .configs import CARD_DB as _CARD_DB
         from .entities import HandCard as _HandCard
         from .entities import Unit as _Unit
@@ -110,15 +114,17 @@ def _execute_avenge(
         ]
         if not candidates:
             return
-        chosen = _random.choice(candidates)
+        chosen = rng.choice(candidates)
         uid_val = max((u.uid for p in combat_players.values() for u in p.board), default=10000) + 1
         new_unit = _Unit.create_from_db(chosen, uid_val, side_uid)
         player.hand.append(_HandCard(uid=uid_val, unit=new_unit))
 
 
 class CombatManager:
-    def __init__(self, event_manager: EventManager | None = None):
+    def __init__(self, event_manager: EventManager | None = None, rng: random.Random | None = None):
         self.uid = 10000
+        # Генератор для всех случайных решений боя; по умолчанию — модульный random
+        self.rng: random.Random = rng if rng is not None else default_rng()
         self.event_manager = event_manager or EventManager(
             TRIGGER_REGISTRY, GOLDEN_TRIGGER_REGISTRY
         )
@@ -132,34 +138,31 @@ class CombatManager:
     # =================================================================
     @staticmethod
     def _unit_to_cpp(unit: Unit) -> tuple:
-        """Convert Python Unit → C++ tuple (card_id, atk, hp, types, tags, tier, golden)."""
-        cpp_card_id = CARD_ID_MAP.get(unit.card_id, 0)
-        cpp_types = 0
-        for t in unit.types:
-            cpp_types |= TYPE_TO_BIT.get(t, 0)
-        cpp_tags = 0
-        for tag in unit.tags:
-            cpp_tags |= TAG_TO_BIT.get(tag, 0)
+        """Convert Python Unit → C++ tuple (card_id, atk, hp, types, tags, tier, golden).
+        Unit masks already use the cpp/include/types.h layout, so they are copied as-is."""
         return (
-            cpp_card_id,
+            CARD_ID_MAP.get(unit.card_id, 0),
             unit.cur_atk,
             unit.cur_hp,
-            cpp_types,
-            cpp_tags,
+            unit.type_mask,
+            unit.tag_mask,
             unit.tier,
             unit.is_golden,
         )
 
     @staticmethod
-    def _apply_hand_soc(player: Player) -> None:
-        """Pre-combat: summon copies of hand units with StartOfCombat-from-hand effects.
-        Currently: Flighty Scout — SoC: if in hand, summon a copy."""
+    def _combat_board(player: Player) -> List[Unit]:
+        """Board for the C++ engine: player.board plus the units summoned by
+        StartOfCombat-from-hand effects, which the C++ engine does not run.
+        Currently: Flighty Scout — SoC: if in hand, summon a copy.
+        The player is not modified."""
         from .enums import CardIDs
 
-        for hc in list(player.hand):
+        board = list(player.board)
+        for hc in player.hand:
             if not hc.unit or hc.unit.card_id != CardIDs.FLIGHTY_SCOUT:
                 continue
-            if len(player.board) >= 7:
+            if len(board) >= 7:
                 break
             copy = Unit.create_from_db(
                 hc.unit.card_id,
@@ -170,18 +173,16 @@ class CombatManager:
             copy.perm_atk_add = hc.unit.perm_atk_add
             copy.perm_hp_add = hc.unit.perm_hp_add
             copy.recalc_stats()
-            player.board.append(copy)
+            board.append(copy)
+        return board
 
     def resolve_combat_fast(self, player_1: Player, player_2: Player) -> tuple[BattleOutcome, int]:
         """C++ accelerated combat — same interface as resolve_combat()."""
         cpp = get_cpp_engine()
         assert cpp is not None, "C++ engine not loaded"
-        # Pre-combat: handle hand-based SoC effects before passing to C++
-        self._apply_hand_soc(player_1)
-        self._apply_hand_soc(player_2)
-        side0 = [self._unit_to_cpp(u) for u in player_1.board]
-        side1 = [self._unit_to_cpp(u) for u in player_2.board]
-        seed = random.getrandbits(64)
+        side0 = [self._unit_to_cpp(u) for u in self._combat_board(player_1)]
+        side1 = [self._unit_to_cpp(u) for u in self._combat_board(player_2)]
+        seed = self.rng.getrandbits(64)
         outcome, damage = cpp.fast_combat(
             side0,
             side1,
@@ -191,12 +192,125 @@ class CombatManager:
         )
         return BattleOutcome(outcome), damage
 
+    def resolve_combats(
+        self,
+        pairs: Sequence[Tuple[Player, Player]],
+        use_cpp: Optional[bool] = None,
+    ) -> List[Tuple[BattleOutcome, int]]:
+        """Resolve several independent combats, e.g. every pairing of a lobby round.
+
+        With the C++ engine loaded (``use_cpp=None``) all boards go to
+        ``fast_combat_pairs`` in one call that runs the combats without the
+        GIL; otherwise each pair goes through resolve_combat(). Results are
+        in ``pairs`` order, with the same meaning as resolve_combat().
+        """
+        cpp = get_cpp_engine() if use_cpp is not False else None
+        if use_cpp and cpp is None:
+            raise RuntimeError("C++ engine not loaded")
+        if cpp is None:
+            return [self.resolve_combat(p1, p2) for p1, p2 in pairs]
+        if not hasattr(cpp, "fast_combat_pairs"):  # модуль собран до fast_combat_pairs
+            return [self.resolve_combat_fast(p1, p2) for p1, p2 in pairs]
+
+        # Конвертация как в _unit_to_cpp, но инлайн: вызов метода на юнит дороже самих полей
+        card_code = CARD_ID_MAP.get
+        combats = []
+        for player_1, player_2 in pairs:
+            side0, side1 = (
+                [
+                    (
+                        card_code(u.card_id, 0),
+                        u.cur_atk,
+                        u.cur_hp,
+                        u.type_mask,
+                        u.tag_mask,
+                        u.tier,
+                        u.is_golden,
+                    )
+                    for u in self._combat_board(p)
+                ]
+                for p in (player_1, player_2)
+            )
+            combats.append(
+                (side0, side1, self.rng.getrandbits(64), player_1.tavern_tier, player_2.tavern_tier)
+            )
+        return [
+            (BattleOutcome(outcome), damage) for outcome, damage in cpp.fast_combat_pairs(combats)
+        ]
+
     def resolve_combat(self, player_1: Player, player_2: Player) -> tuple[BattleOutcome, int]:
         combat_players = {
             player_1.uid: player_1.combat_copy(),
             player_2.uid: player_2.combat_copy(),
         }
+        return self._run_combat(player_1, player_2, combat_players, self.rng, self.get_uid)
 
+    def simulate_many(
+        self,
+        player_1: Player,
+        player_2: Player,
+        n: int,
+        seed: Optional[int] = None,
+        use_cpp: Optional[bool] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Run ``n`` independent combats of player_1 vs player_2.
+
+        Returns ``(outcomes, damage)`` arrays of shape ``(n,)``: outcomes are
+        BattleOutcome values (int8), damage is signed as in resolve_combat
+        (int32). Uses ``fast_combat_batch`` when the C++ engine is loaded
+        (``use_cpp=None``), otherwise the Python engine: both players are
+        snapshotted once and each simulation clones only the snapshot boards.
+        All randomness (first attacker, targets, card effects) comes from a
+        private ``random.Random(seed)`` and summoned units get private uids, so
+        the players and the manager are left untouched and the call is safe
+        to run from a worker thread.
+        """
+        rng = random.Random(seed)
+        outcomes = np.empty(n, dtype=np.int8)
+        damage = np.empty(n, dtype=np.int32)
+
+        cpp = get_cpp_engine() if use_cpp is not False else None
+        if use_cpp and cpp is None:
+            raise RuntimeError("C++ engine not loaded")
+        if cpp is not None:
+            results = cpp.fast_combat_batch(
+                [self._unit_to_cpp(u) for u in self._combat_board(player_1)],
+                [self._unit_to_cpp(u) for u in self._combat_board(player_2)],
+                rng.getrandbits(64),
+                n,
+                tavern_tier_0=player_1.tavern_tier,
+                tavern_tier_1=player_2.tavern_tier,
+            )
+            for i, (outcome, dmg) in enumerate(results):
+                outcomes[i] = outcome
+                damage[i] = dmg
+            return outcomes, damage
+
+        snapshot_1 = player_1.combat_copy()
+        snapshot_2 = player_2.combat_copy()
+        # Магазин на исход боя не влияет, а его юниты — общие с живым игроком
+        snapshot_1.store.clear()
+        snapshot_2.store.clear()
+        # Свои uid: счётчик менеджера — состояние игры, а вызов может идти из потока оракула
+        get_uid = itertools.count(self.uid + 1).__next__
+        for i in range(n):
+            combat_players = {
+                player_1.uid: snapshot_1.sim_copy(),
+                player_2.uid: snapshot_2.sim_copy(),
+            }
+            outcome, dmg = self._run_combat(player_1, player_2, combat_players, rng, get_uid)
+            outcomes[i] = outcome.value
+            damage[i] = dmg
+        return outcomes, damage
+
+    def _run_combat(
+        self,
+        player_1: Player,
+        player_2: Player,
+        combat_players: dict[int, Player],
+        rng: random.Random,
+        get_uid: Callable[[], int],
+    ) -> tuple[BattleOutcome, int]:
         boards = [i.board for i in combat_players.values()]
         board_1, board_2 = boards
         recalculate_board_auras(board_1)
@@ -206,29 +320,30 @@ class CombatManager:
         elif len(board_2) > len(board_1):
             attacker_player_idx = 1
         else:
-            attacker_player_idx = random.choice([0, 1])
+            attacker_player_idx = rng.choice([0, 1])
         attacker_uid = player_1.uid if attacker_player_idx == 0 else player_2.uid
         self.event_manager.process_event(
             Event(
                 event_type=EventType.START_OF_COMBAT,
-                source_pos=PosRef(side=attacker_uid, zone=Zone.BOARD, slot=-1),
+                source_pos=pos_ref(attacker_uid, Zone.BOARD, -1),
             ),
             combat_players,
-            self.get_uid,
+            get_uid,
+            rng=rng,
         )
         attack_indices = [0, 0]
-        self.cleanup_dead(boards, attack_indices, combat_players)
+        self.cleanup_dead(boards, attack_indices, combat_players, rng, get_uid)
 
         def _find_target(target_board: List[Unit]) -> Unit:
             taunts = [u for u in target_board if u.has_taunt]
             if taunts:
-                return random.choice(taunts)
-            return random.choice(target_board)
+                return rng.choice(taunts)
+            return rng.choice(target_board)
 
         can_attack = [1, 1]
         while True:
             end_battle = self.check_end_of_battle(
-                board_1, board_2, player_1, player_2, combat_players
+                board_1, board_2, player_1, player_2, combat_players, rng, get_uid
             )
             if end_battle[0] != BattleOutcome.NO_END:
                 return end_battle
@@ -245,10 +360,10 @@ class CombatManager:
                 for side in scan_order:
                     board = boards[side]
                     for unit in board:
-                        if unit.is_alive and Tags.IMMEDIATE_ATTACK in unit.tags:
+                        if unit.is_alive and unit.has_immediate_attack:
                             attack_queue.append(unit)
                             # discard RIGHT NOW because it goes infinite
-                            unit.tags.discard(Tags.IMMEDIATE_ATTACK)
+                            unit.remove_tag(Tags.IMMEDIATE_ATTACK)
                 if not attack_queue:
                     break
                 # 1.2 Execute attacks
@@ -272,11 +387,11 @@ class CombatManager:
                     target = _find_target(boards[enemy_side])
 
                     if target:
-                        self.perform_attack(unit, target, combat_players)
+                        self.perform_attack(unit, target, combat_players, rng, get_uid)
                         # clean after every attack
-                        self.cleanup_dead(boards, attack_indices, combat_players)
+                        self.cleanup_dead(boards, attack_indices, combat_players, rng, get_uid)
                         end_battle = self.check_end_of_battle(
-                            board_1, board_2, player_1, player_2, combat_players
+                            board_1, board_2, player_1, player_2, combat_players, rng, get_uid
                         )
                         if end_battle[0] != BattleOutcome.NO_END:
                             return end_battle
@@ -310,14 +425,14 @@ class CombatManager:
             for i in range(num_attacks):
                 target = _find_target(defender_board)
 
-                self.perform_attack(attacker_unit, target, combat_players)
+                self.perform_attack(attacker_unit, target, combat_players, rng, get_uid)
 
-                self.cleanup_dead(boards, attack_indices, combat_players)
+                self.cleanup_dead(boards, attack_indices, combat_players, rng, get_uid)
 
                 if not attacker_unit.is_alive:
                     break
                 end_battle = self.check_end_of_battle(
-                    board_1, board_2, player_1, player_2, combat_players
+                    board_1, board_2, player_1, player_2, combat_players, rng, get_uid
                 )
                 if end_battle[0] != BattleOutcome.NO_END:
                     return end_battle
@@ -334,12 +449,19 @@ class CombatManager:
         player_1: Player,
         player_2: Player,
         combat_players: dict[int, Player],
+        rng: Optional[random.Random] = None,
+        get_uid: Optional[Callable[[], int]] = None,
     ) -> tuple[BattleOutcome, int]:
+        if rng is None:
+            rng = self.rng
+        if get_uid is None:
+            get_uid = self.get_uid
         if not board_1 or not board_2:
             self.event_manager.process_event(
                 Event(event_type=EventType.END_OF_COMBAT),
                 combat_players,
-                self.get_uid,
+                get_uid,
+                rng=rng,
             )
         if not board_1 and not board_2:
             return BattleOutcome.DRAW, 0
@@ -352,11 +474,20 @@ class CombatManager:
         return BattleOutcome.NO_END, 0
 
     def perform_attack(
-        self, attacker: Unit, target: Unit, combat_players: dict[int, Player]
+        self,
+        attacker: Unit,
+        target: Unit,
+        combat_players: dict[int, Player],
+        rng: Optional[random.Random] = None,
+        get_uid: Optional[Callable[[], int]] = None,
     ) -> None:
         """
         Perform attack with all additional mechanics
         """
+        if rng is None:
+            rng = self.rng
+        if get_uid is None:
+            get_uid = self.get_uid
         attacker_ref = EntityRef(attacker.uid)
         target_ref = EntityRef(target.uid)
         attacker_pos = self._find_pos(combat_players, attacker.uid)
@@ -370,7 +501,8 @@ class CombatManager:
                 target_pos=target_pos,
             ),
             combat_players,
-            self.get_uid,
+            get_uid,
+            rng=rng,
         )
         victims_data: List[Tuple[Unit, Optional[PosRef], EntityRef]] = []
 
@@ -417,7 +549,7 @@ class CombatManager:
                     continue
                 hp_before = victim_unit.cur_hp
                 if victim_unit.has_divine_shield:
-                    victim_unit.tags.discard(Tags.DIVINE_SHIELD)
+                    victim_unit.remove_tag(Tags.DIVINE_SHIELD)
                     actual_damage = 0
                     self.event_manager.process_event(
                         Event(
@@ -428,7 +560,8 @@ class CombatManager:
                             target_pos=source_pos,
                         ),
                         combat_players,
-                        self.get_uid,
+                        get_uid,
+                        rng=rng,
                     )
                 else:
                     victim_unit.cur_hp -= dmg_amount
@@ -450,7 +583,8 @@ class CombatManager:
                             value=actual_damage - hp_before,  # how much overdmg
                         ),
                         combat_players,
-                        self.get_uid,
+                        get_uid,
+                        rng=rng,
                     )
 
                 if actual_damage > 0:
@@ -464,7 +598,8 @@ class CombatManager:
                             value=actual_damage,
                         ),
                         combat_players,
-                        self.get_uid,
+                        get_uid,
+                        rng=rng,
                     )
                     self.event_manager.process_event(
                         Event(
@@ -476,10 +611,11 @@ class CombatManager:
                             value=actual_damage,
                         ),
                         combat_players,
-                        self.get_uid,
+                        get_uid,
+                        rng=rng,
                     )
             if venom_used:
-                source_unit.tags.discard(Tags.VENOMOUS)
+                source_unit.remove_tag(Tags.VENOMOUS)
 
         _apply_damage_batch(attacker, attacker_ref, attacker_pos, victims_data)
         _apply_damage_batch(
@@ -494,7 +630,8 @@ class CombatManager:
                 target_pos=target_pos,
             ),
             combat_players,
-            self.get_uid,
+            get_uid,
+            rng=rng,
         )
 
     def _collect_death_triggers(self, unit: Unit) -> List[TriggerInstance]:
@@ -550,7 +687,7 @@ class CombatManager:
                     reborn_unit = ctx.resolve_unit(summoned_ref)
                     if reborn_unit:
                         reborn_unit.cur_hp = 1
-                        reborn_unit.tags.discard(Tags.REBORN)
+                        reborn_unit.remove_tag(Tags.REBORN)
 
             triggers.append(
                 TriggerInstance(
@@ -571,15 +708,24 @@ class CombatManager:
         for side, player in combat_players.items():
             for slot, unit in enumerate(player.board):
                 if unit.uid == uid:
-                    return PosRef(side=side, zone=Zone.BOARD, slot=slot)
+                    return pos_ref(side, Zone.BOARD, slot)
         return None
 
     def cleanup_dead(
-        self, boards: List[List[Unit]], attack_indices: List[int], combat_players: dict[int, Player]
+        self,
+        boards: List[List[Unit]],
+        attack_indices: List[int],
+        combat_players: dict[int, Player],
+        rng: Optional[random.Random] = None,
+        get_uid: Optional[Callable[[], int]] = None,
     ) -> None:
         """
         Clean board after death and move attack indexes where they should be
         """
+        if rng is None:
+            rng = self.rng
+        if get_uid is None:
+            get_uid = self.get_uid
         for p_idx in range(2):
             board = boards[p_idx]
             i = 0
@@ -591,11 +737,11 @@ class CombatManager:
                         uid=unit.uid,
                         card_id=unit.card_id,
                         owner_id=unit.owner_id,
-                        pos=PosRef(side=unit.owner_id, zone=Zone.BOARD, slot=i),
+                        pos=pos_ref(unit.owner_id, Zone.BOARD, i),
                         atk=unit.cur_atk,
                         hp=unit.cur_hp,
-                        types=list(unit.types),
-                        tags=set(unit.tags),
+                        type_mask=unit.type_mask,
+                        tag_mask=unit.tag_mask,
                     )
                     death_event = Event(
                         event_type=EventType.MINION_DIED,
@@ -615,8 +761,9 @@ class CombatManager:
                     self.event_manager.process_event(
                         death_event,
                         combat_players,
-                        self.get_uid,
+                        get_uid,
                         extra_triggers=extra_triggers,
+                        rng=rng,
                     )
                     units_added = len(board) - before_len
 
@@ -635,7 +782,9 @@ class CombatManager:
                         friendly.avenge_counter -= 1
                         if friendly.avenge_counter == 0:
                             friendly.avenge_counter = avenge_def.threshold
-                            _execute_avenge(friendly, avenge_def, combat_players, dead_side_uid)
+                            _execute_avenge(
+                                friendly, avenge_def, combat_players, dead_side_uid, rng
+                            )
 
                 else:
                     i += 1
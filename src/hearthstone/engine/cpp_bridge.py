@@ -6,29 +6,26 @@ and provides a single get_cpp_engine() entry point.
 
 Tables are auto-generated from enums.py — no need to update manually
 when adding new cards/tags/types. The bit layout matches
-cpp/include/types.h (positional index → bit).
+cpp/include/types.h, and Unit.type_mask / Unit.tag_mask already use it,
+so unit encoding is a plain field copy.
 """
 from __future__ import annotations
 
-from .enums import CardIDs, Tags, UnitType
+from .enums import UNIT_TYPE_BITS, CardIDs, Tags, UnitType
 
 # =============================================================
 # UnitType → C++ TypeBitset (uint16_t)
-# Bit position = index in enum definition order.
+# Bit position = index in enum definition order, ALL = every tribe bit.
 # Must match cpp/include/types.h UnitTypes namespace.
 # =============================================================
-TYPE_TO_BIT: dict[UnitType, int] = {
-    ut: 1 << i for i, ut in enumerate(UnitType)
-}
+TYPE_TO_BIT: dict[UnitType, int] = dict(UNIT_TYPE_BITS)
 
 # =============================================================
 # Tags → C++ TagBitset (uint32_t)
-# Bit position = index in enum definition order.
+# Tags is an IntFlag whose values already are the C++ bits.
 # Must match cpp/include/types.h Tags namespace.
 # =============================================================
-TAG_TO_BIT: dict[Tags, int] = {
-    tag: 1 << i for i, tag in enumerate(Tags)
-}
+TAG_TO_BIT: dict[Tags, int] = {tag: int(tag) for tag in Tags}
 
 # =============================================================
 # CardIDs (Python str) → C++ int16_t
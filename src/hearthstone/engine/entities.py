@@ -1,10 +1,113 @@
 from __future__ import annotations
 
+from collections.abc import MutableSet, Sequence
 from dataclasses import dataclass, field, replace
-from typing import Dict, List, Optional, Set, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    SupportsIndex,
+    Tuple,
+    Union,
+    cast,
+)
 
 from .configs import CARD_DB, MECHANIC_DEFAULTS, SPELL_DB
-from .enums import CardIDs, MechanicType, SpellIDs, Tags, UnitType
+from .enums import (
+    UNIT_TYPE_BITS,
+    MechanicType,
+    SpellIDs,
+    Tags,
+    UnitType,
+    tags_from_mask,
+    tags_to_mask,
+    types_from_mask,
+    types_to_mask,
+)
+
+if TYPE_CHECKING:
+    from .auras import Board
+
+_TAUNT = int(Tags.TAUNT)
+_DIVINE_SHIELD = int(Tags.DIVINE_SHIELD)
+_WINDFURY = int(Tags.WINDFURY)
+_POISONOUS = int(Tags.POISONOUS)
+_REBORN = int(Tags.REBORN)
+_VENOMOUS = int(Tags.VENOMOUS)
+_CLEAVE = int(Tags.CLEAVE)
+_STEALTH = int(Tags.STEALTH)
+_IMMEDIATE_ATTACK = int(Tags.IMMEDIATE_ATTACK)
+_MAGNETIC = int(Tags.MAGNETIC)
+
+
+class TagView(MutableSet):
+    """Live set-like view over Unit.tag_mask (compat for code written against Set[Tags])."""
+
+    __slots__ = ("_unit",)
+
+    def __init__(self, unit: Unit) -> None:
+        self._unit = unit
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[Any]) -> set:
+        return set(it)
+
+    def __contains__(self, tag: object) -> bool:
+        return isinstance(tag, Tags) and bool(self._unit.tag_mask & int(tag))
+
+    def __iter__(self) -> Iterator[Tags]:
+        return iter(tags_from_mask(self._unit.tag_mask))
+
+    def __len__(self) -> int:
+        return bin(self._unit.tag_mask).count("1")
+
+    def add(self, tag: Tags) -> None:
+        self._unit.tag_mask |= int(tag)
+
+    def discard(self, tag: Tags) -> None:
+        self._unit.tag_mask &= ~int(tag)
+
+    def clear(self) -> None:
+        self._unit.tag_mask = 0
+
+    def __repr__(self) -> str:
+        return f"TagView({tags_from_mask(self._unit.tag_mask)!r})"
+
+
+class TypeView(Sequence):
+    """Read-only list-like view over Unit.type_mask (compat for code written against List)."""
+
+    __slots__ = ("_unit",)
+
+    def __init__(self, unit: Unit) -> None:
+        self._unit = unit
+
+    def __contains__(self, unit_type: object) -> bool:
+        bit: int = UNIT_TYPE_BITS.get(unit_type, 0)  # type: ignore[call-overload]
+        return bit != 0 and (self._unit.type_mask & bit) == bit
+
+    def __iter__(self) -> Iterator[UnitType]:
+        return iter(types_from_mask(self._unit.type_mask))
+
+    def __len__(self) -> int:
+        return len(types_from_mask(self._unit.type_mask))
+
+    def __getitem__(self, index):  # type: ignore[no-untyped-def]
+        return types_from_mask(self._unit.type_mask)[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TypeView):
+            return self._unit.type_mask == other._unit.type_mask
+        if isinstance(other, (list, tuple)):
+            return self._unit.type_mask == types_to_mask(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TypeView({types_from_mask(self._unit.type_mask)!r})"
 
 
 @dataclass
@@ -35,52 +138,78 @@ class Unit:
     attached_perm: Dict[str, int] = field(default_factory=dict)
     attached_turn: Dict[str, int] = field(default_factory=dict)
     attached_combat: Dict[str, int] = field(default_factory=dict)
-    types: List[UnitType] = field(default_factory=list)
+    type_mask: int = 0  # UnitType bits, layout of cpp/include/types.h
     is_golden: bool = False
     is_frozen: bool = False
-    tags: Set[Tags] = field(default_factory=set)
+    tag_mask: int = 0  # Tags bits, layout of cpp/include/types.h
 
     absorbed_pool_copies: Dict[str, int] = field(default_factory=dict)
 
+    @property
+    def tags(self) -> TagView:
+        return TagView(self)
+
+    @tags.setter
+    def tags(self, value: Union[int, Iterable[Tags]]) -> None:
+        self.tag_mask = value if isinstance(value, int) else tags_to_mask(value)
+
+    @property
+    def types(self) -> TypeView:
+        return TypeView(self)
+
+    @types.setter
+    def types(self, value: Union[int, Iterable[UnitType]]) -> None:
+        self.type_mask = value if isinstance(value, int) else types_to_mask(value)
+
+    def has_type(self, unit_type: UnitType) -> bool:
+        bit = UNIT_TYPE_BITS[unit_type]
+        return (self.type_mask & bit) == bit
+
+    def add_tag(self, tag: Tags) -> None:
+        self.tag_mask |= int(tag)
+
+    def remove_tag(self, tag: Tags) -> None:
+        self.tag_mask &= ~int(tag)
+
     @property
     def has_taunt(self) -> bool:
-        return Tags.TAUNT in self.tags
+        return self.tag_mask & _TAUNT != 0
 
     @property
     def has_divine_shield(self) -> bool:
-        return Tags.DIVINE_SHIELD in self.tags
+        return self.tag_mask & _DIVINE_SHIELD != 0
 
     @property
     def has_windfury(self) -> bool:
-        return Tags.WINDFURY in self.tags
+        return self.tag_mask & _WINDFURY != 0
 
     @property
     def has_poisonous(self) -> bool:
-        return Tags.POISONOUS in self.tags
+        return self.tag_mask & _POISONOUS != 0
 
     @property
     def has_reborn(self) -> bool:
-        return Tags.REBORN in self.tags
+        return self.tag_mask & _REBORN != 0
 
     @property
     def has_venomous(self) -> bool:
-        return Tags.VENOMOUS in self.tags
+        return self.tag_mask & _VENOMOUS != 0
 
     @property
     def has_cleave(self) -> bool:
-        return Tags.CLEAVE in self.tags
+        return self.tag_mask & _CLEAVE != 0
 
     @property
     def has_stealth(self) -> bool:
-        return Tags.STEALTH in self.tags
+        return self.tag_mask & _STEALTH != 0
 
     @property
     def has_immediate_attack(self) -> bool:
-        return Tags.IMMEDIATE_ATTACK in self.tags
+        return self.tag_mask & _IMMEDIATE_ATTACK != 0
 
     @property
     def has_magnetic(self) -> bool:
-        return Tags.MAGNETIC in self.tags
+        return self.tag_mask & _MAGNETIC != 0
 
     def _merge_counter_dict(self, dst: Dict[str, int], src: Dict[str, int]) -> None:
         for k, v in src.items():
@@ -105,9 +234,7 @@ class Unit:
         self.turn_hp_add += other.turn_hp_add
 
         # 3. Recalc tags
-        for t in other.tags:
-            if t != Tags.MAGNETIC:
-                self.tags.add(t)
+        self.tag_mask |= other.tag_mask & ~_MAGNETIC
 
         # 4. Recalc effects
         self._merge_counter_dict(self.attached_perm, other.attached_perm)
@@ -157,15 +284,11 @@ class Unit:
 
     def combat_copy(self) -> Unit:
         # Init avenge_counter from card definition (if card has Avenge)
-        avenge_init = 0
-        card_data = CARD_DB.get(self.card_id) or CARD_DB.get(CardIDs(self.card_id), {})
-        if isinstance(card_data, dict):
-            avenge_init = card_data.get("avenge_threshold", 0)
+        proto = UNIT_PROTOTYPES.get(self.card_id)
+        avenge_init = proto.avenge_threshold if proto is not None else 0
 
         unit = replace(
             self,
-            types=list(self.types),
-            tags=set(self.tags),
             attached_perm=dict(self.attached_perm),
             attached_turn=dict(self.attached_turn),
             attached_combat=dict(),
@@ -180,6 +303,19 @@ class Unit:
         unit.restore_stats()
         return unit
 
+    def clone(self) -> Unit:
+        """Field-for-field copy with private effect dicts, without recalc.
+
+        Cheap per-simulation copy of a unit that is already a combat_copy()."""
+        unit = object.__new__(Unit)
+        state = self.__dict__.copy()
+        state["attached_perm"] = self.attached_perm.copy()
+        state["attached_turn"] = self.attached_turn.copy()
+        state["attached_combat"] = self.attached_combat.copy()
+        state["absorbed_pool_copies"] = self.absorbed_pool_copies.copy()
+        unit.__dict__ = state
+        return unit
+
     def reset_turn_layer(self) -> None:
         self.turn_hp_add = 0
         self.turn_atk_add = 0
@@ -195,38 +331,79 @@ class Unit:
 
     @staticmethod
     def create_from_db(card_id: str, uid: int, owner_id: int, is_golden: bool = False) -> Unit:
-        """Fabric method: make unit by ID from database"""
-        try:
-            data = CARD_DB.get(CardIDs(card_id))
-        except ValueError:
-            data = None
-
-        if not data:
+        """Fabric method: make unit by ID from database (clone of the card's prototype)"""
+        proto = UNIT_PROTOTYPES.get(card_id)
+        if proto is None:
             raise ValueError(f"Card {card_id} not found in DB")
 
-        mult = 2 if is_golden else 1
+        unit = object.__new__(Unit)
+        state = (proto.golden_state if is_golden else proto.state).copy()
+        state["uid"] = uid
+        state["card_id"] = card_id
+        state["owner_id"] = owner_id
+        state["attached_perm"] = {}
+        state["attached_turn"] = {}
+        state["attached_combat"] = {}
+        state["absorbed_pool_copies"] = {}
+        unit.__dict__ = state
+        return unit
 
-        base_hp = data["hp"] * mult
-        base_atk = data["atk"] * mult
 
+@dataclass(frozen=True, slots=True)
+class UnitPrototype:
+    """CARD_DB entry precompiled at import: Unit.create_from_db only copies ``state``."""
+
+    card_id: str
+    tier: int
+    hp: int
+    atk: int
+    type_mask: int
+    tag_mask: int
+    avenge_threshold: int
+    # __dict__ шаблоны свежего юнита (обычного и золотого); не изменять
+    state: Dict[str, object] = field(repr=False, compare=False)
+    golden_state: Dict[str, object] = field(repr=False, compare=False)
+
+
+def _build_prototype(card_id: str, data: Dict[str, Any]) -> UnitPrototype:
+    states = []
+    for is_golden in (False, True):
+        mult = 2 if is_golden else 1
         unit = Unit(
-            uid=uid,
+            uid=0,
             card_id=card_id,
-            owner_id=owner_id,
-            base_hp=base_hp,
-            base_atk=base_atk,
+            owner_id=0,
+            base_hp=data["hp"] * mult,
+            base_atk=data["atk"] * mult,
             max_hp=data["hp"],
             max_atk=data["atk"],
             cur_hp=data["hp"],
             cur_atk=data["atk"],
             tier=data["tier"],
-            types=list(data.get("type", [])),
-            tags=set(data.get("tags", [])),
+            type_mask=data["type_mask"],
+            tag_mask=data["tag_mask"],
             is_golden=is_golden,
         )
         unit.recalc_stats()
         unit.restore_stats()
-        return unit
+        states.append(dict(unit.__dict__))
+    return UnitPrototype(
+        card_id=card_id,
+        tier=data["tier"],
+        hp=data["hp"],
+        atk=data["atk"],
+        type_mask=data["type_mask"],
+        tag_mask=data["tag_mask"],
+        avenge_threshold=data.get("avenge_threshold", 0),
+        state=states[0],
+        golden_state=states[1],
+    )
+
+
+# card_id -> prototype; ключи — CardIDs, поиск по строке "101" тоже работает (str-enum)
+UNIT_PROTOTYPES: Dict[str, UnitPrototype] = {
+    card_id: _build_prototype(card_id, data) for card_id, data in CARD_DB.items()
+}
 
 
 @dataclass
@@ -259,6 +436,13 @@ class Spell:
             is_temporary=data.get("is_temporary", False),
         )
 
+    def clone(self) -> Spell:
+        spell = object.__new__(Spell)
+        state = self.__dict__.copy()
+        state["params"] = self.params.copy()
+        spell.__dict__ = state
+        return spell
+
 
 @dataclass
 class StoreItem:
@@ -274,6 +458,13 @@ class StoreItem:
             return self.spell.card_id
         return ""
 
+    def clone(self) -> StoreItem:
+        return StoreItem(
+            unit=self.unit.clone() if self.unit else None,
+            spell=self.spell.clone() if self.spell else None,
+            is_frozen=self.is_frozen,
+        )
+
 
 @dataclass
 class HandCard:
@@ -289,6 +480,137 @@ class HandCard:
             return self.spell.card_id
         return "NO ID"
 
+    def clone(self) -> HandCard:
+        return HandCard(
+            uid=self.uid,
+            unit=self.unit.clone() if self.unit else None,
+            spell=self.spell.clone() if self.spell else None,
+        )
+
+
+class Hand(List[HandCard]):
+    """List of HandCards with ``card_counts``: unit card_id -> copies in hand.
+
+    Тот же приём, что auras.Board: счётчик обновляется каждой мутацией списка,
+    so triplet checks and bots read copies in O(1) instead of rescanning.
+    """
+
+    __slots__ = ("card_counts",)
+
+    def __init__(self, cards: Iterable[HandCard] = ()) -> None:
+        super().__init__(cards)
+        self.card_counts: Dict[str, int] = {}
+        self._recount()
+
+    def _recount(self) -> None:
+        counts: Dict[str, int] = {}
+        for card in self:
+            if card.unit is not None:
+                counts[card.unit.card_id] = counts.get(card.unit.card_id, 0) + 1
+        self.card_counts = counts
+
+    def __reduce__(self):  # type: ignore[no-untyped-def]
+        return (Hand, (list(self),))
+
+    def _added(self, card: HandCard) -> None:
+        if card.unit is not None:
+            counts = self.card_counts
+            counts[card.unit.card_id] = counts.get(card.unit.card_id, 0) + 1
+
+    def _removed(self, card: HandCard) -> None:
+        if card.unit is not None:
+            counts = self.card_counts
+            left = counts[card.unit.card_id] - 1
+            if left:
+                counts[card.unit.card_id] = left
+            else:
+                del counts[card.unit.card_id]
+
+    def append(self, card: HandCard) -> None:
+        super().append(card)
+        self._added(card)
+
+    def insert(self, index: SupportsIndex, card: HandCard) -> None:
+        super().insert(index, card)
+        self._added(card)
+
+    def pop(self, index: SupportsIndex = -1) -> HandCard:
+        card = super().pop(index)
+        self._removed(card)
+        return card
+
+    def remove(self, card: HandCard) -> None:
+        super().remove(card)
+        self._removed(card)
+
+    def clear(self) -> None:
+        super().clear()
+        self.card_counts = {}
+
+    def extend(self, cards: Iterable[HandCard]) -> None:
+        super().extend(cards)
+        self._recount()
+
+    def __iadd__(self, cards: Iterable[HandCard]) -> Hand:  # type: ignore[override, misc]
+        self.extend(cards)
+        return self
+
+    def __setitem__(self, index, value) -> None:  # type: ignore[no-untyped-def]
+        super().__setitem__(index, value)
+        self._recount()
+
+    def __delitem__(self, index) -> None:  # type: ignore[no-untyped-def]
+        super().__delitem__(index)
+        self._recount()
+
+
+class CardCounts:
+    """Read-only card_id -> copies view over a player's hand + board.
+
+    Uses the Hand / Board counters; a zone replaced by a plain list (tests,
+    scripts) is scanned instead.  ``get`` matches the dicts the bots used to
+    rebuild per scoring call."""
+
+    __slots__ = ("_player",)
+
+    def __init__(self, player: Player) -> None:
+        self._player = player
+
+    def zones(self, card_id: str) -> Tuple[int, int]:
+        """(hand_count, board_count) of card_id, golden copies included."""
+        hand = self._player.hand
+        board = self._player.board
+        if isinstance(hand, Hand):
+            n_hand = hand.card_counts.get(card_id, 0)
+        else:
+            n_hand = sum(1 for c in hand if c.unit is not None and c.unit.card_id == card_id)
+        counts = getattr(board, "card_counts", None)
+        if counts is not None:
+            n_board = counts.get(card_id, 0)
+        else:
+            n_board = sum(1 for u in board if u.card_id == card_id)
+        return n_hand, n_board
+
+    def get(self, card_id: str, default: int = 0) -> int:
+        player = self._player
+        try:
+            # Hand / Board unless a test or script swapped in a plain list
+            hand = cast(Hand, player.hand)
+            board = cast("Board", player.board)
+            n = hand.card_counts.get(card_id, 0) + board.card_counts.get(card_id, 0)
+        except AttributeError:
+            n = sum(self.zones(card_id))
+        return n or default
+
+    def __getitem__(self, card_id: str) -> int:
+        n = self.get(card_id)
+        if not n:
+            raise KeyError(card_id)
+        return n
+
+    def __contains__(self, card_id: object) -> bool:
+        return bool(self.get(card_id))  # type: ignore[arg-type]
+
 
 @dataclass
 class EconomyState:
@@ -309,6 +631,16 @@ class EconomyState:
         if self.up_cost > 0 and turn_number != 1:
             self.up_cost -= 1
 
+    def clone(self) -> EconomyState:
+        return EconomyState(
+            gold=self.gold,
+            gold_next_turn=self.gold_next_turn,
+            tavern_tier=self.tavern_tier,
+            spell_discount=self.spell_discount,
+            up_cost=self.up_cost,
+            store=[item.clone() for item in self.store],
+        )
+
 
 @dataclass
 class MechanicState:
@@ -333,6 +665,11 @@ class MechanicState:
     def increment_scaling(self, key: str, amount: int = 1) -> None:
         self.scaling_counters[key] = self.scaling_counters.get(key, 0) + amount
 
+    def clone(self) -> MechanicState:
+        return MechanicState(
+            modifiers=self.modifiers.copy(), scaling_counters=self.scaling_counters.copy()
+        )
+
 
 @dataclass
 class DiscoveryState:
@@ -344,6 +681,15 @@ class DiscoveryState:
     source: str = "Unknown"  # "Triplet", "HeroPower", "Primalfin"
     is_exact_tier: bool = False  # True for triple, False for others
 
+    def clone(self) -> DiscoveryState:
+        return DiscoveryState(
+            is_active=self.is_active,
+            options=[item.clone() for item in self.options],
+            discover_tier=self.discover_tier,
+            source=self.source,
+            is_exact_tier=self.is_exact_tier,
+        )
+
 
 @dataclass
 class DiscoveryRequest:
@@ -367,6 +713,20 @@ class Player:
     pending_discovery_request: Optional[DiscoveryRequest] = None
     free_refreshes: int = 0
     lost_last_combat: bool = False
+    # Legal-action bits (engine/actions.py), maintained by TavernManager.
+    # legal_stamp = размеры зон на момент расчёта; () — маска ещё не считалась
+    legal_actions: int = field(default=0, compare=False, repr=False)
+    legal_stamp: Tuple[int, int, int, int, bool] | Tuple[()] = field(
+        default=(), compare=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        from .auras import Board
+
+        if not isinstance(self.board, Board):
+            self.board = Board(self.board)
+        if not isinstance(self.hand, Hand):
+            self.hand = Hand(self.hand)
 
     def combat_copy(self) -> Player:
         return Player(
@@ -378,6 +738,51 @@ class Player:
             health=self.health,
         )
 
+    def sim_copy(self) -> Player:
+        """Copy of a combat snapshot for one more simulation: board units are
+        cloned as-is (already combat copies), hand cards and mechanics get
+        private copies (combat effects buff the hand and bump Blood Gem stats);
+        economy is shared with the snapshot."""
+        from .auras import Board
+
+        return Player(
+            uid=self.uid,
+            board=Board([u.clone() for u in self.board]),
+            hand=[hc.clone() for hc in self.hand],
+            economy=self.economy,
+            mechanics=self.mechanics.clone(),
+            health=self.health,
+        )
+
+    def clone(self) -> Player:
+        """Independent deep copy of the whole player state, for Game.snapshot()/restore().
+
+        Card data is shared: only ids, ints and tuples are referenced from both copies."""
+        from .auras import Board
+
+        board = self.board
+        return Player(
+            uid=self.uid,
+            board=board.clone() if isinstance(board, Board) else [u.clone() for u in board],
+            hand=[card.clone() for card in self.hand],
+            economy=self.economy.clone(),
+            mechanics=self.mechanics.clone(),
+            health=self.health,
+            discovery=self.discovery.clone(),
+            pending_discovery_request=(
+                replace(self.pending_discovery_request)
+                if self.pending_discovery_request is not None
+                else None
+            ),
+            free_refreshes=self.free_refreshes,
+            lost_last_combat=self.lost_last_combat,
+        )
+
+    @property
+    def card_counts(self) -> CardCounts:
+        """card_id -> copies in hand + board; ``.zones(cid)`` gives (hand, board)."""
+        return CardCounts(self)
+
     @property
     def is_discovering(self) -> bool:
         return self.discovery.is_active
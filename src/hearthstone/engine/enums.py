@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from enum import Enum, auto
+from enum import Enum, IntFlag
+from typing import Dict, Iterable, List, Set
 
 
 class UnitType(Enum):
@@ -18,17 +19,59 @@ class UnitType(Enum):
     ALL = "All"
 
 
-class Tags(Enum):
-    IMMEDIATE_ATTACK = auto()
-    TAUNT = auto()
-    DIVINE_SHIELD = auto()
-    WINDFURY = auto()
-    POISONOUS = auto()
-    REBORN = auto()
-    VENOMOUS = auto()
-    CLEAVE = auto()
-    STEALTH = auto()
-    MAGNETIC = auto()
+class Tags(IntFlag):
+    """Unit keywords. Bit layout must match cpp/include/types.h Tags namespace."""
+
+    IMMEDIATE_ATTACK = 1 << 0
+    TAUNT = 1 << 1
+    DIVINE_SHIELD = 1 << 2
+    WINDFURY = 1 << 3
+    POISONOUS = 1 << 4
+    REBORN = 1 << 5
+    VENOMOUS = 1 << 6
+    CLEAVE = 1 << 7
+    STEALTH = 1 << 8
+    MAGNETIC = 1 << 9
+
+
+# =====================================================================
+# Bitmask helpers
+# Units store tags/types as plain ints (Unit.tag_mask / Unit.type_mask).
+# IntFlag operators run in Python, so hot paths mask against the plain-int
+# values below instead of the enum members.
+# =====================================================================
+
+# UnitType -> bit. Must match cpp/include/types.h UnitTypes namespace:
+# one bit per tribe in enum order, ALL is the union of every tribe bit.
+UNIT_TYPE_BITS: Dict[UnitType, int] = {
+    ut: 1 << i for i, ut in enumerate(UnitType) if ut is not UnitType.ALL
+}
+UNIT_TYPE_BITS[UnitType.ALL] = (1 << (len(UnitType) - 1)) - 1
+
+_SINGLE_TYPE_BITS = [(ut, bit) for ut, bit in UNIT_TYPE_BITS.items() if ut is not UnitType.ALL]
+_TAG_BITS = [(tag, int(tag)) for tag in Tags]
+
+
+def types_to_mask(types: Iterable[UnitType]) -> int:
+    mask = 0
+    for t in types:
+        mask |= UNIT_TYPE_BITS[t]
+    return mask
+
+
+def types_from_mask(mask: int) -> List[UnitType]:
+    return [ut for ut, bit in _SINGLE_TYPE_BITS if mask & bit]
+
+
+def tags_to_mask(tags: Iterable[Tags]) -> int:
+    mask = 0
+    for t in tags:
+        mask |= int(t)
+    return mask
+
+
+def tags_from_mask(mask: int) -> Set[Tags]:
+    return {tag for tag, bit in _TAG_BITS if mask & bit}
 
 
 class BattleOutcome(Enum):
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+import random
 from collections import deque
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
 
 if TYPE_CHECKING:
     from .entities import Player
 
-from .auras import recalculate_board_auras
+from .auras import AURA_REGISTRY, recalculate_board_auras, refresh_aura_sources
 from .entities import HandCard, Spell, Unit
-from .enums import Tags, UnitType
+from .enums import Tags, UnitType, tags_from_mask, types_from_mask
+from .rng import default_rng
 
 
 class Zone(Enum):
@@ -19,6 +21,10 @@ class Zone(Enum):
     SHOP = auto()
     HERO = auto()
 
+    # Члены enum — синглтоны, identity-hash совместим с eq и считается в C,
+    # в отличие от Enum.__hash__ (hash(self._name_) в Python)
+    __hash__ = object.__hash__
+
 
 class EventType(Enum):
     MINION_PLAYED = auto()
@@ -41,20 +47,34 @@ class EventType(Enum):
     TAVERN_REFRESHED = auto()
     HERO_DAMAGED = auto()
 
+    __hash__ = object.__hash__
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class EntityRef:
     uid: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PosRef:
     side: int
     zone: Zone
     slot: int
 
 
-@dataclass(frozen=True)
+_POS_REF_CACHE: Dict[Tuple[int, Zone, int], PosRef] = {}
+
+
+def pos_ref(side: int, zone: Zone, slot: int) -> PosRef:
+    """Interned PosRef: one shared immutable instance per (side, zone, slot)."""
+    key = (side, zone, slot)
+    pos = _POS_REF_CACHE.get(key)
+    if pos is None:
+        pos = _POS_REF_CACHE[key] = PosRef(side, zone, slot)
+    return pos
+
+
+@dataclass(frozen=True, slots=True)
 class MinionSnapshot:
     uid: int
     card_id: str
@@ -62,11 +82,19 @@ class MinionSnapshot:
     pos: Optional[PosRef]
     atk: int
     hp: int
-    types: List[UnitType]
-    tags: Set[Tags]
+    type_mask: int
+    tag_mask: int
 
+    @property
+    def types(self) -> List[UnitType]:
+        return types_from_mask(self.type_mask)
 
-@dataclass(frozen=True)
+    @property
+    def tags(self) -> Set[Tags]:
+        return tags_from_mask(self.tag_mask)
+
+
+@dataclass(frozen=True, slots=True)
 class Event:
     event_type: EventType
     source: Optional[EntityRef] = None
@@ -91,7 +119,7 @@ class TriggerDef:
     priority: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TriggerInstance:
     trigger_def: TriggerDef
     trigger_uid: int
@@ -105,11 +133,14 @@ class EffectContext:
         uid_provider: Callable[[], int],
         event_queue: Deque[Event],
         card_pool: Optional[object] = None,
+        rng: Optional[random.Random] = None,
     ):
         self.players_by_uid = players_by_uid
         self._uid_provider = uid_provider
         self._event_queue = event_queue
         self.card_pool = card_pool  # CardPool, None during combat
+        # Генератор игры-владельца (Game.rng); модульный random, если не передан
+        self.rng: random.Random = rng if rng is not None else default_rng()
         self._uid_to_pos: Dict[int, PosRef] = {}
         for player_id, _ in players_by_uid.items():
             self._reindex_side(player_id)
@@ -196,16 +227,16 @@ class EffectContext:
         self._clear_side_index(side)
         # 1. BOARD
         for idx, unit in enumerate(player.board):
-            self._uid_to_pos[unit.uid] = PosRef(side=side, zone=Zone.BOARD, slot=idx)
+            self._uid_to_pos[unit.uid] = pos_ref(side, Zone.BOARD, idx)
 
         # 2. HAND
         for idx, card in enumerate(player.hand):
-            self._uid_to_pos[card.uid] = PosRef(side=side, zone=Zone.HAND, slot=idx)
+            self._uid_to_pos[card.uid] = pos_ref(side, Zone.HAND, idx)
 
         # 3. SHOP
         for idx, item in enumerate(player.store):
             if item.unit:
-                self._uid_to_pos[item.unit.uid] = PosRef(side=side, zone=Zone.SHOP, slot=idx)
+                self._uid_to_pos[item.unit.uid] = pos_ref(side, Zone.SHOP, idx)
 
     def _reindex_all(self) -> None:
         for player_id, _ in self.players_by_uid.items():
@@ -231,7 +262,7 @@ class EffectContext:
             player.health -= amount
             self.emit_event(Event(
                 event_type=EventType.HERO_DAMAGED,
-                source_pos=PosRef(side=side, zone=Zone.HERO, slot=0),
+                source_pos=pos_ref(side, Zone.HERO, 0),
                 value=amount,
             ))
 
@@ -276,36 +307,48 @@ class EffectContext:
 
         return results
 
+    def _refresh_aura_sources(self, ref: EntityRef) -> None:
+        """Attached aura effect: the unit's board must recount its aura sources."""
+        pos = self._uid_to_pos.get(ref.uid)
+        if pos and pos.zone == Zone.BOARD:
+            player = self.players_by_uid.get(pos.side)
+            if player:
+                refresh_aura_sources(player.board)
+
     def attach_effect_perm(self, target_ref: EntityRef, effect_id: str, count: int = 1) -> None:
         unit = self.resolve_unit(target_ref)
         if not unit:
             return
         unit.attached_perm[effect_id] = unit.attached_perm.get(effect_id, 0) + count
+        if effect_id in AURA_REGISTRY:
+            self._refresh_aura_sources(target_ref)
 
     def attach_effect_turn(self, target_ref: EntityRef, effect_id: str, count: int = 1) -> None:
         unit = self.resolve_unit(target_ref)
         if not unit:
             return
         unit.attached_turn[effect_id] = unit.attached_turn.get(effect_id, 0) + count
+        if effect_id in AURA_REGISTRY:
+            self._refresh_aura_sources(target_ref)
 
     def attach_effect_combat(self, target_ref: EntityRef, effect_id: str, count: int = 1) -> None:
         unit = self.resolve_unit(target_ref)
         if not unit:
             return
         unit.attached_combat[effect_id] = unit.attached_combat.get(effect_id, 0) + count
+        if effect_id in AURA_REGISTRY:
+            self._refresh_aura_sources(target_ref)
 
     def consume_random_store_unit(self, side: int) -> tuple[int, int] | None:
         """Remove a random unit from the store and return it to the pool.
         Returns (atk, hp) or None."""
-        import random
-
         player = self.players_by_uid.get(side)
         if not player:
             return None
         store_units = [(i, item) for i, item in enumerate(player.store) if item.unit]
         if not store_units:
             return None
-        idx, item = random.choice(store_units)
+        idx, item = self.rng.choice(store_units)
         consumed = item.unit
         if not consumed:
             return None
@@ -414,21 +457,69 @@ class EventManager:
         uid_provider: Callable[[], int],
         extra_triggers: Optional[List[TriggerInstance]] = None,
         card_pool: Optional[object] = None,
+        rng: Optional[random.Random] = None,
     ) -> None:
         queue: Deque[Event] = deque([event])
-        ctx = EffectContext(players_by_uid, uid_provider, queue, card_pool)
-        initial_event = event
+        ctx = EffectContext(players_by_uid, uid_provider, queue, card_pool, rng)
+        self._drain(queue, ctx, event, extra_triggers)
+
+    def process_events(
+        self,
+        events: Sequence[Event],
+        players_by_uid: Dict[int, Player],
+        uid_provider: Callable[[], int],
+        card_pool: Optional[object] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Batch of independent events (e.g. a whole shop refill) on one EffectContext.
+
+        Same result as consecutive process_event() calls, as long as the state the
+        events refer to is already in place: each event is resolved together with its
+        cascade before the next one, but the context is built once for the batch and
+        listeners are collected once per event type while nothing can change them."""
+        if not events:
+            return
+        queue: Deque[Event] = deque()
+        ctx = EffectContext(players_by_uid, uid_provider, queue, card_pool, rng)
+        cached_type: Optional[EventType] = None
+        cached: List[TriggerInstance] = []
+        for event in events:
+            if event.event_type is cached_type:
+                triggers = list(cached)
+            else:
+                triggers = self.collect_triggers(event, ctx)
+                # Только системные триггеры (trigger_uid 0) не добавляют и не убирают
+                # слушателей — для следующих событий того же типа набор тот же
+                only_system = all(t.trigger_uid == 0 for t in triggers)
+                cached_type = event.event_type if only_system else None
+                cached = triggers
+            self._run_triggers(triggers, event, ctx)
+            if queue:
+                # Каскад мог изменить доски — дальше собираем заново
+                cached_type = None
+                self._drain(queue, ctx, event, None)
+
+    def _drain(
+        self,
+        queue: Deque[Event],
+        ctx: EffectContext,
+        initial_event: Event,
+        extra_triggers: Optional[List[TriggerInstance]],
+    ) -> None:
         while queue:
             current_event = queue.popleft()
             triggers = self.collect_triggers(current_event, ctx)
-            if extra_triggers and current_event == initial_event:
+            if extra_triggers and current_event is initial_event:
                 triggers.extend(extra_triggers)
-            for trigger in self.order_triggers(triggers, current_event, ctx):
-                if trigger.trigger_def.condition(ctx, current_event, trigger.trigger_uid):
-                    for _ in range(trigger.stacks):
-                        self.executor.run(
-                            trigger.trigger_def.effect, ctx, current_event, trigger.trigger_uid
-                        )
+            self._run_triggers(triggers, current_event, ctx)
+
+    def _run_triggers(
+        self, triggers: List[TriggerInstance], event: Event, ctx: EffectContext
+    ) -> None:
+        for trigger in self.order_triggers(triggers, event, ctx):
+            if trigger.trigger_def.condition(ctx, event, trigger.trigger_uid):
+                for _ in range(trigger.stacks):
+                    self.executor.run(trigger.trigger_def.effect, ctx, event, trigger.trigger_uid)
 
     def collect_triggers(self, event: Event, ctx: EffectContext) -> List[TriggerInstance]:
 
@@ -598,7 +689,7 @@ def _apply_elemental_buff(ctx: EffectContext, event: Event, _trigger_uid: int) -
     unit = ctx.resolve_unit(event.source)
     if not unit:
         return
-    if UnitType.ELEMENTAL not in unit.types:
+    if not unit.has_type(UnitType.ELEMENTAL):
         return
     pos = ctx.resolve_pos(event.source)
     if not pos:
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import random
+from dataclasses import dataclass
 from typing import Any, List, Optional, Tuple
 
+from .actions import decode_action
 from .card_def import GOLDEN_TRIGGER_REGISTRY, TRIGGER_REGISTRY
+from .codec import decode_game, encode_game
 from .combat import CombatManager
 from .cpp_bridge import get_cpp_engine
 from .entities import Player
@@ -12,15 +16,50 @@ from .pool import CardPool, SpellPool
 from .tavern import TavernManager
 
 
-class Game:
-    def __init__(self, max_tier: int = 6) -> None:
-        self.max_tier = max_tier
-        self.pool = CardPool(max_tier=max_tier)
-        self.spell_pool = SpellPool()
-        self.event_manager = EventManager(TRIGGER_REGISTRY, GOLDEN_TRIGGER_REGISTRY)
-        self.tavern = TavernManager(self.pool, self.spell_pool, event_manager=self.event_manager)
-        self.combat = CombatManager(event_manager=self.event_manager)
+@dataclass(frozen=True, slots=True)
+class GameSnapshot:
+    """Captured Game state for Game.restore().
+
+    Players are private clones that are never handed out (restore clones them
+    again), pool counts and RNG state are tuples; card data, registries and
+    managers are not part of the snapshot and stay shared."""
+
+    players: Tuple[Player, ...]
+    pool: Tuple[Tuple[Tuple[int, ...], Tuple[int, ...], int], ...]
+    rng_state: Tuple[Any, ...]
+    tavern_uid: int
+    combat_uid: int
+    turn_count: int
+    game_over: bool
+    winner_id: Optional[int]
+    players_ready: Tuple[Tuple[int, bool], ...]
+
 
+class Game:
+    def __init__(self, max_tier: int = 6, seed: Optional[int] = None) -> None:
+        # Собственный генератор игры: пул, таверна, бой и эффекты карт берут
+        # случайность только отсюда, поэтому игры в одном процессе независимы.
+        # seed=None — сид из глобального random (совместимо с random.seed()).
+        self._init_managers(
+            max_tier, random.Random(seed if seed is not None else random.getrandbits(64))
+        )
+        self._start_match()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Новая партия на тех же менеджерах: состояние как у Game(max_tier, seed),
+        но пул, SpellPool, EventManager, TavernManager и CombatManager не пересоздаются —
+        пул возвращается к закэшированной раскладке, RNG пересевается на месте."""
+        self._reset_managers(seed if seed is not None else random.getrandbits(64))
+        self._start_match()
+
+    def _reset_managers(self, seed: int) -> None:
+        # Менеджеры держат ссылку на self.rng — пересеваем тот же объект
+        self.rng.seed(seed)
+        self.pool.reset()
+        self.tavern._uid_counter = 1000
+        self.combat.uid = 10000
+
+    def _start_match(self) -> None:
         self.players: List[Player] = [
             Player(uid=0, board=[], hand=[], health=30),
             Player(uid=1, board=[], hand=[], health=30),
@@ -35,6 +74,52 @@ class Game:
         for p in self.players:
             self.tavern.start_turn(p, self.turn_count)
 
+    def _init_managers(self, max_tier: int, rng: random.Random) -> None:
+        self.max_tier = max_tier
+        self.rng = rng
+        self.pool = CardPool(max_tier=max_tier, rng=self.rng)
+        self.spell_pool = SpellPool(rng=self.rng)
+        self.event_manager = EventManager(TRIGGER_REGISTRY, GOLDEN_TRIGGER_REGISTRY)
+        self.tavern = TavernManager(
+            self.pool, self.spell_pool, event_manager=self.event_manager, rng=self.rng
+        )
+        self.combat = CombatManager(event_manager=self.event_manager, rng=self.rng)
+
+    def snapshot(self) -> GameSnapshot:
+        """Cheap branch point for lookahead/undo (вместо copy.deepcopy(game))."""
+        return GameSnapshot(
+            players=tuple(p.clone() for p in self.players),
+            pool=self.pool.snapshot(),
+            rng_state=self.rng.getstate(),
+            tavern_uid=self.tavern._uid_counter,
+            combat_uid=self.combat.uid,
+            turn_count=self.turn_count,
+            game_over=self.game_over,
+            winner_id=self.winner_id,
+            players_ready=tuple(self.players_ready.items()),
+        )
+
+    def restore(self, snap: GameSnapshot) -> None:
+        """Вернуть игру в состояние snap; один снимок можно восстанавливать много раз."""
+        self.players = [p.clone() for p in snap.players]
+        self.pool.restore(snap.pool)
+        self.rng.setstate(snap.rng_state)
+        self.tavern._uid_counter = snap.tavern_uid
+        self.combat.uid = snap.combat_uid
+        self.turn_count = snap.turn_count
+        self.game_over = snap.game_over
+        self.winner_id = snap.winner_id
+        self.players_ready = dict(snap.players_ready)
+
+    def to_bytes(self) -> bytes:
+        """Compact versioned binary state (format in codec.py); replaces pickle."""
+        return encode_game(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Game:
+        """Rebuild a Game from to_bytes() output; continues exactly like the original."""
+        return decode_game(data, cls.__new__(cls))
+
     def step(self, player_idx: int, action_type: str, **kwargs: Any) -> Tuple[bool, bool, str]:
         """
         Make agent move
@@ -43,43 +128,18 @@ class Game:
         if self.game_over:
             return True, True, "Game Over"
         player = self.players[player_idx]
-        info = "Unknown Action"
 
         if player.is_discovering and action_type != "DISCOVER_CHOICE":
             return False, False, "Must choose discovery"
 
         if self.players_ready.get(player_idx, False) and action_type != "END_TURN":
             return False, False, "Player already ready"
-        success = False
         if action_type == "END_TURN":
             self.tavern.end_turn(player)
             self.players_ready[player_idx] = True
-            info = "Ready"
-            success = True
-        elif action_type == "BUY":
-            success, info = self.tavern.buy_unit(player, kwargs.get("index", -1))
-        elif action_type == "SELL":
-            success, info = self.tavern.sell_unit(player, kwargs.get("index", -1))
-        elif action_type == "ROLL":
-            success, info = self.tavern.roll_tavern(player)
-        elif action_type == "UPGRADE":
-            success, info = self.tavern.upgrade_tavern(player)
-        elif action_type == "FREEZE":
-            success, info = self.tavern.toggle_freeze(player)
-        elif action_type == "PLAY":
-            # kwargs: hand_index, insert_index, target_index
-            h_idx = kwargs.get("hand_index", -1)
-            i_idx = kwargs.get("insert_index", len(player.board))  # По умолчанию в конец
-            t_idx = kwargs.get("target_index", -1)
-            success, info = self.tavern.play_unit(player, h_idx, i_idx, t_idx)
-        elif action_type == "SWAP":
-            # kwargs: index_a, index_b
-            a = kwargs.get("index_a", -1)
-            b = kwargs.get("index_b", -1)
-            success, info = self.tavern.swap_units(player, a, b)
-        elif action_type == "DISCOVER_CHOICE":
-            # kwargs: index
-            success, info = self.tavern.make_discovery_choice(player, kwargs.get("index", -1))
+            success, info = True, "Ready"
+        else:
+            success, info = self.tavern.apply_action(player, action_type, **kwargs)
 
         if all(self.players_ready.values()):
             self._resolve_combat_phase(player_idx)
@@ -88,6 +148,18 @@ class Game:
 
         return success, self.game_over, info
 
+    def step_int(self, player_idx: int, action_id: int) -> Tuple[bool, bool, str]:
+        """step() for an integer action id (engine/actions.py), decoded by table lookup."""
+        action_type, kwargs = decode_action(self.players[player_idx], action_id)
+        if action_type == "FREEZE_END_TURN":
+            self.step(player_idx, "FREEZE")
+            return self.step(player_idx, "END_TURN")
+        return self.step(player_idx, action_type, **kwargs)
+
+    def legal_actions(self, player_idx: int) -> int:
+        """Legal-action bits of the player: bit i set = action id i is legal."""
+        return self.tavern.legal_actions(self.players[player_idx])
+
     def _resolve_combat_phase(self, current_agent_idx: int) -> None:
         """
         Init combat, deal damage, update turns.
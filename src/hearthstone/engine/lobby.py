@@ -0,0 +1,191 @@
+"""
+lobby.py — N-player (по умолчанию 8) Battlegrounds lobby on one shared CardPool.
+
+Game is a 2-player duel; Lobby is the full mode agents ultimately train in:
+every player recruits through the same TavernManager / CardPool, and once
+all alive players have ended their turn the round is resolved:
+
+  1. alive players are paired at random, avoiding last round's opponent
+     when possible; with an odd count the spare player fights a ghost
+     (the board of the most recently eliminated player),
+  2. all pairings go to CombatManager.resolve_combats() together, i.e. a
+     single GIL-free ``fast_combat_pairs`` call when the C++ engine is loaded,
+  3. damage is applied (ghosts never take damage), players at 0 health are
+     eliminated, placed, and their cards return to the pool.
+"""
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from .actions import decode_action
+from .card_def import GOLDEN_TRIGGER_REGISTRY, TRIGGER_REGISTRY
+from .combat import CombatManager
+from .entities import Player
+from .enums import BattleOutcome
+from .event_system import EventManager
+from .pool import CardPool, SpellPool
+from .tavern import TavernManager
+
+# Opponent id of a ghost in Lobby.last_pairings / Lobby.last_opponent
+GHOST = -1
+
+
+class Lobby:
+    def __init__(
+        self,
+        num_players: int = 8,
+        max_tier: int = 6,
+        seed: Optional[int] = None,
+        starting_health: int = 30,
+    ) -> None:
+        if num_players < 2:
+            raise ValueError("Lobby needs at least 2 players")
+        self.num_players = num_players
+        self.max_tier = max_tier
+        # Как в Game: вся случайность лобби (пул, таверна, бой, пары) — из self.rng
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+        self.pool = CardPool(max_tier=max_tier, rng=self.rng)
+        self.spell_pool = SpellPool(rng=self.rng)
+        self.event_manager = EventManager(TRIGGER_REGISTRY, GOLDEN_TRIGGER_REGISTRY)
+        self.tavern = TavernManager(
+            self.pool, self.spell_pool, event_manager=self.event_manager, rng=self.rng
+        )
+        self.combat = CombatManager(event_manager=self.event_manager, rng=self.rng)
+
+        self.players: List[Player] = [
+            Player(uid=i, board=[], hand=[], health=starting_health) for i in range(num_players)
+        ]
+        self.alive: List[int] = list(range(num_players))
+        # uid -> final place (1 = winner), filled on elimination
+        self.placements: Dict[int, int] = {}
+        self.last_opponent: Dict[int, int] = {}
+        self.last_pairings: List[Tuple[int, int]] = []
+        # Клон последнего вылетевшего игрока — соперник для нечётного игрока
+        self._ghost: Optional[Player] = None
+
+        self.turn_count = 1
+        self.game_over = False
+        self.winner_id: Optional[int] = None
+        self.players_ready: Dict[int, bool] = {uid: False for uid in self.alive}
+
+        for p in self.players:
+            self.tavern.start_turn(p, self.turn_count)
+
+    def step(self, player_idx: int, action_type: str, **kwargs: Any) -> Tuple[bool, bool, str]:
+        """
+        Make agent move (same actions as Game.step)
+        Return: [Success, Done, Info]
+        """
+        if self.game_over:
+            return True, True, "Game Over"
+        if player_idx not in self.players_ready:
+            return False, False, "Player eliminated"
+        player = self.players[player_idx]
+
+        if player.is_discovering and action_type != "DISCOVER_CHOICE":
+            return False, False, "Must choose discovery"
+
+        if self.players_ready[player_idx] and action_type != "END_TURN":
+            return False, False, "Player already ready"
+        if action_type == "END_TURN":
+            self.tavern.end_turn(player)
+            self.players_ready[player_idx] = True
+            success, info = True, "Ready"
+        else:
+            success, info = self.tavern.apply_action(player, action_type, **kwargs)
+
+        if all(self.players_ready.values()):
+            self._resolve_round()
+            if not self.game_over:
+                self.players_ready = {uid: False for uid in self.alive}
+
+        return success, self.game_over, info
+
+    def step_int(self, player_idx: int, action_id: int) -> Tuple[bool, bool, str]:
+        """step() for an integer action id (engine/actions.py), decoded by table lookup."""
+        action_type, kwargs = decode_action(self.players[player_idx], action_id)
+        if action_type == "FREEZE_END_TURN":
+            self.step(player_idx, "FREEZE")
+            return self.step(player_idx, "END_TURN")
+        return self.step(player_idx, action_type, **kwargs)
+
+    def legal_actions(self, player_idx: int) -> int:
+        """Legal-action bits of the player: bit i set = action id i is legal."""
+        return self.tavern.legal_actions(self.players[player_idx])
+
+    def _pair_players(self) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+        """Random pairs of alive players; returns (pairs, spare player or None)."""
+        order = list(self.alive)
+        self.rng.shuffle(order)
+        pairs: List[Tuple[int, int]] = []
+        while len(order) >= 2:
+            a = order.pop(0)
+            last = self.last_opponent.get(a)
+            j = next((i for i, b in enumerate(order) if b != last), 0)
+            pairs.append((a, order.pop(j)))
+        return pairs, (order[0] if order else None)
+
+    def _ghost_for(self, uid: int) -> Player:
+        if self._ghost is not None:
+            return self._ghost.clone()
+        # Никто ещё не вылетел (нечётное число игроков): зеркало случайного соперника
+        other = self.rng.choice([u for u in self.alive if u != uid])
+        return self.players[other].clone()
+
+    def _resolve_round(self) -> None:
+        pairs, spare = self._pair_players()
+        matchups = [(self.players[a], self.players[b]) for a, b in pairs]
+        if spare is not None:
+            matchups.append((self.players[spare], self._ghost_for(spare)))
+
+        results = self.combat.resolve_combats(matchups)
+
+        for i, ((p0, p1), (result, damage)) in enumerate(zip(matchups, results)):
+            is_ghost = i == len(pairs)
+            damage_val = abs(damage)
+            if result == BattleOutcome.WIN:
+                if not is_ghost:
+                    p1.health -= damage_val
+                p0.lost_last_combat = False
+                p1.lost_last_combat = True
+            elif result == BattleOutcome.LOSE:
+                p0.health -= damage_val
+                p0.lost_last_combat = True
+                p1.lost_last_combat = False
+            else:
+                p0.lost_last_combat = False
+                p1.lost_last_combat = False
+
+        self.last_pairings = list(pairs)
+        for a, b in pairs:
+            self.last_opponent[a] = b
+            self.last_opponent[b] = a
+        if spare is not None:
+            self.last_pairings.append((spare, GHOST))
+            self.last_opponent[spare] = GHOST
+
+        self._eliminate_dead()
+        if len(self.alive) <= 1:
+            self.game_over = True
+            if self.alive:
+                self.placements[self.alive[0]] = 1
+            self.winner_id = next(uid for uid, place in self.placements.items() if place == 1)
+            return
+
+        self.turn_count += 1
+        for uid in self.alive:
+            self.tavern.start_turn(self.players[uid], self.turn_count)
+
+    def _eliminate_dead(self) -> None:
+        # Худшее здоровье — худшее место; при равенстве порядок по uid
+        dead = sorted(
+            (uid for uid in self.alive if self.players[uid].health <= 0),
+            key=lambda uid: (self.players[uid].health, uid),
+        )
+        for uid in dead:
+            player = self.players[uid]
+            self.placements[uid] = len(self.alive)
+            self._ghost = player.clone()
+            self.tavern.release_player(player)
+            self.alive.remove(uid)
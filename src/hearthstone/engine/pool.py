@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import random
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from .configs import CARD_DB, SPELL_DB, TIER_COPIES
+from .rng import default_rng
 
 """
 WE ASSUME THAT CARDS IN POOL ARE INFINITE, SO POOL CAN'T HAVE LESS CARDS THAN WE ASK
@@ -11,29 +12,197 @@ USUALLY IT'S BECAUSE WE HAVE A LOT OF CARDS AND COPIES OF THEM
 """
 
 
+class _TierCounts:
+    """Copies left per card of one tier + Fenwick tree over the counts.
+
+    draw (weighted by copies) is O(log n), count() is O(1), return is an
+    O(log n) tree update; n = distinct cards in the tier (a few dozen).
+    """
+
+    __slots__ = ("card_ids", "counts", "tree", "total", "_top_bit")
+
+    def __init__(self, card_ids: Sequence[str], counts: List[int], tree: List[int]) -> None:
+        self.card_ids = card_ids  # shared, read-only layout
+        self.counts = counts
+        self.tree = tree
+        self.total = sum(counts)
+        n = len(counts)
+        self._top_bit = 1 << (n.bit_length() - 1) if n else 0
+
+    def add(self, idx: int, delta: int) -> None:
+        self.counts[idx] += delta
+        self.total += delta
+        tree = self.tree
+        n = len(self.counts)
+        i = idx + 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def find(self, k: int) -> int:
+        """Index of the card holding the k-th copy (0 <= k < total)."""
+        tree = self.tree
+        n = len(self.counts)
+        pos = 0
+        step = self._top_bit
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= k:
+                pos = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return pos
+
+
+class _TierView:
+    """Read-only list-like view of one tier (len / count / iteration / in).
+
+    Keeps the old ``pool.tiers[t]`` list API for callers that inspect the
+    pool; iteration yields each card once per copy left, like the old list.
+    """
+
+    __slots__ = ("_tc", "_pool")
+
+    def __init__(self, tier_counts: _TierCounts, pool: CardPool) -> None:
+        self._tc = tier_counts
+        self._pool = pool
+
+    def __len__(self) -> int:
+        return self._tc.total
+
+    def __iter__(self) -> Iterator[str]:
+        for cid, cnt in zip(self._tc.card_ids, self._tc.counts):
+            for _ in range(cnt):
+                yield cid
+
+    def __contains__(self, card_id: object) -> bool:
+        return self.count(card_id) > 0
+
+    def count(self, card_id: object) -> int:
+        slot = self._pool._slot.get(card_id) if isinstance(card_id, str) else None
+        if slot is None or self._pool._tiers[slot[0]] is not self._tc:
+            return 0
+        return self._tc.counts[slot[1]]
+
+    def __repr__(self) -> str:
+        return f"_TierView(total={self._tc.total})"
+
+
+def _build_tree(counts: Sequence[int]) -> List[int]:
+    """O(n) Fenwick construction (1-based tree)."""
+    n = len(counts)
+    tree = [0] * (n + 1)
+    for i, c in enumerate(counts, start=1):
+        tree[i] += c
+        parent = i + (i & -i)
+        if parent <= n:
+            tree[parent] += tree[i]
+    return tree
+
+
+# max_tier -> {tier: (card_ids, initial counts, initial tree)}; считается один раз
+_LAYOUT_CACHE: Dict[int, Dict[int, Tuple[Tuple[str, ...], Tuple[int, ...], Tuple[int, ...]]]] = {}
+
+
+def _pool_layout(
+    max_tier: int,
+) -> Dict[int, Tuple[Tuple[str, ...], Tuple[int, ...], Tuple[int, ...]]]:
+    layout = _LAYOUT_CACHE.get(max_tier)
+    if layout is not None:
+        return layout
+    ids_by_tier: Dict[int, List[str]] = {t: [] for t in TIER_COPIES if t <= max_tier}
+    for card_id, data in CARD_DB.items():
+        if data.get("is_token", False):
+            continue
+        tier = data["tier"]
+        if tier > max_tier:
+            continue
+        ids_by_tier[tier].append(card_id)
+    layout = {}
+    for tier, ids in ids_by_tier.items():
+        counts = tuple([TIER_COPIES.get(tier, 0)] * len(ids))
+        layout[tier] = (tuple(ids), counts, tuple(_build_tree(counts)))
+    _LAYOUT_CACHE[max_tier] = layout
+    return layout
+
+
+_SLOT_CACHE: Dict[int, Dict[str, Tuple[int, int]]] = {}
+
+
+def _slot_index(max_tier: int) -> Dict[str, Tuple[int, int]]:
+    slots = _SLOT_CACHE.get(max_tier)
+    if slots is None:
+        slots = {}
+        for tier, (ids, _counts, _tree) in _pool_layout(max_tier).items():
+            for idx, cid in enumerate(ids):
+                slots[cid] = (tier, idx)
+        _SLOT_CACHE[max_tier] = slots
+    return slots
+
+
 class CardPool:
-    def __init__(self, max_tier: int = 6) -> None:
-        # Структура: {1: ['101', '101'...], 2: ['201', ...]}
+    def __init__(self, max_tier: int = 6, rng: Optional[random.Random] = None) -> None:
+        # Счётчики копий на карту по тирам (вместо списков с копиями):
+        # {1: _TierCounts(card_ids=(...), counts=[16, 16, ...]), ...}
         self.max_tier = max_tier
-        self.tiers: Dict[int, List[str]] = {}
+        # Генератор Game; модульный random, если пул создан отдельно
+        self.rng: random.Random = rng if rng is not None else default_rng()
+        self._layout = _pool_layout(max_tier)
+        # card_id -> (tier, index in tier); общий read-only словарь раскладки
+        self._slot: Dict[str, Tuple[int, int]] = _slot_index(max_tier)
+        self._tiers: Dict[int, _TierCounts] = {}
         self._initialize_pool()
+        self.tiers: Dict[int, _TierView] = {t: _TierView(tc, self) for t, tc in self._tiers.items()}
 
     def _initialize_pool(self) -> None:
         """Заполняет пул картами согласно конфигу TIER_COPIES"""
-        for t in TIER_COPIES.keys():
-            if t <= self.max_tier:
-                self.tiers[t] = []
+        for tier, (ids, counts, tree) in self._layout.items():
+            self._tiers[tier] = _TierCounts(ids, list(counts), list(tree))
 
-        for card_id, data in CARD_DB.items():
-            if data.get("is_token", False):
-                continue
+    def reset(self) -> None:
+        """Вернуть пул в исходное состояние без пересоздания структуры."""
+        for tier, tc in self._tiers.items():
+            _ids, counts, tree = self._layout[tier]
+            tc.counts[:] = counts
+            tc.tree[:] = tree
+            tc.total = sum(counts)
 
-            tier = data["tier"]
-            if tier > self.max_tier:
-                continue
-            count = TIER_COPIES.get(tier, 0)
+    def snapshot(self) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...], int], ...]:
+        """Immutable copy of the remaining counts (tiers in layout order)."""
+        return tuple((tuple(tc.counts), tuple(tc.tree), tc.total) for tc in self._tiers.values())
+
+    def restore(self, state: Tuple[Tuple[Tuple[int, ...], Tuple[int, ...], int], ...]) -> None:
+        """Вернуть счётчики, снятые snapshot(), на место (структура пула не меняется)."""
+        for tc, (counts, tree, total) in zip(self._tiers.values(), state):
+            tc.counts[:] = counts
+            tc.tree[:] = tree
+            tc.total = total
+
+    def counts_by_tier(self) -> Tuple[Tuple[int, ...], ...]:
+        """Copies left per card, tiers and cards in layout order (for the binary codec)."""
+        return tuple(tuple(tc.counts) for tc in self._tiers.values())
 
-            self.tiers[tier].extend([card_id] * count)
+    def set_counts(self, counts_by_tier: Sequence[Sequence[int]]) -> None:
+        """Inverse of counts_by_tier(); деревья Фенвика пересобираются."""
+        if len(counts_by_tier) != len(self._tiers):
+            raise ValueError("Pool layout mismatch: wrong number of tiers")
+        for tc, counts in zip(self._tiers.values(), counts_by_tier):
+            if len(counts) != len(tc.counts):
+                raise ValueError("Pool layout mismatch: wrong number of cards in tier")
+            tc.counts[:] = counts
+            tc.tree[:] = _build_tree(counts)
+            tc.total = sum(counts)
+
+    def count(self, card_id: str) -> int:
+        """Copies of card_id left in the pool."""
+        slot = self._slot.get(card_id)
+        if slot is None:
+            return 0
+        return self._tiers[slot[0]].counts[slot[1]]
+
+    @property
+    def total(self) -> int:
+        return sum(tc.total for tc in self._tiers.values())
 
     def draw_cards(self, count: int, max_tier: int) -> List[str]:
         """
@@ -41,28 +210,53 @@ class CardPool:
         """
         drawn_cards = []
 
-        available_tiers = [t for t in self.tiers.keys() if t <= max_tier]
+        available = [tc for t, tc in self._tiers.items() if t <= max_tier]
+        remaining = sum(tc.total for tc in available)
+        randrange = self.rng.randrange
 
         for _ in range(count):
-            weights = [len(self.tiers[t]) for t in available_tiers]
-
-            chosen_tier = random.choices(available_tiers, weights=weights, k=1)[0]
-
-            card_index = random.randrange(len(self.tiers[chosen_tier]))
-            card_id = self.tiers[chosen_tier].pop(card_index)
-
-            drawn_cards.append(card_id)
+            # Один бросок на всё: тир и карта взвешены числом оставшихся копий
+            k = randrange(remaining)
+            for tc in available:
+                if k < tc.total:
+                    break
+                k -= tc.total
+            idx = tc.find(k)
+            tc.add(idx, -1)
+            remaining -= 1
+            drawn_cards.append(tc.card_ids[idx])
 
         return drawn_cards
 
+    def draw_matching(
+        self,
+        predicate: Callable[[Dict[str, Any]], bool],
+        tier: Optional[int] = None,
+    ) -> Optional[str]:
+        """Draw one copy, weighted by copies left, among cards whose CARD_DB
+        entry passes ``predicate`` (optionally only from ``tier``)."""
+        candidates: List[Tuple[_TierCounts, int]] = []
+        weights: List[int] = []
+        for t, tc in self._tiers.items():
+            if tier is not None and t != tier:
+                continue
+            for idx, (cid, cnt) in enumerate(zip(tc.card_ids, tc.counts)):
+                if cnt > 0 and predicate(CARD_DB[cid]):
+                    candidates.append((tc, idx))
+                    weights.append(cnt)
+        if not candidates:
+            return None
+        tc, idx = self.rng.choices(candidates, weights=weights, k=1)[0]
+        tc.add(idx, -1)
+        return tc.card_ids[idx]
+
     def return_cards(self, card_ids: List[str]) -> None:
         """Возвращает карты обратно в пул (при продаже или реролле)"""
         for cid in card_ids:
-            if cid in CARD_DB:
-                if CARD_DB[cid].get("is_token", False):
-                    continue
-                tier = int(CARD_DB[cid]["tier"])
-                self.tiers[tier].append(cid)
+            slot = self._slot.get(cid)
+            if slot is None:  # токены и неизвестные карты в пуле не живут
+                continue
+            self._tiers[slot[0]].add(slot[1], 1)
 
     def draw_discovery_cards(
         self,
@@ -74,42 +268,35 @@ class CardPool:
         """
         Выбирает count УНИКАЛЬНЫХ карт для раскопки и временно изымает их из пула.
         """
-        candidates = []
+        candidates: List[str] = []
 
-        search_tiers = []
-        for t in self.tiers.keys():
+        for t, tc in self._tiers.items():
             if exact_tier:
-                if t == tier:
-                    search_tiers.append(t)
-            else:
-                if t <= tier:
-                    search_tiers.append(t)
-
-        for t in search_tiers:
-            unique_ids_in_pool = set(self.tiers[t])
-            for card_id in unique_ids_in_pool:
-                data = CARD_DB.get(card_id)
-                if not data:
+                if t != tier:
                     continue
-                if predicate is not None and not predicate(data):
+            elif t > tier:
+                continue
+            for cid, cnt in zip(tc.card_ids, tc.counts):
+                if cnt <= 0:
                     continue
-
-                candidates.append(card_id)
+                if predicate is not None and not predicate(CARD_DB[cid]):
+                    continue
+                candidates.append(cid)
 
         if not candidates:
             return []
         k = min(len(candidates), count)
-        chosen_ids: List[str] = random.sample(candidates, k)
+        chosen_ids: List[str] = self.rng.sample(candidates, k)
         for cid in chosen_ids:
-            c_tier = int(CARD_DB[cid]["tier"])
-            if cid in self.tiers[c_tier]:
-                self.tiers[c_tier].remove(cid)
+            c_tier, idx = self._slot[cid]
+            self._tiers[c_tier].add(idx, -1)
 
         return chosen_ids
 
 
 class SpellPool:
-    def __init__(self) -> None:
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.rng: random.Random = rng if rng is not None else default_rng()
         self.tiers: Dict[int, List[str]] = {}
         self._initialize_pool()
 
@@ -127,7 +314,7 @@ class SpellPool:
             return drawn_spells
 
         for _ in range(count):
-            chosen_tier = random.choice(available_tiers)
-            spell_id = random.choice(self.tiers[chosen_tier])
+            chosen_tier = self.rng.choice(available_tiers)
+            spell_id = self.rng.choice(self.tiers[chosen_tier])
             drawn_spells.append(spell_id)
         return drawn_spells
@@ -0,0 +1,15 @@
+"""
+rng.py — default random generator of the engine.
+
+Managers and helpers take an optional ``rng: random.Random``; without one they
+draw from the generator behind the ``random`` module functions, so plain
+random.seed() keeps seeding them.
+"""
+from __future__ import annotations
+
+import random
+
+
+def default_rng() -> random.Random:
+    """The random.Random instance used by random.random(), random.choice(), ..."""
+    return random._inst  # type: ignore[attr-defined]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List, Set
 
-from .enums import EffectIDs, MechanicType, SpellIDs, Tags
+from .enums import EffectIDs, MechanicType, SpellIDs, Tags, tags_to_mask
 from .event_system import EffectContext, EntityRef, Event, EventType, TriggerDef
 
 
@@ -46,7 +46,7 @@ def _spell_fortify(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
     ctx.buff_perm(EntityRef(event.target.uid), 0, 3)
     unit = ctx.resolve_unit(EntityRef(event.target.uid))
     if unit:
-        unit.tags.add(Tags.TAUNT)
+        unit.add_tag(Tags.TAUNT)
 
 
 def _spell_apple(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
@@ -95,7 +95,7 @@ def _make_buff_minion_handler(spell_id: str):
 
     fixed_atk: int = params.get("atk", 0)
     fixed_hp: int = params.get("hp", 0)
-    extra_tags: set = params.get("tags", set())
+    extra_tags: int = tags_to_mask(params.get("tags", ()))
 
     def _handler(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         if not event.target:
@@ -114,7 +114,7 @@ def _make_buff_minion_handler(spell_id: str):
             if extra_tags:
                 unit = ctx.resolve_unit(ref)
                 if unit:
-                    unit.tags |= extra_tags
+                    unit.tag_mask |= extra_tags
                     unit.recalc_stats()
 
     return _handler
@@ -126,7 +126,7 @@ def _make_buff_board_handler(spell_id: str):
     params = SPELL_DB[spell_id].get("params", {})
     atk: int = params.get("atk", 0)
     hp: int = params.get("hp", 0)
-    extra_tags: set = params.get("tags", set())
+    extra_tags: int = tags_to_mask(params.get("tags", ()))
 
     def _handler(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         if not event.source_pos:
@@ -135,7 +135,7 @@ def _make_buff_board_handler(spell_id: str):
         for _, unit in ctx.iter_board_units(side):
             ctx.buff_perm(EntityRef(unit.uid), atk, hp)
             if extra_tags:
-                unit.tags |= extra_tags
+                unit.tag_mask |= extra_tags
                 unit.recalc_stats()
 
     return _handler
@@ -149,18 +149,18 @@ def _make_buff_board_type_handler(spell_id: str):
     atk: int = params.get("atk", 0)
     hp: int = params.get("hp", 0)
     type_filter = params.get("type", None)
-    extra_tags: set = params.get("tags", set())
+    extra_tags: int = tags_to_mask(params.get("tags", ()))
 
     def _handler(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         if not event.source_pos:
             return
         side = event.source_pos.side
         for _, unit in ctx.iter_board_units(side):
-            if type_filter is not None and type_filter not in unit.types:
+            if type_filter is not None and not unit.has_type(type_filter):
                 continue
             ctx.buff_perm(EntityRef(unit.uid), atk, hp)
             if extra_tags:
-                unit.tags |= extra_tags
+                unit.tag_mask |= extra_tags
                 unit.recalc_stats()
 
     return _handler
@@ -256,7 +256,7 @@ def _make_buff_tavern_handler(spell_id: str):
     params = SPELL_DB[spell_id].get("params", {})
     atk: int = params.get("atk", 0)
     hp: int = params.get("hp", 0)
-    extra_tags: set = params.get("tags", set())
+    extra_tags: int = tags_to_mask(params.get("tags", ()))
 
     def _handler(ctx: EffectContext, event: Event, trigger_uid: int) -> None:
         if not event.source_pos:
@@ -265,7 +265,7 @@ def _make_buff_tavern_handler(spell_id: str):
         for _, unit in ctx.iter_store_units(side):
             ctx.buff_perm(EntityRef(unit.uid), atk, hp)
             if extra_tags:
-                unit.tags |= extra_tags
+                unit.tag_mask |= extra_tags
                 unit.recalc_stats()
 
     return _handler
@@ -1,23 +1,39 @@
 from __future__ import annotations
 
+import random
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .auras import recalculate_board_auras
+from .actions import ACTION_ZONES, ZONE_ALL, compute_legal_actions, mask_stamp, stamp_zones
+from .auras import recalculate_board_auras, refresh_aura_sources
 from .card_def import GOLDEN_TRIGGER_REGISTRY, TRIGGER_REGISTRY
 from .configs import COST_BUY, COST_REROLL, SPELLS_PER_ROLL, TAVERN_SLOTS, TIER_UPGRADE_COSTS
 from .entities import HandCard, Player, Spell, StoreItem, Unit
 from .enums import CardIDs, SpellIDs, UnitType
-from .event_system import EntityRef, Event, EventManager, EventType, PosRef, TriggerInstance, Zone
+from .event_system import (
+    EntityRef,
+    Event,
+    EventManager,
+    EventType,
+    TriggerInstance,
+    Zone,
+    pos_ref,
+)
 from .pool import CardPool, SpellPool
 from .spells import SPELL_TRIGGER_REGISTRY, SPELLS_REQUIRE_TARGET
 
 
 class TavernManager:
     def __init__(
-        self, pool: CardPool, spell_pool: SpellPool, event_manager: EventManager | None = None
+        self,
+        pool: CardPool,
+        spell_pool: SpellPool,
+        event_manager: EventManager | None = None,
+        rng: random.Random | None = None,
     ):
         self.pool = pool
         self.spell_pool = spell_pool
+        # По умолчанию делим генератор с пулом (Game передаёт свой rng всем)
+        self.rng: random.Random = rng if rng is not None else pool.rng
         self._uid_counter = 1000
         self.event_manager = event_manager or EventManager(
             TRIGGER_REGISTRY, GOLDEN_TRIGGER_REGISTRY
@@ -27,6 +43,84 @@ class TavernManager:
         self._uid_counter += 1
         return self._uid_counter
 
+    def legal_actions(self, player: Player) -> int:
+        """Legal-action bits of player (ids in engine/actions.py), O(1) when up to date."""
+        if player.legal_stamp != mask_stamp(player):
+            self.refresh_legal_actions(player)
+        return player.legal_actions
+
+    def refresh_legal_actions(self, player: Player, zones: int = ZONE_ALL) -> None:
+        """Recompute the bit segments of zones (plus any zone whose size changed)."""
+        stamp = mask_stamp(player)
+        # Эффекты карт могли задеть зоны, которых нет в ACTION_ZONES действия
+        zones |= stamp_zones(player.legal_stamp, stamp)
+        player.legal_actions = compute_legal_actions(
+            player, self.pool.max_tier, zones, player.legal_actions
+        )
+        player.legal_stamp = stamp
+
+    def apply_action(self, player: Player, action_type: str, **kwargs: Any) -> Tuple[bool, str]:
+        """Dispatch one recruit-phase action (everything except END_TURN)."""
+        # Состояние меняли в обход таверны — частичный пересчёт не годится
+        stale = player.legal_stamp != mask_stamp(player)
+        success, info = self._dispatch_action(player, action_type, kwargs)
+        if stale:
+            self.refresh_legal_actions(player)
+        elif success:
+            self.refresh_legal_actions(player, ACTION_ZONES.get(action_type, ZONE_ALL))
+        return success, info
+
+    def _dispatch_action(
+        self, player: Player, action_type: str, kwargs: Dict[str, Any]
+    ) -> Tuple[bool, str]:
+        if action_type == "BUY":
+            return self.buy_unit(player, kwargs.get("index", -1))
+        if action_type == "SELL":
+            return self.sell_unit(player, kwargs.get("index", -1))
+        if action_type == "ROLL":
+            return self.roll_tavern(player)
+        if action_type == "UPGRADE":
+            return self.upgrade_tavern(player)
+        if action_type == "FREEZE":
+            return self.toggle_freeze(player)
+        if action_type == "PLAY":
+            # kwargs: hand_index, insert_index, target_index
+            h_idx = kwargs.get("hand_index", -1)
+            i_idx = kwargs.get("insert_index", len(player.board))  # По умолчанию в конец
+            t_idx = kwargs.get("target_index", -1)
+            return self.play_unit(player, h_idx, i_idx, t_idx)
+        if action_type == "SWAP":
+            # kwargs: index_a, index_b
+            return self.swap_units(player, kwargs.get("index_a", -1), kwargs.get("index_b", -1))
+        if action_type == "DISCOVER_CHOICE":
+            # kwargs: index
+            return self.make_discovery_choice(player, kwargs.get("index", -1))
+        return False, "Unknown Action"
+
+    @staticmethod
+    def _pool_copies(unit: Unit) -> List[str]:
+        """Card ids a unit puts back into the pool (golden = 3, plus magnetized copies)."""
+        cards = [unit.card_id] * (3 if unit.is_golden else 1)
+        for cid, copies in unit.absorbed_pool_copies.items():
+            cards.extend([cid] * copies)
+        return cards
+
+    def release_player(self, player: Player) -> None:
+        """Eliminated player: board, hand, shop and discover options go back to the pool."""
+        units = list(player.board)
+        units.extend(card.unit for card in player.hand if card.unit)
+        units.extend(item.unit for item in player.store if item.unit)
+        units.extend(item.unit for item in player.discovery.options if item.unit)
+        cards: List[str] = []
+        for unit in units:
+            cards.extend(self._pool_copies(unit))
+        self.pool.return_cards(cards)
+        player.board.clear()
+        player.hand.clear()
+        player.store.clear()
+        player.discovery.options.clear()
+        player.discovery.is_active = False
+
     def start_turn(self, player: Player, turn_number: int) -> None:
         """
         Logic StartOfTurn
@@ -40,11 +134,12 @@ class TavernManager:
         self.event_manager.process_event(
             Event(
                 event_type=EventType.START_OF_TURN,
-                source_pos=PosRef(side=player.uid, zone=Zone.HERO, slot=0),
+                source_pos=pos_ref(player.uid, Zone.HERO, 0),
             ),
             {player.uid: player},
             self.get_next_uid,
             card_pool=self.pool,
+            rng=self.rng,
         )
         max_gold = min(10, 3 + turn_number - 1)
         player.gold = max_gold + player.gold_next_turn
@@ -69,10 +164,11 @@ class TavernManager:
         self._fill_tavern(player)
         self.event_manager.process_event(
             Event(event_type=EventType.TAVERN_REFRESHED,
-                  source_pos=PosRef(side=player.uid, zone=Zone.HERO, slot=0)),
-            {player.uid: player}, self.get_next_uid, card_pool=self.pool,
+                  source_pos=pos_ref(player.uid, Zone.HERO, 0)),
+            {player.uid: player}, self.get_next_uid, card_pool=self.pool, rng=self.rng,
         )
         self._generate_spellcrafts(player)
+        self.refresh_legal_actions(player, ZONE_ALL)
 
     def roll_tavern(self, player: Player) -> tuple[bool, str]:
         """Paid roll (1 gold). Ignore freeze (throw all). Free if player.free_refreshes > 0."""
@@ -91,8 +187,8 @@ class TavernManager:
         self._fill_tavern(player)
         self.event_manager.process_event(
             Event(event_type=EventType.TAVERN_REFRESHED,
-                  source_pos=PosRef(side=player.uid, zone=Zone.HERO, slot=0)),
-            {player.uid: player}, self.get_next_uid, card_pool=self.pool,
+                  source_pos=pos_ref(player.uid, Zone.HERO, 0)),
+            {player.uid: player}, self.get_next_uid, card_pool=self.pool, rng=self.rng,
         )
 
         return True, "Rolled"
@@ -104,23 +200,28 @@ class TavernManager:
         slots_needed = slots_total - current_units
 
         if slots_needed > 0:
+            # Один draw из пула, все юниты в магазин, затем один батч MINION_ADDED_TO_SHOP
+            # (один EffectContext вместо контекста на каждый юнит)
             new_ids = self.pool.draw_cards(slots_needed, player.tavern_tier)
+            store = player.store
+            events: List[Event] = []
             for cid in new_ids:
                 new_unit = self._make_unit(player, cid)
-                player.store.append(StoreItem(unit=new_unit))
-                event = Event(
-                    event_type=EventType.MINION_ADDED_TO_SHOP,
-                    source=EntityRef(uid=new_unit.uid),
-                    source_pos=PosRef(side=player.uid, zone=Zone.SHOP, slot=len(player.store) - 1),
-                )
-                players = {player.uid: player}
-
-                self.event_manager.process_event(
-                    event,
-                    players,
-                    self.get_next_uid,
-                    card_pool=self.pool,
+                store.append(StoreItem(unit=new_unit))
+                events.append(
+                    Event(
+                        event_type=EventType.MINION_ADDED_TO_SHOP,
+                        source=EntityRef(uid=new_unit.uid),
+                        source_pos=pos_ref(player.uid, Zone.SHOP, len(store) - 1),
+                    )
                 )
+            self.event_manager.process_events(
+                events,
+                {player.uid: player},
+                self.get_next_uid,
+                card_pool=self.pool,
+                rng=self.rng,
+            )
         cnt_spells = len([u for u in player.store if u.spell])
         if cnt_spells >= SPELLS_PER_ROLL:
             return
@@ -221,7 +322,7 @@ class TavernManager:
         unit = player.board[board_index]
         uid = unit.uid
         source = EntityRef(uid=unit.uid)
-        source_pos = PosRef(side=player.uid, zone=Zone.BOARD, slot=board_index)
+        source_pos = pos_ref(player.uid, Zone.BOARD, board_index)
         event = Event(
             event_type=EventType.MINION_SOLD,
             source=source,
@@ -233,6 +334,7 @@ class TavernManager:
             players_by_uid,
             self.get_next_uid,
             card_pool=self.pool,
+            rng=self.rng,
         )
 
         for i, u in enumerate(player.board):
@@ -240,11 +342,7 @@ class TavernManager:
                 unit = player.board.pop(i)
                 break
         player.gold += 1
-        cards_to_return: List[str] = []
-        cards_to_return.extend([unit.card_id] * (3 if unit.is_golden else 1))
-        for cid, copies in unit.absorbed_pool_copies.items():
-            cards_to_return.extend([cid] * copies)
-        self.pool.return_cards(cards_to_return)
+        self.pool.return_cards(self._pool_copies(unit))
 
         recalculate_board_auras(player.board)
         return True, "Sold unit"
@@ -272,7 +370,7 @@ class TavernManager:
             return False, "No unit in hand card"
         if unit.has_magnetic and 0 <= target_index < len(player.board):
             target = player.board[target_index]
-            if UnitType.MECH in target.types:
+            if target.has_type(UnitType.MECH):
                 target_uid = target.uid
 
                 # first of all throw event MINION_PLAYED
@@ -280,14 +378,15 @@ class TavernManager:
                     event_type=EventType.MINION_PLAYED,
                     source=EntityRef(uid=unit.uid),
                     target=EntityRef(uid=target_uid),
-                    source_pos=PosRef(side=player.uid, zone=Zone.HAND, slot=hand_index),
-                    target_pos=PosRef(side=player.uid, zone=Zone.BOARD, slot=target_index),
+                    source_pos=pos_ref(player.uid, Zone.HAND, hand_index),
+                    target_pos=pos_ref(player.uid, Zone.BOARD, target_index),
                 )
                 self.event_manager.process_event(
                     event,
                     {player.uid: player},
                     self.get_next_uid,
                     card_pool=self.pool,
+                    rng=self.rng,
                 )
 
                 player.hand.pop(hand_index)
@@ -298,6 +397,7 @@ class TavernManager:
                     return True, "Magnetized (target disappeared logic error)"
 
                 new_target.magnetize_from(unit)
+                refresh_aura_sources(player.board)
                 recalculate_board_auras(player.board)
                 return True, "Magnetized"
         if len(player.board) >= 7:
@@ -393,6 +493,12 @@ class TavernManager:
         Find 3 copies of unit, and unite in one gold
         Timed buffs become times, const - const
         """
+        # O(1) отсечка по счётчикам Hand / Board (копии с золотыми): зоны
+        # сканируются, только когда тройка вообще возможна
+        n_hand, n_board = player.card_counts.zones(card_id)
+        if n_hand + n_board < 3:
+            return
+
         hand_indices = [
             i
             for i, hc in enumerate(player.hand)
@@ -505,7 +611,7 @@ class TavernManager:
 
         trigger_def = trigger_defs[0]
         trigger = TriggerInstance(trigger_def=trigger_def, trigger_uid=0)
-        source_pos = PosRef(side=player.uid, zone=Zone.HAND, slot=hand_index)
+        source_pos = pos_ref(player.uid, Zone.HAND, hand_index)
         target_ref = None
         if 0 <= target_index < len(player.board):
             target_ref = EntityRef(uid=player.board[target_index].uid)
@@ -522,6 +628,7 @@ class TavernManager:
             self.get_next_uid,
             extra_triggers=[trigger],
             card_pool=self.pool,
+            rng=self.rng,
         )
         player.hand.pop(hand_index)
         recalculate_board_auras(player.board)
@@ -544,13 +651,13 @@ class TavernManager:
         self, player: Player, unit: Unit, unit_index: int, target_index: int
     ) -> None:
         source = EntityRef(uid=unit.uid)
-        source_pos = PosRef(side=player.uid, zone=Zone.BOARD, slot=unit_index)
+        source_pos = pos_ref(player.uid, Zone.BOARD, unit_index)
         target_ref = None
         target_pos = None
         if 0 <= target_index < len(player.board):
             target_unit = player.board[target_index]
             target_ref = EntityRef(uid=target_unit.uid)
-            target_pos = PosRef(side=player.uid, zone=Zone.BOARD, slot=target_index)
+            target_pos = pos_ref(player.uid, Zone.BOARD, target_index)
         event = Event(
             event_type=EventType.MINION_PLAYED,
             source=source,
@@ -564,6 +671,7 @@ class TavernManager:
             players_by_uid,
             self.get_next_uid,
             card_pool=self.pool,
+            rng=self.rng,
         )
         recalculate_board_auras(player.board)
 
@@ -587,11 +695,12 @@ class TavernManager:
         self.event_manager.process_event(
             Event(
                 event_type=EventType.END_OF_TURN,
-                source_pos=PosRef(side=player.uid, zone=Zone.BOARD, slot=-1),
+                source_pos=pos_ref(player.uid, Zone.BOARD, -1),
             ),
             {player.uid: player},
             self.get_next_uid,
             card_pool=self.pool,
+            rng=self.rng,
         )
 
         player.hand[:] = [
@@ -0,0 +1,94 @@
+"""
+compact_obs.py — compact tokenized form of the HearthstoneEnv observation.
+
+The flat Box(1036) float32 observation is 27 entity slots x 38 columns plus
+10 global / enemy floats, and almost all of it is 0/1 flags or small
+integers.  The compact form keeps one token per slot:
+
+  card_ids : (27,)    int16   static card id (column 2), 0 = empty slot
+  flags    : (27, 5)  uint8   the 33 binary columns (FLAG_COLS), bit-packed
+                              little-endian along the last axis
+  stats    : (27, 4)  float16 cost, tier, atk, hp as raw integers
+                              (column * STAT_SCALE), exact up to 2048
+  context  : (10,)    float32 global (7) + enemy (3) features, as is
+
+445 bytes instead of 4144.  from_compact() restores the flat vector bit for
+bit (stats up to 2048).  Every function also takes a leading batch shape, so
+vector envs convert the whole (N, 1036) batch at once.  The torch decode for
+the model lives in scripts/model.py (HSTransformerAgent._parse_compact).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from gymnasium import spaces
+
+NUM_SLOTS = 27
+ENTITY_FEATURES = 38
+GLOBAL_SIZE = 7
+ENEMY_SIZE = 3
+CONTEXT_SIZE = GLOBAL_SIZE + ENEMY_SIZE
+FLAT_SIZE = GLOBAL_SIZE + NUM_SLOTS * ENTITY_FEATURES + ENEMY_SIZE
+
+CARD_ID_COL = 2
+# Present, spell, frozen, keywords [8..16], golden .. selected [17..25], types [26..37]
+FLAG_COLS = np.array([0, 1, 5, *range(8, ENTITY_FEATURES)])
+FLAG_BYTES = (len(FLAG_COLS) + 7) // 8
+# cost, tier, atk, hp — normalized in the flat obs by MAX_COST, MAX_TIER, MAX_ATK, MAX_HP
+STAT_COLS = np.array([3, 4, 6, 7])
+STAT_SCALE = np.array([10.0, 6.0, 100.0, 100.0])
+
+CompactObs = Dict[str, np.ndarray]
+
+_SLOTS = slice(GLOBAL_SIZE, GLOBAL_SIZE + NUM_SLOTS * ENTITY_FEATURES)
+
+
+def compact_space(num_card_ids: int) -> spaces.Dict:
+    """Observation space of one compact observation."""
+    return spaces.Dict(
+        {
+            "card_ids": spaces.Box(0, num_card_ids - 1, (NUM_SLOTS,), np.int16),
+            "flags": spaces.Box(0, 255, (NUM_SLOTS, FLAG_BYTES), np.uint8),
+            "stats": spaces.Box(-np.inf, np.inf, (NUM_SLOTS, len(STAT_COLS)), np.float16),
+            "context": spaces.Box(-np.inf, np.inf, (CONTEXT_SIZE,), np.float32),
+        }
+    )
+
+
+def empty_compact(batch_shape: Tuple[int, ...] = ()) -> CompactObs:
+    return {
+        "card_ids": np.zeros((*batch_shape, NUM_SLOTS), np.int16),
+        "flags": np.zeros((*batch_shape, NUM_SLOTS, FLAG_BYTES), np.uint8),
+        "stats": np.zeros((*batch_shape, NUM_SLOTS, len(STAT_COLS)), np.float16),
+        "context": np.zeros((*batch_shape, CONTEXT_SIZE), np.float32),
+    }
+
+
+def to_compact(flat: np.ndarray, out: Optional[CompactObs] = None) -> CompactObs:
+    """(..., 1036) float32 -> compact dict, written into ``out`` if given."""
+    batch_shape = flat.shape[:-1]
+    if out is None:
+        out = empty_compact(batch_shape)
+    slots = flat[..., _SLOTS].reshape(*batch_shape, NUM_SLOTS, ENTITY_FEATURES)
+    out["card_ids"][...] = slots[..., CARD_ID_COL]
+    out["flags"][...] = np.packbits(slots[..., FLAG_COLS] != 0, axis=-1, bitorder="little")
+    out["stats"][...] = np.rint(slots[..., STAT_COLS] * STAT_SCALE)
+    out["context"][..., :GLOBAL_SIZE] = flat[..., :GLOBAL_SIZE]
+    out["context"][..., GLOBAL_SIZE:] = flat[..., FLAT_SIZE - ENEMY_SIZE :]
+    return out
+
+
+def from_compact(obs: CompactObs) -> np.ndarray:
+    """Compact dict -> (..., 1036) float32 flat observation."""
+    batch_shape = obs["card_ids"].shape[:-1]
+    flat = np.zeros((*batch_shape, FLAT_SIZE), np.float32)
+    slots = flat[..., _SLOTS].reshape(*batch_shape, NUM_SLOTS, ENTITY_FEATURES)
+    slots[..., CARD_ID_COL] = obs["card_ids"]
+    bits = np.unpackbits(obs["flags"], axis=-1, count=len(FLAG_COLS), bitorder="little")
+    slots[..., FLAG_COLS] = bits
+    slots[..., STAT_COLS] = obs["stats"].astype(np.float64) / STAT_SCALE
+    flat[..., :GLOBAL_SIZE] = obs["context"][..., :GLOBAL_SIZE]
+    flat[..., FLAT_SIZE - ENEMY_SIZE :] = obs["context"][..., GLOBAL_SIZE:]
+    return flat
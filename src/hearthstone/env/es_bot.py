@@ -18,7 +18,7 @@ from hearthstone.engine.enums import SpellIDs, UnitType
 from hearthstone.engine.spells import SPELLS_REQUIRE_TARGET
 
 if TYPE_CHECKING:
-    from hearthstone.engine.entities import Player, Unit
+    from hearthstone.engine.entities import CardCounts, Player, Unit
     from hearthstone.engine.game import Game
 
 
@@ -103,14 +103,8 @@ def _get_board_types(player: "Player") -> Set[UnitType]:
     return types
 
 
-def _get_card_counts(player: "Player") -> dict[str, int]:
-    counts: dict[str, int] = {}
-    for u in player.board:
-        counts[u.card_id] = counts.get(u.card_id, 0) + 1
-    for c in player.hand:
-        if c.unit:
-            counts[c.unit.card_id] = counts.get(c.unit.card_id, 0) + 1
-    return counts
+def _get_card_counts(player: "Player") -> "CardCounts":
+    return player.card_counts
 
 
 def _weakest_board_unit(player: "Player", w: np.ndarray, turn: int) -> tuple[int, float]:
@@ -148,7 +142,7 @@ def _best_board_unit_idx(player: "Player", w: np.ndarray, turn: int) -> int:
 def score_unit_es(
     card_id: str,
     board_types: Set[UnitType],
-    card_counts: dict[str, int],
+    card_counts: "CardCounts | dict[str, int]",
     turn: int,
     w: np.ndarray,
 ) -> float:
@@ -13,7 +13,15 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Set
 
 from hearthstone.engine.entities import Player, Unit
-from hearthstone.engine.enums import Tags, UnitType
+from hearthstone.engine.enums import (
+    Tags,
+    UnitType,
+    tags_from_mask,
+    tags_to_mask,
+    types_from_mask,
+    types_to_mask,
+)
+from hearthstone.engine.rng import default_rng
 
 
 @dataclass(slots=True)
@@ -29,10 +37,29 @@ class UnitSnapshot:
     perm_hp_add: int
     tier: int
     is_golden: bool
-    tags: Set[str]  # store tag names, not enums (picklable)
-    types: List[str]  # store type values
+    tag_mask: int  # Unit.tag_mask bits
+    type_mask: int  # Unit.type_mask bits
     attached_perm: Dict[str, int]
 
+    # Name/value views; the setters also let pools pickled before the
+    # bitmask layout (tags/types slots) load into the mask fields.
+    @property
+    def tags(self) -> Set[str]:
+        return {t.name for t in tags_from_mask(self.tag_mask)}
+
+    @tags.setter
+    def tags(self, names: Set[str]) -> None:
+        self.tag_mask = tags_to_mask(Tags[n] for n in names if n in Tags.__members__)
+
+    @property
+    def types(self) -> List[str]:
+        return [t.value for t in types_from_mask(self.type_mask)]
+
+    @types.setter
+    def types(self, values: List[str]) -> None:
+        known = {t.value: t for t in UnitType}
+        self.type_mask = types_to_mask(known[v] for v in values if v in known)
+
     @staticmethod
     def from_unit(unit: Unit) -> UnitSnapshot:
         return UnitSnapshot(
@@ -45,27 +72,13 @@ class UnitSnapshot:
             perm_hp_add=unit.perm_hp_add,
             tier=unit.tier,
             is_golden=unit.is_golden,
-            tags={t.name for t in unit.tags},
-            types=[t.value for t in unit.types],
+            tag_mask=unit.tag_mask,
+            type_mask=unit.type_mask,
             attached_perm=dict(unit.attached_perm),
         )
 
     def to_unit(self, uid: int, owner_id: int) -> Unit:
         """Recreate a combat-ready Unit from snapshot."""
-        tags_set: set[Tags] = set()
-        for name in self.tags:
-            try:
-                tags_set.add(Tags[name])
-            except KeyError:
-                pass
-
-        type_list: list[UnitType] = []
-        for val in self.types:
-            try:
-                type_list.append(UnitType(val))
-            except ValueError:
-                pass
-
         unit = Unit(
             uid=uid,
             card_id=self.card_id,
@@ -77,8 +90,8 @@ class UnitSnapshot:
             max_atk=self.base_atk,
             perm_atk_add=self.perm_atk_add,
             perm_hp_add=self.perm_hp_add,
-            types=type_list,
-            tags=tags_set,
+            type_mask=self.type_mask,
+            tag_mask=self.tag_mask,
             is_golden=self.is_golden,
             attached_perm=dict(self.attached_perm),
         )
@@ -145,6 +158,7 @@ class GhostPool:
 
     def sample_trajectory(
         self,
+        rng: Optional[random.Random] = None,
     ) -> Optional[Dict[int, BoardSnapshot]]:
         """Recency-biased sampling from pool.
 
@@ -153,18 +167,23 @@ class GhostPool:
 
         This prevents overfitting to one meta while keeping
         the training signal mostly on-policy.
+
+        ``rng`` defaults to the module-level generator; envs pass their
+        game's generator so sampling is reproducible per env.
         """
         n = len(self.trajectories)
         if n == 0:
             return None
+        if rng is None:
+            rng = default_rng()
 
-        if random.random() < 0.7:
+        if rng.random() < 0.7:
             # Recent: last 30% of pool
             cutoff = max(1, int(n * 0.7))
-            idx = random.randint(cutoff, n - 1)
+            idx = rng.randint(cutoff, n - 1)
         else:
             # Uniform: any game (diversity)
-            idx = random.randint(0, n - 1)
+            idx = rng.randint(0, n - 1)
         return self.trajectories[idx]
 
     @staticmethod
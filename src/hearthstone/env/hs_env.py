@@ -1,24 +1,39 @@
 from __future__ import annotations
 
 import math
-import random
-from collections.abc import Sequence
+import os
+from collections.abc import Generator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter_ns
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
 
+from hearthstone.engine.actions import (
+    ACTION_TABLE,
+    FREEZE_END_TURN,
+    NUM_ACTIONS,
+    SWAP_BITS,
+    ZONE_ALL,
+    ZONE_BOARD,
+    ZONE_HAND,
+    ZONE_STORE,
+    mask_stamp,
+    stamp_zones,
+)
+from hearthstone.engine.card_features import NO_TRIGGER_FLAGS, trigger_flags
+from hearthstone.engine.combat import CombatManager
 from hearthstone.engine.configs import CARD_DB, SPELL_DB
-from hearthstone.engine.card_def import TRIGGER_REGISTRY
-from hearthstone.engine.cpp_bridge import CARD_ID_MAP, TAG_TO_BIT, TYPE_TO_BIT, get_cpp_engine
 from hearthstone.engine.entities import HandCard, Player, Spell, StoreItem, Unit
-from hearthstone.engine.enums import UnitType
-from hearthstone.engine.event_system import EventType
+from hearthstone.engine.enums import UNIT_TYPE_BITS, BattleOutcome, Tags, UnitType
 from hearthstone.engine.game import Game
 from hearthstone.engine.spells import SPELLS_REQUIRE_TARGET
+from hearthstone.env.compact_obs import CompactObs, compact_space, empty_compact, to_compact
 from hearthstone.env.es_bot import es_bot_turn
 from hearthstone.env.ghost_pool import BoardSnapshot, GhostPool
+from hearthstone.env.perf_stats import PerfStats
 from hearthstone.env.smart_bot import smart_bot_turn
 
 if TYPE_CHECKING:
@@ -33,6 +48,139 @@ MAX_COST = 10.0
 MAX_SPELL_DISCOUNT = 10.0
 MAX_CARDS_IN_GAME = 500
 
+# Bit-unpack tables: row = Unit.tag_mask / Unit.type_mask, columns = obs slots.
+# Keyword slot order [8..16] differs from the Tags bit order, hence the table.
+_KEYWORD_ORDER = (
+    Tags.TAUNT,
+    Tags.DIVINE_SHIELD,
+    Tags.WINDFURY,
+    Tags.POISONOUS,
+    Tags.VENOMOUS,
+    Tags.REBORN,
+    Tags.CLEAVE,
+    Tags.MAGNETIC,
+    Tags.IMMEDIATE_ATTACK,
+)
+_TAG_MASK_LIMIT = 1 << len(Tags)
+_KEYWORD_ROWS = (
+    (np.arange(_TAG_MASK_LIMIT)[:, None] & np.array([int(t) for t in _KEYWORD_ORDER])) != 0
+).astype(np.float32)
+
+# Keywords [8..16] + Is Golden [17] in one lookup: row = tag_mask | golden << len(Tags)
+_GOLDEN_SHIFT = len(Tags)
+_KEYWORD_GOLDEN_ROWS = np.zeros((2 * _TAG_MASK_LIMIT, len(_KEYWORD_ORDER) + 1), dtype=np.float32)
+_KEYWORD_GOLDEN_ROWS[:, :-1] = np.concatenate([_KEYWORD_ROWS, _KEYWORD_ROWS])
+_KEYWORD_GOLDEN_ROWS[_TAG_MASK_LIMIT:, -1] = 1.0
+
+# Types [26..37]: one column per UnitType in enum order; the ALL column is set
+# only when every tribe bit is present.
+_ALL_TYPES_MASK = UNIT_TYPE_BITS[UnitType.ALL]
+_TYPE_ROWS = np.zeros((_ALL_TYPES_MASK + 1, len(UnitType)), dtype=np.float32)
+for _i, _ut in enumerate(UnitType):
+    _bit = UNIT_TYPE_BITS[_ut]
+    _TYPE_ROWS[:, _i] = (np.arange(_ALL_TYPES_MASK + 1) & _bit) == _bit
+
+# Engine legal-action bits -> bool mask: (bits >> i) & 1 for every action id
+_ACTION_SHIFTS = np.arange(NUM_ACTIONS, dtype=np.int64)
+
+# Entity slots in the observation: Board(7) + Hand(10) + Store(7) + Discover(3),
+# contiguous from offset 7.  First slot of each zone:
+_SLOT_BOARD, _SLOT_HAND, _SLOT_STORE, _SLOT_DISCOVER, _NUM_SLOTS = 0, 7, 17, 24, 27
+
+# "flat": Box(1036) float32; "compact": dict of int16 / uint8 / float16 arrays
+OBS_MODES = ("flat", "compact")
+
+# Observation zones (bits): engine ZONE_HAND / ZONE_BOARD / ZONE_STORE + discover options
+OBS_ZONE_DISCOVER = 16
+OBS_ZONE_ALL = ZONE_HAND | ZONE_BOARD | ZONE_STORE | OBS_ZONE_DISCOVER
+
+# Zones whose *contents* a successful action can change (ACTION_ZONES in actions.py
+# tracks sizes for the legal mask; here stats / frozen flags matter too).  Other
+# actions (SELL, PLAY, DISCOVER_CHOICE, END_TURN) run card effects that can touch
+# anything and re-encode every zone.  A size change in any zone (triplet on BUY)
+# is picked up from mask_stamp() on top of this.
+OBS_ACTION_ZONES: Dict[str, int] = {
+    "ROLL": ZONE_STORE,  # TAVERN_REFRESHED / MINION_ADDED_TO_SHOP effects buff the shop only
+    "BUY": ZONE_STORE | ZONE_HAND,
+    "UPGRADE": 0,
+    "FREEZE": ZONE_STORE,
+    "SWAP": ZONE_BOARD,  # + board auras
+    "WAIT_FOR_TARGET": ZONE_HAND,  # Is Selected column
+    "CANCEL_CAST": ZONE_HAND,
+}
+
+# Divisors of the per-instance scalar columns [3..7]: cost, tier, frozen, atk, hp
+_DYNAMIC_SCALE = np.array([MAX_COST, MAX_TIER, 1.0, MAX_ATK, MAX_HP])
+_REC_SIZE = 9
+
+_ENTITY_TEMPLATES: Optional[np.ndarray] = None
+
+# MC-oracle worker threads, shared by every env of the process.  fast_combat_batch
+# releases the GIL, so the C++ combats run while the env returns its observation
+# and the agent picks the next action.
+_ORACLE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _oracle_executor() -> ThreadPoolExecutor:
+    global _ORACLE_EXECUTOR
+    if _ORACLE_EXECUTOR is None:
+        _ORACLE_EXECUTOR = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="hs-oracle"
+        )
+    return _ORACLE_EXECUTOR
+
+
+def _drop_oracle_executor() -> None:
+    # A forked child inherits the executor but not its worker threads: submitted
+    # work would never run.  The child builds its own pool on first use.
+    global _ORACLE_EXECUTOR
+    _ORACLE_EXECUTOR = None
+
+
+if hasattr(os, "register_at_fork"):  # not on Windows
+    os.register_at_fork(after_in_child=_drop_oracle_executor)
+
+
+def _oracle_winrate(
+    combat: CombatManager, side0: Player, side1: Player, seed: int, n_combats: int
+) -> float:
+    """Run n_combats of two combat snapshots (C++ engine when loaded), return
+    side0's winrate [0, 1]."""
+    outcomes, _ = combat.simulate_many(side0, side1, n_combats, seed=seed)
+    return float(np.count_nonzero(outcomes == BattleOutcome.WIN.value)) / n_combats
+
+
+def entity_templates(
+    static_id_map: Dict[str, int], num_card_ids: int, entity_features: int
+) -> np.ndarray:
+    """Static part of every entity vector, one float32 row per (kind, card id).
+
+    Rows [0, num_card_ids) — unit with static id i, rows [num_card_ids, 2 * num_card_ids)
+    — spell with static id i; row 0 of each half is an unknown card_id.  Filled
+    columns: present, is_spell, id, token, deathrattle, trigger flags.  Per-instance
+    columns (cost, tier, frozen, atk/hp, keywords, golden, types, selected) stay 0.
+    Built once per process: CARD_DB / SPELL_DB are static."""
+    global _ENTITY_TEMPLATES
+    table = _ENTITY_TEMPLATES
+    if table is not None and table.shape == (2 * num_card_ids, entity_features):
+        return table
+    triggers = trigger_flags()
+    table = np.zeros((2 * num_card_ids, entity_features), dtype=np.float32)
+    units = table[:num_card_ids]
+    spells = table[num_card_ids:]
+    units[:, 0] = 1.0
+    spells[:, 0] = 1.0
+    spells[:, 1] = 1.0
+    spells[:, 20] = 1.0  # spell = has battlecry
+    for cid, i in static_id_map.items():
+        db_data: dict[str, Any] = CARD_DB.get(cid, {})
+        units[i, 2] = spells[i, 2] = float(i)  # raw int for nn.Embedding
+        units[i, 18] = 1.0 if db_data.get("is_token", False) else 0.0
+        units[i, 19] = 1.0 if db_data.get("deathrattle", False) else 0.0
+        units[i, 20:25] = triggers.get(cid, NO_TRIGGER_FLAGS)
+    _ENTITY_TEMPLATES = table
+    return table
+
 
 class HearthstoneEnv(gym.Env[np.ndarray, int]):
     """
@@ -49,10 +197,26 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
     26: 0<->1, 27: 1<->2 ... 31: 5<->6
     """
 
-    def __init__(self, max_tier: int = 6) -> None:
+    def __init__(
+        self,
+        max_tier: int = 6,
+        obs_mode: str = "flat",
+        oracle_n_combats: int = 20,
+        oracle_async: bool = True,
+        perf_stats: bool = False,
+    ) -> None:
+        """oracle_n_combats — combats per MC-oracle evaluation, C++ engine when loaded,
+        Python engine otherwise (0 disables the oracle); oracle_async — run the END_TURN evaluation on a background thread
+        and collect it when the winrate is next needed; perf_stats — per-phase
+        step/reset timers, read with get_perf_stats() (env/perf_stats.py)."""
         super(HearthstoneEnv, self).__init__()
 
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"obs_mode must be one of {OBS_MODES}, got {obs_mode!r}")
+        if oracle_n_combats < 0:
+            raise ValueError(f"oracle_n_combats must be >= 0, got {oracle_n_combats}")
         self._max_tier = max_tier
+        self.obs_mode = obs_mode
 
         all_ids = sorted(list(CARD_DB.keys()) + list(SPELL_DB.keys()))
 
@@ -82,12 +246,13 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         self._ghost_ratio: float = 0.8  # probability of using ghost vs bot
         self._env_id: int = id(self)  # unique per env instance
 
-        # MC Oracle: C++ engine as dense reward oracle
-        self._oracle_n_combats: int = 20
+        # MC Oracle: combat simulations as dense reward oracle
+        self._oracle_n_combats: int = oracle_n_combats
+        self._oracle_async: bool = oracle_async
         self._oracle_cached_wr: float = 0.5
-        self._oracle_seed: int = random.getrandbits(32)
-        self._oracle_ghost_cpp: list | None = None  # cached C++ tuples for ghost board
-        self._oracle_ghost_tier: int = 1
+        self._oracle_pending: Optional[Future[float]] = None  # END_TURN eval in flight
+        self._oracle_seed: int = self.game.rng.getrandbits(32)
+        self._oracle_ghost: Optional[Player] = None  # combat snapshot of the ghost board
 
         self.all_types = list(UnitType)
         self.num_types = len(self.all_types)  # 11
@@ -131,6 +296,12 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         self.observation_space = spaces.Box(
             low=0, high=MAX_CARDS_IN_GAME, shape=(total_obs_size,), dtype=np.float32
         )
+        # "compact": the same observation as int16 ids / packed flags / float16
+        # stats (env/compact_obs.py), converted from the flat buffer per call
+        self._compact_buffer: Optional[CompactObs] = None
+        if obs_mode == "compact":
+            self.observation_space = compact_space(self.num_card_ids)
+            self._compact_buffer = empty_compact()
 
         # Pre-allocated buffers (avoid per-step allocations)
         self._obs_buffer = np.zeros(total_obs_size, dtype=np.float32)
@@ -145,33 +316,77 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         self._off_discover = 7 + (7 + 10 + 7) * self.entity_features
         self._off_enemy = 7 + (7 + 10 + 7 + 3) * self.entity_features
 
-        # Pre-compute trigger info per card_id (avoids per-entity lookup)
-        self._trigger_cache: dict[str, tuple[bool, bool, bool, bool, bool]] = {}
-        for cid, triggers in TRIGGER_REGISTRY.items():
-            bc = eot = soc = sell = syn = False
-            for trig_def in triggers:
-                evt = trig_def.event_type
-                cond_name = trig_def.condition.__name__
-                if evt == EventType.MINION_PLAYED:
-                    if cond_name == "_is_self_play":
-                        bc = True
-                    else:
-                        syn = True
-                elif evt == EventType.MINION_SUMMONED:
-                    syn = True
-                elif evt == EventType.END_OF_TURN:
-                    eot = True
-                elif evt == EventType.START_OF_COMBAT:
-                    soc = True
-                elif evt == EventType.MINION_SOLD:
-                    sell = True
-            self._trigger_cache[cid] = (bc, eot, soc, sell, syn)
-        self._default_triggers = (False, False, False, False, False)
+        # Trigger info per card_id (avoids per-entity lookup); disk-cached table,
+        # so constructing the env doesn't build TRIGGER_REGISTRY
+        self._trigger_cache: dict[str, tuple[bool, bool, bool, bool, bool]] = trigger_flags()
+        self._default_triggers = NO_TRIGGER_FLAGS
+        # Static entity columns per card: obs encoding copies rows, then writes
+        # the per-instance columns zone-wide (see _encode_zones)
+        self._entity_templates = entity_templates(
+            self.static_id_map, self.num_card_ids, self.entity_features
+        )
 
         self.is_targeting: bool = False
         self.pending_spell_hand_index: Optional[int] = None
         self.pending_target_kind: Optional[str] = None  # "SPELL" | "MAGNETIZE"
 
+        # reset()/step() return the next action mask as info["action_mask"], so a
+        # vector env delivers obs + mask in one round trip (no call("action_masks"))
+        self.mask_in_info: bool = True
+
+        # step() re-encodes only the zones its action could change; debug_obs
+        # compares every such observation with a full re-encode (HS_DEBUG_OBS=1)
+        self.debug_obs: bool = os.environ.get("HS_DEBUG_OBS") == "1"
+        self._obs_player: Optional[int] = None  # whose zones the buffer holds
+        self._obs_stamp: tuple = ()  # mask_stamp() of that player at encoding time
+
+        # (p0 hp, p1 hp, truncated) of an END_TURN step awaiting its enemy turn
+        self._end_turn_state: tuple = ()
+
+        self._perf: Optional[PerfStats] = None
+        if perf_stats:
+            self._install_perf_hooks()
+
+    def _install_perf_hooks(self, perf: Optional[PerfStats] = None) -> None:
+        """Replace the phase methods of this instance (and of self.game, kept across
+        resets by Game.reset) with PerfStats timing wrappers.
+
+        ``perf`` — timers of the env that owns self.game (a self-play seat): only
+        this instance's methods are wrapped, and its get_perf_stats() stays {}
+        so the shared timers are reported once."""
+        if perf is None:
+            perf = self._perf = PerfStats()
+            self.game.step = perf.wrap("engine_step", self.game.step)
+            self.game._resolve_combat_phase = perf.wrap(
+                "combat", self.game._resolve_combat_phase
+            )
+        for phase, name in (
+            ("step", "_step_agent"),
+            ("reset", "reset"),
+            ("auto_position", "_auto_position_board"),
+            ("ghost_record", "_record_ghost_turn"),
+            ("enemy_turn", "_play_enemy_turn"),
+            ("end_turn", "_finish_end_turn"),
+            ("oracle", "_oracle_submit"),
+            ("oracle", "_oracle_collect"),
+            ("get_obs", "_get_obs"),
+            ("action_masks", "action_masks"),
+        ):
+            setattr(self, name, perf.wrap(phase, getattr(self, name)))
+
+    def get_perf_stats(self, reset: bool = True) -> dict[str, int]:
+        """Exclusive ns and call count per phase (perf_stats.PERF_PHASES) since the
+        last call; {} unless the env was created with perf_stats=True."""
+        if self._perf is None:
+            return {}
+        return self._perf.take(reset)
+
+    def _step_info(self) -> dict[str, object]:
+        # Живой буфер маски: AsyncVectorEnv его пиклит, SyncVectorEnv копирует в батч
+        if not self.mask_in_info:
+            return {}
+        return {"action_mask": self.action_masks()}
+
     def set_ghost_pool(self, pool: GhostPool) -> None:
         """Set shared ghost pool (called once at env creation)."""
         self.ghost_pool = pool
@@ -188,17 +403,21 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
     ) -> tuple[np.ndarray, dict[str, object]]:
         super().reset(seed=seed)
 
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-
         # Finish previous game's ghost recording
         if self.ghost_pool is not None:
             self.ghost_pool.finish_game(self._env_id)
             self.ghost_pool.finish_game(self._env_id + 1_000_000)  # bot
 
-        self.game = Game(max_tier=self._max_tier)
+        # Сид игры из np_random среды (gymnasium): reset(seed) воспроизводим,
+        # глобальные random / np.random не трогаем — envs в одном процессе независимы.
+        # Game.reset() переиспользует пул и менеджеры: то же состояние, что новый Game(seed)
+        self.game.reset(seed=int(self.np_random.integers(1 << 63)))
+        self._reset_seat()
+        return self._get_obs(), self._step_info()
 
+    def _reset_seat(self) -> None:
+        """Per-agent episode state on top of a freshly reset self.game (also used by
+        SelfPlayVectorEnv for the seat that shares its partner's Game)."""
         self.steps_taken = 0
         self.actions_in_turn = 0
         self.is_targeting = False
@@ -210,16 +429,17 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
             self._use_ghost
             and self.ghost_pool is not None
             and self.ghost_pool.size > 0
-            and random.random() < self._ghost_ratio
+            and self.game.rng.random() < self._ghost_ratio
         ):
-            self._ghost_trajectory = self.ghost_pool.sample_trajectory()
+            self._ghost_trajectory = self.ghost_pool.sample_trajectory(rng=self.game.rng)
 
-        # Reset MC Oracle state
+        # Reset MC Oracle state (a pending eval belongs to the previous episode)
+        if self._oracle_pending is not None:
+            self._oracle_pending.cancel()
+            self._oracle_pending = None
         self._oracle_cached_wr = 0.5
-        self._oracle_seed = random.getrandbits(32)
-        self._oracle_ghost_cpp = None
-
-        return self._get_obs(), {}
+        self._oracle_seed = self.game.rng.getrandbits(32)
+        self._oracle_ghost = None
 
     def set_opponent(self, model: MaskablePPO) -> None:
         self.opponent_model = model
@@ -234,12 +454,25 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         return self._calculate_board_power(player)
 
     def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict[str, object]]:
+        result = self._step_agent(action)
+        if result is None:
+            self._play_enemy_turn()
+            result = self._finish_end_turn()
+        return result
+
+    def _step_agent(
+        self, action: int
+    ) -> Optional[tuple[np.ndarray, float, bool, bool, dict[str, object]]]:
+        """The agent's part of step(): the full step result, or None after a
+        successful END_TURN — then the enemy turn is due (_play_enemy_turn or
+        play_enemy_turns) and _finish_end_turn() returns the result."""
         self.steps_taken += 1
         self.actions_in_turn += 1
         truncated = (self.game.turn_count > 50) or (self.steps_taken >= self.max_steps_per_episode)
 
         player = self.game.players[self.my_player_id]
         is_discovering = player.is_discovering
+        targeting = self.is_targeting
         # === ACTION MAPPING ===
         action_type: str = "UNKNOWN"
         kwargs: dict[str, int] = {}
@@ -252,7 +485,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
             else:
                 action_type = "INVALID_DURING_DISCOVERY"
 
-        elif self.is_targeting:
+        elif targeting:
             if 2 <= action <= 8:
                 action_type = "PLAY"
                 kwargs["hand_index"] = (
@@ -272,17 +505,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
             else:
                 action_type = "INVALID_NEED_TARGET"
         else:
-            if action == 0:
-                action_type = "END_TURN"
-            elif action == 1:
-                action_type = "ROLL"
-            elif 2 <= action <= 8:
-                action_type = "BUY"
-                kwargs["index"] = action - 2
-            elif 9 <= action <= 15:
-                action_type = "SELL"
-                kwargs["index"] = action - 9
-            elif 16 <= action <= 25:
+            if 16 <= action <= 25:
                 h_idx = action - 16
                 if h_idx < len(player.hand):
                     card = player.hand[h_idx]
@@ -296,7 +519,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
                         self.is_targeting = True
                         action_type = "WAIT_FOR_TARGET"
                     elif card.unit and card.unit.has_magnetic:
-                        has_mech = any(UnitType.MECH in u.types for u in player.board)
+                        has_mech = any(u.has_type(UnitType.MECH) for u in player.board)
                         if has_mech:
                             self.is_targeting = True
                             self.pending_target_kind = "MAGNETIZE"
@@ -312,74 +535,97 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
                         kwargs["insert_index"] = -1
                 else:
                     action_type = "INVALID_HAND_INDEX"
-            elif 26 <= action <= 31:
-                action_type = "SWAP"
-                idx_a = action - 26
-                idx_b = idx_a + 1
-                kwargs["index_a"] = idx_a
-                kwargs["index_b"] = idx_b
-            elif action == 32:
-                action_type = "UPGRADE"
-            elif action == 33:
+            elif action == FREEZE_END_TURN:
                 self.game.step(self.my_player_id, "FREEZE")
                 action_type = "END_TURN"
+            else:
+                action_type, kwargs = ACTION_TABLE[action]
 
         p0_hp_before = player.health
         p1_hp_before = self.game.players[self.enemy_id].health
 
-        # Engine run
+        # Zone sizes before the action; if they differ from the last encoded
+        # observation, the state was changed outside step() — re-encode everything
+        stamp = mask_stamp(player)
+        stale = stamp != self._obs_stamp
 
-        if action_type == "WAIT_FOR_TARGET":
-            return self._get_obs(), 0.0, False, truncated, {}
+        # Engine run
 
-        elif action_type == "CANCEL_CAST":
-            return self._get_obs(), 0.0, False, truncated, {}
+        if action_type == "WAIT_FOR_TARGET" or action_type == "CANCEL_CAST":
+            dirty = OBS_ZONE_ALL if stale else OBS_ACTION_ZONES[action_type]
+            return self._get_obs(dirty=dirty), 0.0, False, truncated, self._step_info()
 
         success, done, _ = self.game.step(self.my_player_id, action_type, **kwargs)
 
         if not success:
-            return self._get_obs(), 0.0, self.game.game_over, truncated, {}
+            # Failed actions leave the game as is; a cleared targeting state
+            # (failed PLAY on a target) only changes the hand's Is Selected column
+            dirty = OBS_ZONE_ALL if stale else (ZONE_HAND if targeting else 0)
+            obs = self._get_obs(dirty=dirty)
+            return obs, 0.0, self.game.game_over, truncated, self._step_info()
 
         # === REWARD: Round Outcome + Action Penalty + Terminal ===
         reward: float = -0.005  # action penalty
 
         if action_type == "END_TURN":
-            reward = 0.0  # END_TURN itself is free
             self.actions_in_turn = 0
 
             self._auto_position_board(player)
 
-            if self.ghost_pool is not None:
-                self.ghost_pool.record_turn(self._env_id, self.game.turn_count, player)
-
-            self._play_enemy_turn()
-            done = self.game.game_over
+            self._record_ghost_turn(self._env_id, player)
+
+            self._end_turn_state = (p0_hp_before, p1_hp_before, truncated)
+            return None
+
+        dirty = OBS_ZONE_ALL if stale else OBS_ACTION_ZONES.get(action_type, OBS_ZONE_ALL)
+        if dirty != OBS_ZONE_ALL:
+            zones = stamp_zones(stamp, mask_stamp(player))
+            dirty |= OBS_ZONE_ALL if zones == ZONE_ALL else zones & OBS_ZONE_ALL
+            if targeting:
+                dirty |= ZONE_HAND
+        return self._get_obs(dirty=dirty), reward, done, truncated, self._step_info()
+
+    def _finish_end_turn(
+        self, hp_before: Optional[tuple[int, int]] = None
+    ) -> tuple[np.ndarray, float, bool, bool, dict[str, object]]:
+        """Reward and observation of an END_TURN step once the enemy turn (and the
+        combat it triggers) has been played.
+
+        ``hp_before`` = (own, enemy) hero health to measure the round against;
+        by default the health at this env's END_TURN."""
+        p0_hp_before, p1_hp_before, truncated = self._end_turn_state
+        if hp_before is not None:
+            p0_hp_before, p1_hp_before = hp_before
+        player = self.game.players[self.my_player_id]
+        reward: float = 0.0  # END_TURN itself is free
+        done = self.game.game_over
 
-            p0_hp_after = self.game.players[self.my_player_id].health
-            p1_hp_after = self.game.players[self.enemy_id].health
+        p0_hp_after = player.health
+        p1_hp_after = self.game.players[self.enemy_id].health
 
-            damage_dealt = p1_hp_before - p1_hp_after
-            damage_taken = p0_hp_before - p0_hp_after
+        damage_dealt = p1_hp_before - p1_hp_after
+        damage_taken = p0_hp_before - p0_hp_after
 
-            # Round outcome: +1/-1
-            if damage_dealt > damage_taken:
-                reward += 1.0
-            elif damage_taken > damage_dealt:
-                reward -= 1.0
+        # Round outcome: +1/-1
+        if damage_dealt > damage_taken:
+            reward += 1.0
+        elif damage_taken > damage_dealt:
+            reward -= 1.0
 
-            # Terminal: game win/loss
-            if done:
-                if p0_hp_after > 0:
-                    reward += 100.0
-                else:
-                    reward -= 100.0
+        # Terminal: game win/loss
+        if done:
+            if p0_hp_after > 0:
+                reward += 100.0
+            else:
+                reward -= 100.0
 
-            # Prepare oracle for next turn (cache ghost board)
-            if not done:
-                self._oracle_prepare_ghost()
-                self._oracle_cached_wr = self._oracle_eval_winrate(player)
+        # Prepare oracle for next turn (cache ghost board); the winrate is
+        # computed in the background and collected by _oracle_collect()
+        if not done:
+            self._oracle_prepare_ghost()
+            self._oracle_submit(player)
 
-        return self._get_obs(), reward, done, truncated, {}
+        return self._get_obs(), reward, done, truncated, self._step_info()
 
     def _auto_position_board(self, player: Player) -> None:
         """
@@ -453,56 +699,58 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         return power
 
     # ================================================================
-    # MC Oracle: use C++ combat engine as dense reward signal (PBRS)
+    # MC Oracle: combat simulations as dense reward signal (PBRS)
     # ================================================================
 
-    @staticmethod
-    def _unit_to_cpp(unit: Unit) -> tuple:
-        """Convert Unit → C++ tuple. Mirrors CombatManager._unit_to_cpp."""
-        cpp_types = 0
-        for t in unit.types:
-            cpp_types |= TYPE_TO_BIT.get(t, 0)
-        cpp_tags = 0
-        for tag in unit.tags:
-            cpp_tags |= TAG_TO_BIT.get(tag, 0)
-        return (
-            CARD_ID_MAP.get(unit.card_id, 0),
-            unit.cur_atk, unit.cur_hp,
-            cpp_types, cpp_tags,
-            unit.tier, unit.is_golden,
-        )
-
     def _oracle_prepare_ghost(self) -> None:
-        """Cache C++ tuples for the current ghost board (called once per turn)."""
+        """Snapshot the current ghost board for combats (called once per turn)."""
         enemy = self.game.players[self.enemy_id]
-        if enemy.board:
-            self._oracle_ghost_cpp = [self._unit_to_cpp(u) for u in enemy.board]
-            self._oracle_ghost_tier = enemy.tavern_tier
-        else:
-            self._oracle_ghost_cpp = None
+        self._oracle_ghost = enemy.combat_copy().sim_copy() if enemy.board else None
+
+    def _oracle_args(self, player: Player) -> Optional[tuple]:
+        """Snapshot of everything the simulation needs, or None if the oracle is inert.
+        Advances the oracle seed, so sync and async runs see the same combats.
+        sim_copy() also detaches the hand units: the worker never reads live objects."""
+        n = self._oracle_n_combats
+        if n == 0 or not player.board or self._oracle_ghost is None:
+            return None
+        seed = self._oracle_seed
+        self._oracle_seed += n
+        return (self.game.combat, player.combat_copy().sim_copy(), self._oracle_ghost, seed, n)
 
     def _oracle_eval_winrate(self, player: Player) -> float:
-        """Run N combats via C++ engine, return winrate [0, 1]."""
-        cpp = get_cpp_engine()
-        if cpp is None or not player.board or self._oracle_ghost_cpp is None:
+        """Run N combats via CombatManager.simulate_many, return winrate [0, 1]."""
+        args = self._oracle_args(player)
+        if args is None:
             return 0.5
+        return _oracle_winrate(*args)
+
+    def _oracle_submit(self, player: Player) -> None:
+        """Start the END_TURN evaluation that becomes the next _oracle_cached_wr.
+
+        Combat snapshots are taken here, on the env thread; the worker only runs
+        the combats.  Synchronous when oracle_async is off."""
+        self._oracle_collect()
+        args = self._oracle_args(player)
+        if args is None:
+            self._oracle_cached_wr = 0.5
+        elif self._oracle_async:
+            self._oracle_pending = _oracle_executor().submit(_oracle_winrate, *args)
+        else:
+            self._oracle_cached_wr = _oracle_winrate(*args)
 
-        side0 = [self._unit_to_cpp(u) for u in player.board]
-        results = cpp.fast_combat_batch(
-            side0, self._oracle_ghost_cpp,
-            self._oracle_seed, self._oracle_n_combats,
-            tavern_tier_0=player.tavern_tier,
-            tavern_tier_1=self._oracle_ghost_tier,
-        )
-        self._oracle_seed += self._oracle_n_combats
-
-        wins = sum(1 for outcome, _ in results if outcome == 2)  # 2 = WIN for side0
-        return wins / len(results)
+    def _oracle_collect(self) -> float:
+        """Cached winrate, waiting for the pending evaluation if there is one."""
+        if self._oracle_pending is not None:
+            self._oracle_cached_wr = self._oracle_pending.result()
+            self._oracle_pending = None
+        return self._oracle_cached_wr
 
     def _oracle_reward(self, player: Player) -> float:
         """Compute PBRS reward: delta winrate after action × scale."""
+        wr_before = self._oracle_collect()
         wr_after = self._oracle_eval_winrate(player)
-        delta = wr_after - self._oracle_cached_wr
+        delta = wr_after - wr_before
         self._oracle_cached_wr = wr_after
         return delta * 10.0
 
@@ -530,12 +778,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         # === ES BOT (parametric heuristic) ===
         if self._es_bot_weights is not None:
             es_bot_turn(self.game, p_idx, self._es_bot_weights)
-            if self.ghost_pool is not None:
-                self.ghost_pool.record_turn(
-                    self._env_id + 1_000_000,
-                    self.game.turn_count,
-                    enemy,
-                )
+            self._record_ghost_turn(self._env_id + 1_000_000, enemy)
             return
 
         # === SMART BOT (default) ===
@@ -543,15 +786,20 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
 
         # Record bot's board too — bots build decent boards from step 0,
         # so ghost pool gets quality data immediately for faster ramp-up.
+        self._record_ghost_turn(self._env_id + 1_000_000, enemy)  # separate namespace
+
+    def _record_ghost_turn(self, game_key: int, player: Player) -> None:
         if self.ghost_pool is not None:
-            self.ghost_pool.record_turn(
-                self._env_id + 1_000_000,  # separate namespace
-                self.game.turn_count,
-                enemy,
-            )
+            self.ghost_pool.record_turn(game_key, self.game.turn_count, player)
 
     def _neural_enemy_turn(self, p_idx: int) -> None:
         """Legacy neural self-play. Kept as fallback."""
+        _run_neural_turns(self.opponent_model, [self._neural_enemy_actions(p_idx)])
+
+    def _neural_enemy_actions(self, p_idx: int) -> Generator[tuple[Any, np.ndarray], int, None]:
+        """Neural enemy turn as a coroutine: yields (obs, masks) of p_idx and
+        receives the chosen action; returns after the enemy's END_TURN.
+        play_enemy_turns() drives many of these with one batched predict()."""
         player = self.game.players[p_idx]
         self.is_targeting = False
         self.pending_spell_hand_index = None
@@ -561,14 +809,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         for _ in range(max_actions):
             obs = self._get_obs(player_idx=p_idx)
             masks = self.action_masks(player_idx=p_idx)
-
-            import torch
-
-            with torch.no_grad():
-                raw_action, _ = self.opponent_model.predict(
-                    obs, action_masks=masks, deterministic=False
-                )
-            action: int = int(raw_action)
+            action: int = yield obs, masks
 
             if action == 0:
                 if self.is_targeting:
@@ -609,7 +850,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
                         self.pending_target_kind = "SPELL"
                         continue
                     if card.unit and card.unit.has_magnetic:
-                        has_mech = any(UnitType.MECH in u.types for u in player.board)
+                        has_mech = any(u.has_type(UnitType.MECH) for u in player.board)
                         if has_mech:
                             self.pending_spell_hand_index = h_idx
                             self.is_targeting = True
@@ -622,16 +863,8 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         self.pending_spell_hand_index = None
 
     def _decode_action_for_engine(self, action: int) -> tuple[str, dict[str, int]]:
-        if action == 1:
-            return "ROLL", {}
-        if 2 <= action <= 8:
-            return "BUY", {"index": action - 2}
-        if 9 <= action <= 15:
-            return "SELL", {"index": action - 9}
-        if 16 <= action <= 25:
-            return "PLAY", {"hand_index": action - 16, "insert_index": -1}
-        if 26 <= action <= 31:
-            return "SWAP", {"index_a": action - 26, "index_b": action - 26 + 1}
+        if 1 <= action < FREEZE_END_TURN:
+            return ACTION_TABLE[action]
         return "UNKNOWN", {}
 
     def _simple_bot_turn(self, p_idx: int) -> None:
@@ -659,7 +892,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         it = 0
         while player.gold >= 3 and player.store and it < 5:
             it += 1
-            idx = random.randint(0, len(player.store) - 1)
+            idx = self.game.rng.randint(0, len(player.store) - 1)
             self.game.step(p_idx, "BUY", index=idx)
 
             if player.hand:
@@ -669,14 +902,24 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
 
         self.game.step(p_idx, "END_TURN")
 
-    def _get_obs(self, player_idx: int | None = None) -> np.ndarray:
+    def _get_obs(
+        self, player_idx: int | None = None, dirty: int = OBS_ZONE_ALL
+    ) -> np.ndarray | CompactObs:
+        """Observation of player_idx (default: the agent) in self._obs_buffer.
+
+        ``dirty`` — OBS_ZONE_* bits of the zones to re-encode; the others keep
+        what the buffer holds from the previous call.  Only step() passes less
+        than OBS_ZONE_ALL, and only for the player encoded last time."""
         p_id = self.my_player_id if player_idx is None else player_idx
         e_id = 1 - p_id
 
         p = self.game.players[p_id]
         e = self.game.players[e_id]
         buf = self._obs_buffer
-        buf[:] = 0.0  # fast zero-fill
+        if p_id != self._obs_player:
+            dirty = OBS_ZONE_ALL
+        self._obs_player = p_id
+        self._obs_stamp = mask_stamp(p)
 
         # 1. Global (7) — direct write
         buf[0] = p.gold / MAX_GOLD
@@ -687,13 +930,9 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         buf[5] = 1.0 if p.is_discovering else 0.0
         buf[6] = 1.0 if self.is_targeting else 0.0
 
-        # 2. Zones — write directly into buffer
-        self._encode_zone_fast(p.board, buf, self._off_board, 7, "BOARD")
-        self._encode_zone_fast(p.hand, buf, self._off_hand, 10, "HAND")
-        self._encode_zone_fast(p.store, buf, self._off_store, 7, "STORE")
-
-        discover_items = p.discovery.options if p.is_discovering else []
-        self._encode_zone_fast(discover_items, buf, self._off_discover, 3, "DISCOVER")
+        # 2. Zones — template rows + vectorized dynamic columns
+        if dirty:
+            self._encode_zones(p, buf, dirty)
 
         # 3. Enemy (3)
         off = self._off_enemy
@@ -701,8 +940,94 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
         buf[off + 1] = e.tavern_tier / MAX_TIER
         buf[off + 2] = len(e.board) / 7.0
 
+        if self.debug_obs and dirty != OBS_ZONE_ALL:
+            self._check_obs(p, buf)
+        if self._compact_buffer is not None:
+            return to_compact(buf, self._compact_buffer)
         return buf
 
+    def _check_obs(self, p: Player, buf: np.ndarray) -> None:
+        """debug_obs: the incrementally updated zones must equal a full re-encode."""
+        full = buf.copy()
+        self._encode_zones(p, full, OBS_ZONE_ALL)
+        if np.array_equal(full, buf):
+            return
+        ef = self.entity_features
+        stale = np.flatnonzero((full != buf)[self._off_board : self._off_enemy]) // ef
+        raise RuntimeError(f"Stale observation: entity slots {sorted(set(stale.tolist()))}")
+
+    def _encode_zones(self, p: Player, buf: np.ndarray, zones: int = OBS_ZONE_ALL) -> None:
+        """Board/Hand/Store/Discover (OBS_ZONE_* bits in ``zones``) -> buf in one pass.
+
+        Same values as _encode_entity_fast per slot, but each present entity costs
+        one tuple: the rows are gathered from the template table and the
+        per-instance columns are written for all slots at once."""
+        ef = self.entity_features
+        slots = buf[self._off_board : self._off_enemy].reshape(_NUM_SLOTS, ef)
+        id_map = self.static_id_map
+        spell_base = self.num_card_ids
+        discover_items = p.discovery.options if p.is_discovering else ()
+        zone_list: tuple[tuple[int, Any, int], ...]
+        if zones == OBS_ZONE_ALL:
+            zone_list = (
+                (_SLOT_BOARD, p.board, 7),
+                (_SLOT_HAND, p.hand, 10),
+                (_SLOT_STORE, p.store, 7),
+                (_SLOT_DISCOVER, discover_items, 3),
+            )
+            slots[:] = 0.0
+        else:
+            zone_list = tuple(
+                (first, items, n_slots)
+                for bit, first, items, n_slots in (
+                    (ZONE_BOARD, _SLOT_BOARD, p.board, 7),
+                    (ZONE_HAND, _SLOT_HAND, p.hand, 10),
+                    (ZONE_STORE, _SLOT_STORE, p.store, 7),
+                    (OBS_ZONE_DISCOVER, _SLOT_DISCOVER, discover_items, 3),
+                )
+                if zones & bit
+            )
+            for first, _, n_slots in zone_list:
+                slots[first : first + n_slots] = 0.0
+
+        # Flat records of _REC_SIZE ints per present entity:
+        # slot, template row, cost, tier, frozen, atk, hp, tag_mask | golden bit, type_mask
+        recs: list[int] = []
+        extend = recs.extend
+        for first, items, n_slots in zone_list:
+            for i in range(min(len(items), n_slots)):
+                item = items[i]
+                if isinstance(item, Unit):
+                    unit, spell, frozen = item, None, False
+                else:
+                    unit, spell = item.unit, item.spell
+                    frozen = item.is_frozen if isinstance(item, StoreItem) else False
+                if unit is not None:
+                    row = id_map.get(unit.card_id, 0)
+                    kw = unit.tag_mask | unit.is_golden << _GOLDEN_SHIFT
+                    extend(
+                        (first + i, row, 3, unit.tier, frozen, unit.cur_atk, unit.cur_hp)
+                        + (kw, unit.type_mask)
+                    )
+                elif spell is not None:
+                    row = spell_base + id_map.get(spell.card_id, 0)
+                    extend((first + i, row, spell.cost, spell.tier, frozen, 0, 0, 0, 0))
+        if not recs:
+            return
+
+        a = np.array(recs, dtype=np.int64).reshape(-1, _REC_SIZE)
+        rows = self._entity_templates[a[:, 1]]
+        rows[:, 3:8] = a[:, 2:7] / _DYNAMIC_SCALE
+        rows[:, 8:18] = _KEYWORD_GOLDEN_ROWS[a[:, 7]]
+        rows[:, 26:] = _TYPE_ROWS[a[:, 8]]
+        slots[a[:, 0]] = rows
+
+        # Is Selected (targeting source in hand)
+        sel = self.pending_spell_hand_index
+        if zones & ZONE_HAND and self.is_targeting and sel is not None and 0 <= sel < 10:
+            if slots[_SLOT_HAND + sel, 0]:
+                slots[_SLOT_HAND + sel, 25] = 1.0
+
     def _encode_zone_fast(
         self,
         items: Sequence[Unit | HandCard | StoreItem],
@@ -751,15 +1076,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
             buf[off + 6] = unit.cur_atk / MAX_ATK
             buf[off + 7] = unit.cur_hp / MAX_HP
             # Keywords [8..16]
-            buf[off + 8] = 1.0 if unit.has_taunt else 0.0
-            buf[off + 9] = 1.0 if unit.has_divine_shield else 0.0
-            buf[off + 10] = 1.0 if unit.has_windfury else 0.0
-            buf[off + 11] = 1.0 if unit.has_poisonous else 0.0
-            buf[off + 12] = 1.0 if unit.has_venomous else 0.0
-            buf[off + 13] = 1.0 if unit.has_reborn else 0.0
-            buf[off + 14] = 1.0 if unit.has_cleave else 0.0
-            buf[off + 15] = 1.0 if unit.has_magnetic else 0.0
-            buf[off + 16] = 1.0 if unit.has_immediate_attack else 0.0
+            buf[off + 8 : off + 17] = _KEYWORD_ROWS[unit.tag_mask]
             buf[off + 17] = 1.0 if unit.is_golden else 0.0
             buf[off + 18] = 1.0 if db_data.get("is_token", False) else 0.0
             buf[off + 19] = 1.0 if db_data.get("deathrattle", False) else 0.0
@@ -776,13 +1093,9 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
                 and index_in_zone == self.pending_spell_hand_index
             ):
                 buf[off + 25] = 1.0
-            # Types [26..36]
-            types = unit.types
-            if types:
-                base = off + 26
-                for i, t_enum in enumerate(self.all_types):
-                    if t_enum in types:
-                        buf[base + i] = 1.0
+            # Types [26..37]
+            if unit.type_mask:
+                buf[off + 26 : off + 26 + self.num_types] = _TYPE_ROWS[unit.type_mask]
 
         elif spell is not None:
             buf[off + 0] = 1.0  # Is Present
@@ -829,15 +1142,8 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
             masks[0] = True  # Only End Turn
             return masks
 
-        # === 1. DISCOVERY PHASE ===
-        if player.is_discovering:
-            num_options = len(player.discovery.options)
-            for i in range(num_options):
-                masks[2 + i] = True
-            return masks
-
-        # === 2. TARGETING PHASE ===
-        if self.is_targeting:
+        # === 1. TARGETING PHASE === (env-only state; discovery has priority)
+        if self.is_targeting and not player.is_discovering:
             masks[0] = True  # Cancel cast
             # idx: 2 + i
             board_len = len(player.board)
@@ -845,7 +1151,7 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
             if self.pending_target_kind == "MAGNETIZE":
                 # only MECHS
                 for i in range(min(board_len, 7)):
-                    if UnitType.MECH in player.board[i].types:
+                    if player.board[i].has_type(UnitType.MECH):
                         masks[2 + i] = True
                         valid_targets += 1
             else:
@@ -857,46 +1163,11 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
                 masks[0] = False
             return masks
 
-        # === 3. DEFAULT PHASE ===
-
-        # [0] End Turn - always available
-        masks[0] = True
-
-        # [1] Roll - gold >= 1
-        if player.gold >= 1:
-            masks[1] = True
-
-        # BUY (2-8)
-        for i in range(7):
-            if i < len(player.store):
-                item = player.store[i]
-                cost = item.spell.cost - player.spell_discount if item.spell else 3
-                # hand overload
-                masks[2 + i] = (player.gold >= cost) and (len(player.hand) < 10)
-
-        # SELL (9-15)
-        for i in range(7):
-            masks[9 + i] = i < len(player.board)
-
-        # PLAY (16-25)
-        for i in range(10):
-            masks[16 + i] = self._can_play_card(player, i)
-
-        # SWAP (26-31)
-        for i in range(6):
-            masks[26 + i] = False  # positioning handled by auto_position / positioning module
-            # masks[26 + i] = (i + 1 < len(player.board))
-
-        # UPGRADE (32) — disabled if tavern already at max_tier
-        masks[32] = (
-            player.gold >= player.up_cost
-            and player.tavern_tier < 6
-            and player.tavern_tier < self._max_tier
-        )
-
-        # FREEZE_AND_END_TURN (33) — same availability as END_TURN
-        masks[33] = True
-
+        # === 2. DISCOVERY / DEFAULT PHASE === — engine-maintained bitmask, O(1)
+        bits = self.game.tavern.legal_actions(player)
+        # SWAP (26-31) off: positioning handled by auto_position / positioning module
+        bits &= ~SWAP_BITS
+        masks[:] = (bits >> _ACTION_SHIFTS) & 1
         return masks
 
     def _can_play_card(self, player: Player, card_index: int) -> bool:
@@ -935,3 +1206,66 @@ class HearthstoneEnv(gym.Env[np.ndarray, int]):
             return True
 
         return False
+
+
+def play_enemy_turns(envs: Sequence[HearthstoneEnv]) -> None:
+    """Enemy turns of envs whose _step_agent() returned None (agent ended its turn).
+
+    Ghost / bot turns run one after another.  Neural opponents (opponent_model)
+    advance in lockstep: one predict() over the stacked observations of all envs
+    sharing a model per decision, instead of up to 30 single-sample calls per env."""
+    neural: Dict[int, tuple[Any, list, list]] = {}
+    for env in envs:
+        if env._ghost_trajectory is None and env.opponent_model is not None:
+            model = env.opponent_model
+            _, turns, perfs = neural.setdefault(id(model), (model, [], []))
+            turns.append(env._neural_enemy_actions(env.enemy_id))
+            perfs.append(env._perf)
+        else:
+            env._play_enemy_turn()
+    for model, turns, perfs in neural.values():
+        _run_neural_turns(model, turns, perfs)
+
+
+def _run_neural_turns(
+    model: MaskablePPO, turns: list, perfs: Optional[Sequence[Optional[PerfStats]]] = None
+) -> None:
+    """Drive _neural_enemy_actions() coroutines in lockstep, one predict() per
+    decision for all of them.  MaskablePPO.predict() runs under torch.no_grad().
+
+    ``perfs`` — PerfStats of each turn's env (None = not timed): the resumes of
+    a turn and an equal share of each predict() go to its "enemy_turn" phase."""
+    timed = perfs is not None and any(perf is not None for perf in perfs)
+    if perfs is None:
+        perfs = [None] * len(turns)
+    pending = []
+    for turn, perf in zip(turns, perfs):
+        start, send = turn.__next__, turn.send
+        if perf is not None:
+            start = perf.wrap("enemy_turn", start)
+            send = perf.wrap("enemy_turn", send, count=False)
+        try:
+            pending.append((send, perf, *start()))
+        except StopIteration:
+            pass
+    while pending:
+        t0 = perf_counter_ns() if timed else 0
+        obs = [o for _, _, o, _ in pending]
+        if isinstance(obs[0], dict):
+            batch_obs: Any = {k: np.stack([o[k] for o in obs]) for k in obs[0]}
+        else:
+            batch_obs = np.stack(obs)
+        batch_masks = np.stack([m for _, _, _, m in pending])
+        actions, _ = model.predict(batch_obs, action_masks=batch_masks, deterministic=False)
+        if timed:
+            share = (perf_counter_ns() - t0) // len(pending)
+            for _, perf, _, _ in pending:
+                if perf is not None:
+                    perf.add("enemy_turn", share)
+        running = []
+        for (send, perf, _, _), action in zip(pending, np.asarray(actions).tolist()):
+            try:
+                running.append((send, perf, *send(int(action))))
+            except StopIteration:
+                pass
+        pending = running
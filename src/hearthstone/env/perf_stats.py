@@ -0,0 +1,102 @@
+"""
+perf_stats.py — opt-in per-phase timers for HearthstoneEnv.step() / reset().
+
+HearthstoneEnv(perf_stats=True) wraps the methods that make up a step on the
+instance (bound method -> timing closure), so a disabled env runs the plain
+methods: no flag checks, no timer calls.
+
+Times are exclusive, in perf_counter_ns: a phase running inside another one
+(combat inside the enemy's END_TURN engine step, engine steps inside the bot
+turn, _get_obs inside the neural enemy turn) is subtracted from the outer
+phase.  Batched neural enemy turns (play_enemy_turns) charge each env its
+coroutine resumes plus an equal share of every batched predict().
+"step" / "reset" / "end_turn" is what is left of _step_agent / reset /
+_finish_end_turn itself (action mapping, rewards, bookkeeping).  The phases sum
+to the wall time spent in the env.
+"""
+
+from __future__ import annotations
+
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List
+
+PERF_PHASES = (
+    "step",
+    "reset",
+    "engine_step",
+    "auto_position",
+    "ghost_record",
+    "enemy_turn",
+    "combat",
+    "end_turn",
+    "oracle",
+    "get_obs",
+    "action_masks",
+)
+
+
+class PerfStats:
+    """Exclusive ns and call count per phase since the last take()."""
+
+    def __init__(self) -> None:
+        self.ns: Dict[str, int] = dict.fromkeys(PERF_PHASES, 0)
+        self.calls: Dict[str, int] = dict.fromkeys(PERF_PHASES, 0)
+        # Time of finished child phases, one entry per open phase (+ the root)
+        self._child_ns: List[int] = [0]
+
+    def wrap(self, phase: str, fn: Callable[..., Any], count: bool = True) -> Callable[..., Any]:
+        """fn timed as ``phase``; count=False adds the time without a call
+        (one phase call made of several resumes, e.g. a batched enemy turn)."""
+        ns = self.ns
+        calls = self.calls
+        child_ns = self._child_ns
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            child_ns.append(0)
+            t0 = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                dt = perf_counter_ns() - t0
+                ns[phase] += dt - child_ns.pop()
+                child_ns[-1] += dt
+                calls[phase] += count
+
+        timed.__wrapped__ = fn  # type: ignore[attr-defined]
+        return timed
+
+    def add(self, phase: str, ns: int) -> None:
+        """Charge ns measured outside any wrapper (a share of a batched call)."""
+        self.ns[phase] += ns
+        self._child_ns[-1] += ns
+
+    def take(self, reset: bool = True) -> Dict[str, int]:
+        """{"<phase>_ns": exclusive ns, "<phase>_calls": count} for every phase."""
+        out = {f"{p}_ns": self.ns[p] for p in PERF_PHASES}
+        out.update({f"{p}_calls": self.calls[p] for p in PERF_PHASES})
+        if reset:
+            for p in PERF_PHASES:
+                self.ns[p] = 0
+                self.calls[p] = 0
+        return out
+
+
+def merge_perf_stats(stats: List[Dict[str, int]]) -> Dict[str, int]:
+    """Sum get_perf_stats() dicts of several envs (e.g. vector_env.call results)."""
+    total: Dict[str, int] = {}
+    for s in stats:
+        for key, value in s.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def format_perf_stats(stats: Dict[str, int]) -> str:
+    """One log line: us per step and share of env time for each non-empty phase."""
+    steps = max(stats.get("step_calls", 0), 1)
+    total = sum(stats.get(f"{p}_ns", 0) for p in PERF_PHASES) or 1
+    parts = [f"env {total / steps / 1e3:.0f}us/step"]
+    for p in PERF_PHASES:
+        ns = stats.get(f"{p}_ns", 0)
+        if ns:
+            parts.append(f"{p}={ns / steps / 1e3:.1f}us({100 * ns / total:.0f}%)")
+    return " ".join(parts)
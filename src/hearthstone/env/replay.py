@@ -0,0 +1,230 @@
+"""
+replay.py — compact action-log replays of HearthstoneEnv episodes.
+
+An episode is fully determined by the env seed, max_tier, the enemy bot and
+the agent's action ids (reset(seed) seeds the game RNG; smart_bot / es_bot
+draw only from game.rng).  So a BC dataset can store ~1 byte per step instead
+of a 1036-float observation, and observations are regenerated on demand by
+replaying the actions — also after the observation layout has changed.
+
+Log layout (little-endian):
+  header  : b"HSR" | version u8 | max_tier u8 | layout crc32 u32 | seed u64
+  ids     : len u8 + ascii bot_id, len u8 + ascii enemy_id
+  actions : count u32, then one unsigned LEB128 varint per action id
+
+bot_id — weights_id() весов политики, которая собрала лог (для фильтрации
+датасетов); enemy_id — weights_id() весов ES-бота противника, "" = smart_bot.
+The layout crc is codec.LAYOUT_CRC: a log written with other card tables is
+rejected instead of replaying into a different game.  Ghost / neural enemies
+are not reproducible from a log and are not supported.
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from hearthstone.engine.codec import LAYOUT_CRC
+from hearthstone.env.hs_env import HearthstoneEnv
+
+REPLAY_VERSION = 1
+SMART_BOT = ""
+
+_MAGIC = b"HSR"
+_FILE_MAGIC = b"HSRF"
+_HEADER = struct.Struct("<3sBBIQ")
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+
+
+def weights_id(weights: Optional[np.ndarray]) -> str:
+    """Short stable id of an ES weight vector (SMART_BOT for None)."""
+    if weights is None:
+        return SMART_BOT
+    data = np.ascontiguousarray(weights, dtype=np.float32).tobytes()
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    out = bytearray()
+    for v in values:
+        if v < 0:
+            raise ValueError(f"Negative action id {v}")
+        while v >= 0x80:
+            out.append((v & 0x7F) | 0x80)
+            v >>= 7
+        out.append(v)
+    return bytes(out)
+
+
+def decode_varints(data: bytes, count: int, offset: int = 0) -> Tuple[List[int], int]:
+    """Read ``count`` varints from data[offset:]; returns (values, end offset)."""
+    values: List[int] = []
+    append = values.append
+    for _ in range(count):
+        v = shift = 0
+        while True:
+            b = data[offset]
+            offset += 1
+            v |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        append(v)
+    return values, offset
+
+
+@dataclass
+class ActionLog:
+    """Seed + action stream of one env episode."""
+
+    seed: int
+    max_tier: int = 6
+    bot_id: str = SMART_BOT
+    enemy_id: str = SMART_BOT
+    actions: List[int] = field(default_factory=list)
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, REPLAY_VERSION, self.max_tier, LAYOUT_CRC, self.seed)]
+        for text in (self.bot_id, self.enemy_id):
+            raw = text.encode("ascii")
+            parts.append(_U8.pack(len(raw)))
+            parts.append(raw)
+        parts.append(_U32.pack(len(self.actions)))
+        parts.append(encode_varints(self.actions))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ActionLog":
+        log, end = cls._read(data, 0)
+        if end != len(data):
+            raise ValueError(f"{len(data) - end} trailing bytes after action log")
+        return log
+
+    @classmethod
+    def _read(cls, data: bytes, off: int) -> Tuple["ActionLog", int]:
+        magic, version, max_tier, crc, seed = _HEADER.unpack_from(data, off)
+        if magic != _MAGIC:
+            raise ValueError("Not a hearthstone action log")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {version} (expected {REPLAY_VERSION})")
+        if crc != LAYOUT_CRC:
+            raise ValueError("Card layout mismatch: log was written with other card tables")
+        off += _HEADER.size
+        ids = []
+        for _ in range(2):
+            (size,) = _U8.unpack_from(data, off)
+            off += _U8.size
+            ids.append(bytes(data[off : off + size]).decode("ascii"))
+            off += size
+        (count,) = _U32.unpack_from(data, off)
+        actions, off = decode_varints(data, count, off + _U32.size)
+        return cls(seed, max_tier, ids[0], ids[1], actions), off
+
+
+def save_logs(path: Union[str, Path], logs: Sequence[ActionLog]) -> None:
+    """Write logs to one file: b"HSRF" | count u32 | (len u32 + log bytes) * count."""
+    parts = [_FILE_MAGIC, _U32.pack(len(logs))]
+    for log in logs:
+        raw = log.to_bytes()
+        parts.append(_U32.pack(len(raw)))
+        parts.append(raw)
+    Path(path).write_bytes(b"".join(parts))
+
+
+def load_logs(path: Union[str, Path]) -> List[ActionLog]:
+    data = Path(path).read_bytes()
+    if data[:4] != _FILE_MAGIC:
+        raise ValueError(f"{path} is not an action log file")
+    (count,) = _U32.unpack_from(data, 4)
+    off = 8
+    logs = []
+    for _ in range(count):
+        (size,) = _U32.unpack_from(data, off)
+        off += _U32.size
+        logs.append(ActionLog.from_bytes(data[off : off + size]))
+        off += size
+    return logs
+
+
+def make_env(log: ActionLog, enemy_weights: Optional[np.ndarray] = None) -> HearthstoneEnv:
+    """Fresh env configured like the one that recorded ``log``."""
+    if weights_id(enemy_weights) != log.enemy_id:
+        raise ValueError(
+            f"Enemy weights {weights_id(enemy_weights)!r} do not match log enemy {log.enemy_id!r}"
+        )
+    env = HearthstoneEnv(max_tier=log.max_tier)
+    if enemy_weights is not None:
+        env.set_es_bot(enemy_weights)
+    return env
+
+
+def replay(
+    log: ActionLog,
+    enemy_weights: Optional[np.ndarray] = None,
+    env: Optional[HearthstoneEnv] = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray, int]]:
+    """Re-run the episode and yield (obs, mask, action) before every step.
+
+    obs / mask are copies (the env reuses its buffers).  Pass ``env`` to reuse
+    one across logs; it must be set up like make_env() would.  Raises
+    ValueError if the episode ends before the log does — the tree no longer
+    reproduces the recorded game."""
+    if env is None:
+        env = make_env(log, enemy_weights)
+    obs, info = env.reset(seed=log.seed)
+    n = len(log.actions)
+    for i, action in enumerate(log.actions):
+        yield obs.copy(), info["action_mask"].copy(), action
+        obs, _, done, truncated, info = env.step(action)
+        if (done or truncated) and i + 1 < n:
+            raise ValueError(
+                f"Replay diverged: episode ended at step {i + 1} of {n} (seed {log.seed})"
+            )
+
+
+def replay_arrays(
+    log: ActionLog, enemy_weights: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """One log -> (obs [T, obs_dim] float32, masks [T, 34] bool, actions [T] int64)."""
+    env = make_env(log, enemy_weights)
+    obs = np.empty((len(log.actions), env.observation_space.shape[0]), dtype=np.float32)
+    masks = np.empty((len(log.actions), env.action_space.n), dtype=np.bool_)
+    for t, (o, m, _) in enumerate(replay(log, env=env)):
+        obs[t] = o
+        masks[t] = m
+    return obs, masks, np.asarray(log.actions, dtype=np.int64)
+
+
+def _replay_worker(args: Tuple[ActionLog, Optional[np.ndarray]]):
+    return replay_arrays(*args)
+
+
+def replay_dataset(
+    logs: Sequence[ActionLog],
+    enemy_weights: Optional[np.ndarray] = None,
+    processes: int = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Regenerate a BC dataset (obs, masks, actions) from logs, in log order.
+
+    processes > 1 replays logs in a ProcessPoolExecutor (как evolve_bot)."""
+    jobs = [(log, enemy_weights) for log in logs]
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parts = list(executor.map(_replay_worker, jobs, chunksize=8))
+    else:
+        parts = [_replay_worker(job) for job in jobs]
+    if not parts:
+        env = HearthstoneEnv()
+        return (
+            np.zeros((0, env.observation_space.shape[0]), dtype=np.float32),
+            np.zeros((0, env.action_space.n), dtype=np.bool_),
+            np.zeros(0, dtype=np.int64),
+        )
+    obs, masks, actions = zip(*parts)
+    return np.concatenate(obs), np.concatenate(masks), np.concatenate(actions)
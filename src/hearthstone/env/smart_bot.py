@@ -10,7 +10,7 @@ import random
 from typing import TYPE_CHECKING, List, Set
 
 from hearthstone.engine.configs import CARD_DB, TIER_UPGRADE_COSTS
-from hearthstone.engine.entities import Player, Unit
+from hearthstone.engine.entities import CardCounts, Player, Unit
 from hearthstone.engine.enums import CardIDs, SpellIDs, UnitType
 from hearthstone.engine.spells import SPELLS_REQUIRE_TARGET
 
@@ -26,7 +26,7 @@ UPGRADE_TURNS = {3: 5, 5: 7, 7: 9}
 def score_unit(
     card_id: str,
     board_types: Set[UnitType],
-    board_card_counts: dict[str, int],
+    board_card_counts: CardCounts | dict[str, int],
     turn: int,
 ) -> float:
     """Score a unit from the shop for the smart bot."""
@@ -76,16 +76,9 @@ def _get_board_types(player: Player) -> Set[UnitType]:
     return types
 
 
-def _get_card_counts(player: Player) -> dict[str, int]:
-    """Count copies of each card_id on board + hand."""
-    counts: dict[str, int] = {}
-    for u in player.board:
-        counts[u.card_id] = counts.get(u.card_id, 0) + 1
-    for c in player.hand:
-        if c.unit:
-            cid = c.unit.card_id
-            counts[cid] = counts.get(cid, 0) + 1
-    return counts
+def _get_card_counts(player: Player) -> CardCounts:
+    """Copies of each card_id on board + hand (player's maintained index)."""
+    return player.card_counts
 
 
 def _weakest_board_unit(player: Player) -> tuple[int, float]:
@@ -0,0 +1,558 @@
+"""
+vector_env.py — many HearthstoneEnv games stepped in one process.
+
+AsyncVectorEnv keeps one env per worker process and pickles every action,
+observation and mask across a pipe; for a CPU-bound Python env that IPC is a
+large share of step time.  HearthstoneVectorEnv instead owns N envs and
+preallocated (N, obs_dim) float32 / (N, 34) bool arrays: every env's
+_obs_buffer / _mask_buffer is a row view of them, so _get_obs() and
+action_masks() write straight into the batch — no per-step concatenation
+or copies.  All envs share one process, one CARD_DB and one GhostPool.
+
+ShardedHearthstoneVectorEnv splits the N envs over a few worker processes,
+each running a HearthstoneVectorEnv whose arrays live in shared memory;
+only actions and (rare) infos go over the pipes.
+
+Autoreset is SAME_STEP: a finished env is reset inside step(), its last
+observation goes to infos["final_obs"] (как ожидает GAE в train_ppo.py).
+reset()/step() also return the masks of the new states as
+infos["action_mask"] (the (N, 34) buffer itself), like HearthstoneEnv's
+info["action_mask"] under AsyncVectorEnv.  Returned arrays are the live
+buffers — copy them if they must survive the next step()/reset().
+
+batch_enemy_turns=True splits step() in three passes: every env plays the
+agent's action, then the enemy turns of all envs that ended their turn run
+together (hs_env.play_enemy_turns — one batched predict() per decision for
+neural opponents), then those END_TURN steps are finished.
+
+obs_mode="compact" returns the batch as compact_obs dicts ((N, 27) int16 ids,
+packed flags, float16 stats, context): the sub-envs still write flat rows and
+the whole batch is converted once per step.
+
+SelfPlayVectorEnv(num_games) puts both players of each Game in the batch
+(rows 2g, 2g+1) for self-play with one forward pass per step.
+
+perf_stats=True enables HearthstoneEnv's per-phase timers in every sub-env;
+merge_perf_stats(venv.call("get_perf_stats")) gives the batch totals.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeAlias
+
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from hearthstone.engine.actions import NUM_ACTIONS
+from hearthstone.env.compact_obs import CompactObs, compact_space, empty_compact, to_compact
+from hearthstone.env.ghost_pool import GhostPool
+from hearthstone.env.hs_env import OBS_MODES, HearthstoneEnv, play_enemy_turns
+
+BatchObs: TypeAlias = np.ndarray | CompactObs
+StepResult = Tuple[BatchObs, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]
+
+
+def _seeds(seed: Optional[int | Sequence[Optional[int]]], n: int) -> List[Optional[int]]:
+    # Как в gymnasium: int -> seed + i для i-го env, список — по env
+    if seed is None:
+        return [None] * n
+    if isinstance(seed, int):
+        return [seed + i for i in range(n)]
+    seeds = list(seed)
+    if len(seeds) != n:
+        raise ValueError(f"Expected {n} seeds, got {len(seeds)}")
+    return seeds
+
+
+class _BatchObsMixin:
+    """obs_mode handling shared by the vector envs: flat (N, obs_dim) rows in
+    self._obs, optionally converted to a preallocated compact batch."""
+
+    num_envs: int
+    _obs: np.ndarray
+
+    def _setup_obs_mode(self, obs_mode: str, probe: HearthstoneEnv) -> None:
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"obs_mode must be one of {OBS_MODES}, got {obs_mode!r}")
+        self.obs_mode = obs_mode
+        self._compact: Optional[CompactObs] = None
+        self.single_observation_space = probe.observation_space
+        if obs_mode == "compact":
+            self.single_observation_space = compact_space(probe.num_card_ids)
+            self._compact = empty_compact((self.num_envs,))
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+
+    def _batch_obs(self) -> BatchObs:
+        if self._compact is None:
+            return self._obs
+        return to_compact(self._obs, self._compact)
+
+    def _final_obs(self, row: np.ndarray) -> BatchObs:
+        # Копия: строку батча перезапишет reset()
+        return row.copy() if self._compact is None else to_compact(row)
+
+
+class HearthstoneVectorEnv(_BatchObsMixin, VectorEnv):
+    """N HearthstoneEnv in one process, writing into shared batch arrays."""
+
+    metadata = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(
+        self,
+        num_envs: int,
+        max_tier: int = 6,
+        obs_buffer: Optional[np.ndarray] = None,
+        mask_buffer: Optional[np.ndarray] = None,
+        obs_mode: str = "flat",
+        batch_enemy_turns: bool = False,
+        perf_stats: bool = False,
+    ) -> None:
+        if num_envs < 1:
+            raise ValueError("num_envs must be >= 1")
+        self.num_envs = num_envs
+        self.batch_enemy_turns = batch_enemy_turns
+        self.envs = [
+            HearthstoneEnv(max_tier=max_tier, perf_stats=perf_stats) for _ in range(num_envs)
+        ]
+        env = self.envs[0]
+        self._setup_obs_mode(obs_mode, env)
+        self.single_action_space = env.action_space
+        self.action_space = batch_space(env.action_space, num_envs)
+
+        obs_dim = env.observation_space.shape[0]
+        # Внешние буферы (shared memory шарда) или свои
+        self._obs = (
+            obs_buffer if obs_buffer is not None else np.zeros((num_envs, obs_dim), np.float32)
+        )
+        self._masks = (
+            mask_buffer if mask_buffer is not None else np.zeros((num_envs, NUM_ACTIONS), np.bool_)
+        )
+        if self._obs.shape != (num_envs, obs_dim) or self._masks.shape != (num_envs, NUM_ACTIONS):
+            raise ValueError("obs_buffer / mask_buffer have the wrong shape")
+        for i, e in enumerate(self.envs):
+            e._obs_buffer = self._obs[i]
+            e._mask_buffer = self._masks[i]
+            # Маски пишутся в self._masks здесь же, без копий через info
+            e.mask_in_info = False
+
+        self._rewards = np.zeros(num_envs, dtype=np.float64)
+        self._terminations = np.zeros(num_envs, dtype=np.bool_)
+        self._truncations = np.zeros(num_envs, dtype=np.bool_)
+        self._all_envs = np.ones(num_envs, dtype=np.bool_)
+
+    def _with_masks(self, infos: Dict[str, Any]) -> Dict[str, Any]:
+        for env in self.envs:
+            env.action_masks()
+        infos["action_mask"] = self._masks
+        infos["_action_mask"] = self._all_envs
+        return infos
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int | Sequence[Optional[int]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[BatchObs, Dict[str, Any]]:
+        infos: Dict[str, Any] = {}
+        for i, (env, env_seed) in enumerate(zip(self.envs, _seeds(seed, self.num_envs))):
+            _, info = env.reset(seed=env_seed, options=options)
+            infos = self._add_info(infos, info, i)
+        self._terminations[:] = False
+        self._truncations[:] = False
+        return self._batch_obs(), self._with_masks(infos)
+
+    def step(self, actions: Sequence[int] | np.ndarray) -> StepResult:
+        infos: Dict[str, Any] = {}
+        rewards = self._rewards
+        terms = self._terminations
+        truncs = self._truncations
+        actions = np.asarray(actions).tolist()
+        if self.batch_enemy_turns:
+            results = [env._step_agent(a) for env, a in zip(self.envs, actions)]
+            ended = [i for i, r in enumerate(results) if r is None]
+            play_enemy_turns([self.envs[i] for i in ended])
+            for i in ended:
+                results[i] = self.envs[i]._finish_end_turn()
+        else:
+            results = [env.step(a) for env, a in zip(self.envs, actions)]
+        for i, result in enumerate(results):
+            env = self.envs[i]
+            _, rewards[i], terms[i], truncs[i], info = result
+            if terms[i] or truncs[i]:
+                # reset() перезапишет строку — финальное наблюдение копируем
+                infos = self._add_info(
+                    infos, {"final_obs": self._final_obs(self._obs[i]), "final_info": info}, i
+                )
+                _, info = env.reset()
+            if info:
+                infos = self._add_info(infos, info, i)
+        return self._batch_obs(), rewards, terms, truncs, self._with_masks(infos)
+
+    def action_masks(self) -> np.ndarray:
+        """(num_envs, 34) bool masks of the current states, written in place."""
+        for env in self.envs:
+            env.action_masks()
+        return self._masks
+
+    def set_ghost_pool(self, pool: GhostPool) -> None:
+        """One GhostPool shared by every env of the batch."""
+        for env in self.envs:
+            env.set_ghost_pool(pool)
+
+    def call(self, name: str, *args: Any, **kwargs: Any) -> Tuple[Any, ...]:
+        results = []
+        for env in self.envs:
+            attr = getattr(env, name)
+            results.append(attr(*args, **kwargs) if callable(attr) else attr)
+        return tuple(results)
+
+    def get_attr(self, name: str) -> Tuple[Any, ...]:
+        return tuple(getattr(env, name) for env in self.envs)
+
+    def close_extras(self, **kwargs: Any) -> None:
+        for env in self.envs:
+            env.close()
+
+
+# ================================================================
+# Self-play: both seats of every Game are rows of the batch
+# ================================================================
+
+
+class SelfPlayVectorEnv(HearthstoneVectorEnv):
+    """num_games two-player games where the caller's policy plays both sides.
+
+    Row 2*g + p is player p of game g: two HearthstoneEnv seats (my_player_id 0
+    and 1) sharing one Game.  Both seats recruit in the same step(), so a single
+    batched forward pass over all 2 * num_games rows acts for both players.
+    A seat that ended its turn waits — mask = only action 0, its action is
+    ignored, reward 0 — until the other seat ends too; that END_TURN resolves
+    the combat (Game.players_ready) and both rows get their round / terminal
+    reward in the same step, measured from one pre-combat health snapshot so
+    the two rewards are zero-sum.  The episode of a game ends for both rows at once."""
+
+    def __init__(
+        self, num_games: int, max_tier: int = 6, obs_mode: str = "flat", perf_stats: bool = False
+    ) -> None:
+        if num_games < 1:
+            raise ValueError("num_games must be >= 1")
+        super().__init__(2 * num_games, max_tier, obs_mode=obs_mode)
+        self.num_games = num_games
+        for host, guest in zip(self.envs[0::2], self.envs[1::2]):
+            guest.game = host.game
+            guest.my_player_id, guest.enemy_id = 1, 0
+            if perf_stats:
+                # Одни таймеры на игру: иначе шаги движка гостя попали бы в таймеры хоста
+                host._install_perf_hooks()
+                guest._install_perf_hooks(host._perf)
+        # Seat ended its turn and waits for the other seat of its game
+        self._waiting = np.zeros(self.num_envs, dtype=np.bool_)
+
+    def _reset_game(
+        self, g: int, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None
+    ) -> None:
+        host, guest = self.envs[2 * g], self.envs[2 * g + 1]
+        host.reset(seed=seed, options=options)
+        guest._reset_seat()
+        guest._get_obs()
+        self._waiting[2 * g : 2 * g + 2] = False
+
+    def _with_masks(self, infos: Dict[str, Any]) -> Dict[str, Any]:
+        infos["action_mask"] = self.action_masks()
+        infos["_action_mask"] = self._all_envs
+        return infos
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int | Sequence[Optional[int]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[BatchObs, Dict[str, Any]]:
+        for g, game_seed in enumerate(_seeds(seed, self.num_games)):
+            self._reset_game(g, game_seed, options)
+        self._terminations[:] = False
+        self._truncations[:] = False
+        return self._batch_obs(), self._with_masks({})
+
+    def step(self, actions: Sequence[int] | np.ndarray) -> StepResult:
+        infos: Dict[str, Any] = {}
+        actions = np.asarray(actions).tolist()
+        waiting = self._waiting
+        for g in range(self.num_games):
+            rows = (2 * g, 2 * g + 1)
+            results: List[Any] = [None, None]
+            just_ended = [False, False]
+            for k, i in enumerate(rows):
+                if waiting[i]:
+                    continue
+                results[k] = self.envs[i]._step_agent(actions[i])
+                if results[k] is None:
+                    waiting[i] = just_ended[k] = True
+            if waiting[rows[0]] and waiting[rows[1]]:
+                # Второй END_TURN уже провёл бой: раунд закрывается у обоих мест.
+                # Здоровье до боя берём один раз — снятое перед этим END_TURN, — иначе
+                # потери второго места за его набор засчитывались бы первому как урон
+                closer = self.envs[rows[1] if just_ended[1] else rows[0]]
+                own_hp, enemy_hp = closer._end_turn_state[:2]
+                hp = {closer.my_player_id: own_hp, closer.enemy_id: enemy_hp}
+                results = [
+                    env._finish_end_turn(hp_before=(hp[env.my_player_id], hp[env.enemy_id]))
+                    for env in (self.envs[i] for i in rows)
+                ]
+                waiting[list(rows)] = False
+            else:
+                for k, i in enumerate(rows):
+                    if waiting[i]:
+                        env = self.envs[i]
+                        # Зоны ждущего не меняются; только что закончивший — END_TURN-эффекты
+                        obs = env._get_obs() if just_ended[k] else env._get_obs(dirty=0)
+                        results[k] = (obs, 0.0, False, False, {})
+
+            term = self.envs[rows[0]].game.game_over
+            trunc = not term and any(r[3] for r in results)
+            for k, i in enumerate(rows):
+                self._rewards[i] = results[k][1]
+                self._terminations[i] = term
+                self._truncations[i] = trunc
+            if term or trunc:
+                for i in rows:
+                    infos = self._add_info(
+                        infos, {"final_obs": self._final_obs(self._obs[i]), "final_info": {}}, i
+                    )
+                self._reset_game(g)
+        return (
+            self._batch_obs(),
+            self._rewards,
+            self._terminations,
+            self._truncations,
+            self._with_masks(infos),
+        )
+
+    def action_masks(self) -> np.ndarray:
+        """Masks of both seats; a waiting seat may only send action 0."""
+        for env, waiting in zip(self.envs, self._waiting.tolist()):
+            if waiting:
+                env._mask_buffer[:] = False
+                env._mask_buffer[0] = True
+            else:
+                env.action_masks()
+        return self._masks
+
+
+# ================================================================
+# Sharded: HearthstoneVectorEnv per worker, arrays in shared memory
+# ================================================================
+
+
+def _without_masks(infos: Dict[str, Any]) -> Dict[str, Any]:
+    # Маски уже лежат в shared memory — по пайпу их не гоняем
+    infos.pop("action_mask", None)
+    infos.pop("_action_mask", None)
+    return infos
+
+
+def _shard_worker(
+    conn: Any,
+    num_envs: int,
+    max_tier: int,
+    obs_dim: int,
+    shm_names: Tuple[str, str, str],
+    start: int,
+    total: int,
+    batch_enemy_turns: bool,
+    perf_stats: bool,
+) -> None:
+    shms = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    try:
+        obs_all = np.ndarray((total, obs_dim), np.float32, shms[0].buf)
+        masks_all = np.ndarray((total, NUM_ACTIONS), np.bool_, shms[1].buf)
+        # rewards f64 | terminations | truncations, по строке на env
+        scalars = np.ndarray((3, total), np.float64, shms[2].buf)
+        stop = start + num_envs
+        venv = HearthstoneVectorEnv(
+            num_envs,
+            max_tier,
+            obs_all[start:stop],
+            masks_all[start:stop],
+            batch_enemy_turns=batch_enemy_turns,
+            perf_stats=perf_stats,
+        )
+        while True:
+            cmd, payload = conn.recv()
+            if cmd == "step":
+                _, rew, term, trunc, infos = venv.step(payload)
+                scalars[0, start:stop] = rew
+                scalars[1, start:stop] = term
+                scalars[2, start:stop] = trunc
+                conn.send(_without_masks(infos))
+            elif cmd == "reset":
+                seeds, options = payload
+                _, infos = venv.reset(seed=seeds, options=options)
+                conn.send(_without_masks(infos))
+            elif cmd == "masks":
+                venv.action_masks()
+                conn.send(None)
+            elif cmd == "call":
+                name, args, kwargs = payload
+                conn.send(venv.call(name, *args, **kwargs))
+            elif cmd == "close":
+                venv.close()
+                conn.send(None)
+                break
+    finally:
+        for shm in shms:
+            shm.close()
+
+
+def _env_info(infos: Dict[str, Any], j: int) -> Dict[str, Any]:
+    """Info dict of env j out of a batched (VectorEnv._add_info) infos dict."""
+    out: Dict[str, Any] = {}
+    for key, value in infos.items():
+        if key.startswith("_") or not infos["_" + key][j]:
+            continue
+        out[key] = _env_info(value, j) if isinstance(value, dict) else value[j]
+    return out
+
+
+class ShardedHearthstoneVectorEnv(_BatchObsMixin, VectorEnv):
+    """num_envs games split over num_shards processes (HearthstoneVectorEnv each).
+
+    Observations, masks, rewards and done flags are written by the workers
+    into shared memory; the pipes carry only actions and infos."""
+
+    metadata = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_shards: int = 2,
+        max_tier: int = 6,
+        context: str = "spawn",
+        obs_mode: str = "flat",
+        batch_enemy_turns: bool = False,
+        perf_stats: bool = False,
+    ) -> None:
+        if not 1 <= num_shards <= num_envs:
+            raise ValueError("Need 1 <= num_shards <= num_envs")
+        self.num_envs = num_envs
+        self.num_shards = num_shards
+        probe = HearthstoneEnv(max_tier=max_tier)
+        self._setup_obs_mode(obs_mode, probe)
+        self.single_action_space = probe.action_space
+        self.action_space = batch_space(probe.action_space, num_envs)
+
+        obs_dim = probe.observation_space.shape[0]
+        sizes = (num_envs * obs_dim * 4, num_envs * NUM_ACTIONS, 3 * num_envs * 8)
+        self._shms = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        self._obs = np.ndarray((num_envs, obs_dim), np.float32, self._shms[0].buf)
+        self._masks: np.ndarray = np.ndarray((num_envs, NUM_ACTIONS), np.bool_, self._shms[1].buf)
+        self._scalars = np.ndarray((3, num_envs), np.float64, self._shms[2].buf)
+
+        self._all_envs = np.ones(num_envs, dtype=np.bool_)
+
+        bounds = np.linspace(0, num_envs, num_shards + 1).astype(int)
+        self._slices = [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
+        # typeshed types get_context(str) as BaseContext, which has no .Process
+        ctx: Any = mp.get_context(context)
+        self._conns = []
+        self._procs = []
+        names = tuple(shm.name for shm in self._shms)
+        for sl in self._slices:
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_shard_worker,
+                args=(
+                    child,
+                    sl.stop - sl.start,
+                    max_tier,
+                    obs_dim,
+                    names,
+                    sl.start,
+                    num_envs,
+                    batch_enemy_turns,
+                    perf_stats,
+                ),
+                daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def _gather_infos(self, shard_infos: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Re-batch the shards' vector infos with global env indices (+ the shared masks)."""
+        infos: Dict[str, Any] = {"action_mask": self._masks, "_action_mask": self._all_envs}
+        for sl, shard in zip(self._slices, shard_infos):
+            has_info = np.zeros(sl.stop - sl.start, dtype=np.bool_)
+            for key, value in shard.items():
+                if key.startswith("_"):
+                    has_info |= value
+            for j in np.flatnonzero(has_info):
+                infos = self._add_info(infos, _env_info(shard, int(j)), sl.start + int(j))
+        if self._compact is not None and "final_obs" in infos:
+            # Шарды шлют плоские final_obs (object array по env)
+            final = infos["final_obs"]
+            for j in np.flatnonzero(infos["_final_obs"]):
+                final[j] = to_compact(final[j])
+        return infos
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int | Sequence[Optional[int]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[BatchObs, Dict[str, Any]]:
+        seeds = _seeds(seed, self.num_envs)
+        for conn, sl in zip(self._conns, self._slices):
+            conn.send(("reset", (seeds[sl], options)))
+        infos = self._gather_infos([conn.recv() for conn in self._conns])
+        return self._batch_obs(), infos
+
+    def step(self, actions: Sequence[int] | np.ndarray) -> StepResult:
+        actions = np.asarray(actions)
+        for conn, sl in zip(self._conns, self._slices):
+            conn.send(("step", actions[sl]))
+        infos = self._gather_infos([conn.recv() for conn in self._conns])
+        return (
+            self._batch_obs(),
+            self._scalars[0].copy(),
+            self._scalars[1].astype(np.bool_),
+            self._scalars[2].astype(np.bool_),
+            infos,
+        )
+
+    def action_masks(self) -> np.ndarray:
+        for conn in self._conns:
+            conn.send(("masks", None))
+        for conn in self._conns:
+            conn.recv()
+        return self._masks
+
+    def call(self, name: str, *args: Any, **kwargs: Any) -> Tuple[Any, ...]:
+        for conn in self._conns:
+            conn.send(("call", (name, args, kwargs)))
+        return tuple(r for conn in self._conns for r in conn.recv())
+
+    def get_attr(self, name: str) -> Tuple[Any, ...]:
+        return self.call(name)
+
+    def close_extras(self, **kwargs: Any) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+                conn.recv()
+            except (BrokenPipeError, EOFError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+
+    def __del__(self) -> None:
+        # Воркеры и shared memory не должны пережить объект
+        if not self.closed and hasattr(self, "_procs"):
+            self.close()
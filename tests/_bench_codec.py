@@ -0,0 +1,67 @@
+"""
+Game state codec benchmark: pickle vs Game.to_bytes() / Game.from_bytes().
+
+Кодек пишет фиксированные struct-записи с card id из CARD_ID_MAP вместо
+pickle вложенных dataclass-ов; размер и время сравниваются на середине игры
+с полными столами. Около 2.5 KB любого формата — состояние Mersenne Twister.
+
+Запуск: PYTHONPATH=src python tests/_bench_codec.py
+"""
+import pickle
+import time
+
+from hearthstone.engine.codec import encode_player
+from hearthstone.engine.entities import HandCard, Unit
+from hearthstone.engine.game import Game
+
+NUM_ITERS = 2000
+
+
+def make_midgame():
+    """Game on turn ~8: full boards, a few cards in hand, tier-4 shops."""
+    game = Game(seed=0)
+    for player in game.players:
+        player.tavern_tier = 4
+        player.gold = 10
+        game.tavern.roll_tavern(player)
+        for cid in game.pool.draw_cards(7, max_tier=4):
+            player.board.append(Unit.create_from_db(cid, game.tavern.get_next_uid(), player.uid))
+        for cid in game.pool.draw_cards(3, max_tier=4):
+            uid = game.tavern.get_next_uid()
+            player.hand.append(HandCard(uid=uid, unit=Unit.create_from_db(cid, uid, player.uid)))
+    game.turn_count = 8
+    return game
+
+
+def timed(fn):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(NUM_ITERS):
+        fn()
+    return (time.perf_counter() - t0) / NUM_ITERS
+
+
+def main():
+    game = make_midgame()
+    pickled = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+    encoded = game.to_bytes()
+    players_pickled = sum(len(pickle.dumps(p, protocol=5)) for p in game.players)
+    players_encoded = sum(len(encode_player(p)) for p in game.players)
+
+    t_dumps = timed(lambda: pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL))
+    t_loads = timed(lambda: pickle.loads(pickled))
+    t_encode = timed(game.to_bytes)
+    t_decode = timed(lambda: Game.from_bytes(encoded))
+
+    def row(name, pickle_value, codec_value, fmt):
+        ratio = pickle_value / codec_value
+        print(f"{name:<10} {pickle_value:>10{fmt}} {codec_value:>10{fmt}} {ratio:>6.1f}x")
+
+    print(f"{'':<10} {'pickle':>10} {'codec':>10} {'ratio':>7}")
+    row("game B", len(pickled), len(encoded), "")
+    row("players B", players_pickled, players_encoded, "")
+    row("encode us", t_dumps * 1e6, t_encode * 1e6, ".1f")
+    row("decode us", t_loads * 1e6, t_decode * 1e6, ".1f")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Unit creation benchmark: Unit.create_from_db and roll throughput.
+
+create_from_db копирует готовый __dict__ прототипа карты (UNIT_PROTOTYPES,
+собираются при импорте) вместо CardIDs(...) + поиска в CARD_DB + dataclass
+__init__ + recalc_stats на каждый вызов. Roll на 6 тире создаёт 6 юнитов.
+
+Запуск: PYTHONPATH=src python tests/_bench_create_unit.py
+"""
+import time
+
+from hearthstone.engine.configs import CARD_DB
+from hearthstone.engine.entities import Unit
+from hearthstone.engine.game import Game
+
+NUM_CREATES = 100000
+NUM_ROLLS = 20000
+
+
+def bench_create():
+    card_ids = [cid for cid, data in CARD_DB.items() if not data.get("is_token", False)]
+    n = len(card_ids)
+    t0 = time.perf_counter()
+    for i in range(NUM_CREATES):
+        Unit.create_from_db(card_ids[i % n], i, 0, is_golden=(i & 7 == 0))
+    return (time.perf_counter() - t0) / NUM_CREATES
+
+
+def bench_rolls():
+    game = Game(seed=1)
+    player = game.players[0]
+    player.tavern_tier = 6
+    t0 = time.perf_counter()
+    for _ in range(NUM_ROLLS):
+        player.gold = 10
+        game.tavern.roll_tavern(player)
+    return (time.perf_counter() - t0) / NUM_ROLLS
+
+
+def main():
+    print(f"create_from_db:       {bench_create() * 1e6:8.2f} us")
+    print(f"roll_tavern (tier 6): {bench_rolls() * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
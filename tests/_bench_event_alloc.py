@@ -0,0 +1,121 @@
+"""
+Allocation benchmark for the Python combat event bus.
+
+Считает, сколько объектов Event / EntityRef / PosRef / MinionSnapshot /
+TriggerInstance создаётся за один resolve_combat (через sys.setprofile на
+их __init__), и сколько байт занимает один экземпляр (с __dict__, если есть).
+PosRef интернирован через pos_ref(), поэтому после прогрева новых PosRef
+почти не создаётся; остальные типы slotted и не аллоцируют __dict__.
+
+Запуск: PYTHONPATH=src python tests/_bench_event_alloc.py
+"""
+import random
+import sys
+import time
+from collections import Counter
+
+from hearthstone.engine import event_system as es
+from hearthstone.engine.combat import CombatManager
+from hearthstone.engine.entities import Player, Unit
+from hearthstone.engine.enums import CardIDs
+
+NUM_COMBATS = 300
+
+BOARD_A = [
+    CardIDs.ANNOY_O_TRON,
+    CardIDs.MICROBOT,
+    CardIDs.FLIGHTY_SCOUT,
+    CardIDs.ANNOY_O_TRON,
+    CardIDs.MICROBOT,
+    CardIDs.FLIGHTY_SCOUT,
+    CardIDs.ANNOY_O_TRON,
+]
+BOARD_B = [
+    CardIDs.MICROBOT,
+    CardIDs.ANNOY_O_TRON,
+    CardIDs.MICROBOT,
+    CardIDs.FLIGHTY_SCOUT,
+    CardIDs.ANNOY_O_TRON,
+    CardIDs.MICROBOT,
+    CardIDs.ANNOY_O_TRON,
+]
+
+
+def make_players():
+    uid = iter(range(1, 1000))
+    p1 = Player(
+        uid=0,
+        board=[Unit.create_from_db(c, next(uid), 0) for c in BOARD_A],
+        hand=[],
+    )
+    p2 = Player(
+        uid=1,
+        board=[Unit.create_from_db(c, next(uid), 1) for c in BOARD_B],
+        hand=[],
+    )
+    return p1, p2
+
+
+TRACKED = (es.Event, es.EntityRef, es.PosRef, es.MinionSnapshot, es.TriggerInstance)
+
+
+def count_allocations(cm, p1, p2, n):
+    counts = Counter()
+
+    def _profile(frame, event, arg):
+        if event == "call" and frame.f_code.co_name == "__init__":
+            obj = frame.f_locals.get("self")
+            if type(obj) in TRACKED:
+                counts[type(obj).__name__] += 1
+
+    sys.setprofile(_profile)
+    try:
+        for _ in range(n):
+            cm.resolve_combat(p1, p2)
+    finally:
+        sys.setprofile(None)
+    return counts
+
+
+def instance_size(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main():
+    random.seed(0)
+    p1, p2 = make_players()
+    cm = CombatManager()
+    for _ in range(20):  # прогрев: кэш интернированных PosRef
+        cm.resolve_combat(p1, p2)
+
+    counts = count_allocations(cm, p1, p2, NUM_COMBATS)
+    sample = {
+        "Event": es.Event(event_type=es.EventType.MINION_DAMAGED, value=1),
+        "EntityRef": es.EntityRef(1),
+        "PosRef": es.PosRef(0, es.Zone.BOARD, 0),
+        "MinionSnapshot": es.MinionSnapshot(1, "x", 0, None, 1, 1, 0, 0),
+        "TriggerInstance": es.TriggerInstance(trigger_def=None, trigger_uid=0),
+    }
+
+    print(f"Combats: {NUM_COMBATS}")
+    print(f"{'type':<16} {'allocs/combat':>14} {'bytes/obj':>10} {'bytes/combat':>13}")
+    total = 0.0
+    for name, obj in sample.items():
+        per_combat = counts[name] / NUM_COMBATS
+        size = instance_size(obj)
+        total += per_combat * size
+        print(f"{name:<16} {per_combat:>14.1f} {size:>10} {per_combat * size:>13,.0f}")
+    print(f"{'total':<16} {sum(counts.values()) / NUM_COMBATS:>14.1f} {'':>10} {total:>13,.0f}")
+
+    t0 = time.perf_counter()
+    for _ in range(NUM_COMBATS):
+        cm.resolve_combat(p1, p2)
+    elapsed = time.perf_counter() - t0
+    print(f"Time / combat: {elapsed / NUM_COMBATS * 1e6:,.1f} us")
+
+
+if __name__ == "__main__":
+    main()
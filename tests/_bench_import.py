@@ -0,0 +1,80 @@
+"""
+Import / startup benchmark: то, что платит каждый AsyncVectorEnv worker и
+каждый процесс evolve_bot.
+
+Каждый замер — отдельный свежий процесс python. Меряются: import
+hearthstone.engine.game, import hearthstone.env.hs_env, HearthstoneEnv(),
+и построены ли TRIGGER_REGISTRY / AVENGE_REGISTRY к этому моменту (они
+ленивые и строятся при первом обращении). "cold" — пустой HS_CACHE_DIR,
+таблица признаков карт (card_features.py) строится и пишется на диск;
+"warm" — таблица читается из кэша по хэшу card_def.py.
+
+Без .pyc (PYTHONDONTWRITEBYTECODE) импорт card_def.py включает компиляцию
+~5.8k строк, поэтому байткод один раз прогревается перед замерами.
+
+Запуск: PYTHONPATH=src python tests/_bench_import.py
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = 7
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import hearthstone.engine.game
+t1 = time.perf_counter()
+import hearthstone.env.hs_env as hs_env
+t2 = time.perf_counter()
+hs_env.HearthstoneEnv()
+t3 = time.perf_counter()
+from hearthstone.engine import card_def
+print(json.dumps({
+    "engine": t1 - t0,
+    "env_import": t2 - t1,
+    "env_init": t3 - t2,
+    "triggers_built": getattr(card_def.TRIGGER_REGISTRY, "built", True),
+    "avenge_built": getattr(card_def.AVENGE_REGISTRY, "built", True),
+}))
+"""
+
+
+def probe(cache_dir):
+    env = dict(os.environ, HS_CACHE_DIR=cache_dir)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def report(name, results):
+    def ms(key):
+        return statistics.median(r[key] for r in results) * 1e3
+
+    last = results[-1]
+    print(
+        f"{name:<6} engine {ms('engine'):6.1f} ms   hs_env {ms('env_import'):6.1f} ms   "
+        f"HearthstoneEnv() {ms('env_init'):5.1f} ms   "
+        f"registries built: triggers={last['triggers_built']} avenge={last['avenge_built']}"
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as warm_dir:
+        probe(warm_dir)  # прогрев .pyc и кэша признаков
+        cold = []
+        for _ in range(RUNS):
+            with tempfile.TemporaryDirectory() as cold_dir:
+                cold.append(probe(cold_dir))
+        warm = [probe(warm_dir) for _ in range(RUNS)]
+    report("cold", cold)
+    report("warm", warm)
+
+
+if __name__ == "__main__":
+    main()
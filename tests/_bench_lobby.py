@@ -0,0 +1,59 @@
+"""
+Lobby combat round benchmark: 4 pairings of an 8-player round.
+
+Сравнивает один вызов CombatManager.resolve_combats (fast_combat_pairs, без
+GIL) с четырьмя resolve_combat_fast подряд и с одним боем 1-на-1. Без
+собранного C++ модуля сравниваются Python-бои.
+
+Запуск: PYTHONPATH=src:<build dir> python tests/_bench_lobby.py
+"""
+import time
+
+from hearthstone.engine.cpp_bridge import get_cpp_engine
+from hearthstone.engine.entities import Unit
+from hearthstone.engine.lobby import Lobby
+
+NUM_ROUNDS = 2000
+
+
+def make_lobby():
+    lobby = Lobby(num_players=8, seed=0)
+    for player in lobby.players:
+        player.tavern_tier = 4
+        for cid in lobby.pool.draw_cards(7, max_tier=4):
+            player.board.append(
+                Unit.create_from_db(cid, lobby.tavern.get_next_uid(), player.uid)
+            )
+    return lobby
+
+
+def timed(fn, n):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def main():
+    lobby = make_lobby()
+    combat = lobby.combat
+    p = lobby.players
+    pairs = [(p[0], p[1]), (p[2], p[3]), (p[4], p[5]), (p[6], p[7])]
+    cpp = get_cpp_engine() is not None
+    single = combat.resolve_combat_fast if cpp else combat.resolve_combat
+    n = NUM_ROUNDS if cpp else NUM_ROUNDS // 20
+
+    t_one = timed(lambda: single(p[0], p[1]), n)
+    t_seq = timed(lambda: [single(a, b) for a, b in pairs], n)
+    t_batch = timed(lambda: combat.resolve_combats(pairs), n)
+
+    print(f"engine: {'C++' if cpp else 'Python'}")
+    print(f"one 1v1 combat:            {t_one * 1e6:8.1f} us")
+    print(f"round, 4 sequential calls: {t_seq * 1e6:8.1f} us")
+    ratio = t_batch / t_one
+    print(f"round, resolve_combats:    {t_batch * 1e6:8.1f} us  ({ratio:.1f}x one combat)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Observation encoding benchmark: HearthstoneEnv._get_obs().
+
+"per-entity" — старый путь: _encode_entity_fast пишет ~37 float на сущность
+по одному индексу (CARD_DB / trigger / static_id lookups на каждую);
+"template" — _encode_zones: строка из статической таблицы entity_templates()
++ динамические колонки (atk/hp/tags/golden/types/...) сразу для всех слотов.
+
+Состояние mid-game: полный стол, 3 карты в руке, магазин 4-го тира (27 слотов,
+~17 занято); плюс средняя цена на случайной траектории (мало сущностей).
+
+"step(), full" vs "step(), dirty zones" — env.step() recruit-действий на
+траектории, где агент чаще покупает/роллит/двигает, чем заканчивает ход: в
+первом случае каждый шаг перекодирует все зоны, во втором только изменённые.
+
+Запуск: PYTHONPATH=src python tests/_bench_obs.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # tests.helpers
+
+from hearthstone.engine.actions import FREEZE_END_TURN
+from hearthstone.engine.entities import HandCard, Unit
+from hearthstone.env.hs_env import OBS_ZONE_ALL, HearthstoneEnv
+from tests.helpers import random_legal_action
+
+NUM_ITERS = 5000
+RANDOM_STEPS = 2000
+
+
+def make_midgame_env():
+    env = HearthstoneEnv()
+    env.reset(seed=0)
+    game = env.game
+    player = game.players[env.my_player_id]
+    player.tavern_tier = 4
+    game.tavern.roll_tavern(player)
+    player.board.clear()
+    for cid in game.pool.draw_cards(7, max_tier=4):
+        player.board.append(Unit.create_from_db(cid, game.tavern.get_next_uid(), player.uid))
+    for cid in game.pool.draw_cards(3, max_tier=4):
+        uid = game.tavern.get_next_uid()
+        player.hand.append(HandCard(uid=uid, unit=Unit.create_from_db(cid, uid, player.uid)))
+    return env
+
+
+def per_entity_obs(env):
+    """Baseline: the pre-template encoding, zone by zone via _encode_zone_fast."""
+    p = env.game.players[env.my_player_id]
+    buf = env._obs_buffer
+    buf[:] = 0.0
+    env._encode_zone_fast(p.board, buf, env._off_board, 7, "BOARD")
+    env._encode_zone_fast(p.hand, buf, env._off_hand, 10, "HAND")
+    env._encode_zone_fast(p.store, buf, env._off_store, 7, "STORE")
+    discover = p.discovery.options if p.is_discovering else []
+    env._encode_zone_fast(discover, buf, env._off_discover, 3, "DISCOVER")
+    return buf
+
+
+def template_obs(env):
+    buf = env._obs_buffer
+    buf[:] = 0.0
+    env._encode_zones(env.game.players[env.my_player_id], buf)
+    return buf
+
+
+def timed(fn):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(NUM_ITERS):
+        fn()
+    return (time.perf_counter() - t0) / NUM_ITERS
+
+
+def random_trajectory_cost(env, fn):
+    """Mean best-of-10 encode time over a random-policy trajectory."""
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    total = 0.0
+    for t in range(RANDOM_STEPS):
+        best = float("inf")
+        for _ in range(10):
+            t0 = time.perf_counter()
+            fn(env)
+            best = min(best, time.perf_counter() - t0)
+        total += best
+        _, _, done, truncated, _ = env.step(random_legal_action(rng, env.action_masks()))
+        if done or truncated:
+            env.reset(seed=t)
+    return total / RANDOM_STEPS
+
+
+class FullObsEnv(HearthstoneEnv):
+    """Re-encodes every zone on every step (the pre-dirty-tracking behaviour)."""
+
+    def _get_obs(self, player_idx=None, dirty=OBS_ZONE_ALL):
+        return super()._get_obs(player_idx, OBS_ZONE_ALL)
+
+
+def step_cost(env):
+    """Mean env.step() time of recruit actions (no END_TURN: combat + bot turn
+    dominate those and re-encode everything anyway), best of 3 runs over the
+    same recruit-heavy random trajectories."""
+    best = float("inf")
+    for _ in range(3):
+        total = 0.0
+        steps = 0
+        for seed in range(20):
+            rng = np.random.default_rng(seed)
+            env.reset(seed=seed)
+            done = truncated = False
+            while not (done or truncated):
+                action = random_legal_action(rng, env.action_masks(), end_turn_p=0.05)
+                t0 = time.perf_counter()
+                _, _, done, truncated, _ = env.step(action)
+                if action not in (0, FREEZE_END_TURN):
+                    total += time.perf_counter() - t0
+                    steps += 1
+        best = min(best, total / steps)
+    return best
+
+
+def main():
+    env = make_midgame_env()
+    assert np.array_equal(per_entity_obs(env).copy(), template_obs(env))
+    filled = int(env._obs_buffer[env._off_board : env._off_enemy].reshape(27, -1)[:, 0].sum())
+
+    print(f"mid-game ({filled} entities):")
+    t_old = timed(lambda: per_entity_obs(env))
+    t_new = timed(lambda: template_obs(env))
+    print(f"  per-entity: {t_old * 1e6:8.1f} us")
+    print(f"  template:   {t_new * 1e6:8.1f} us  ({t_old / t_new:.1f}x)")
+
+    print(f"random trajectory ({RANDOM_STEPS} steps):")
+    t_old = random_trajectory_cost(HearthstoneEnv(), per_entity_obs)
+    t_new = random_trajectory_cost(HearthstoneEnv(), template_obs)
+    print(f"  per-entity: {t_old * 1e6:8.1f} us")
+    print(f"  template:   {t_new * 1e6:8.1f} us  ({t_old / t_new:.1f}x)")
+
+    t_full = step_cost(FullObsEnv())
+    t_dirty = step_cost(HearthstoneEnv())
+    print(f"step(), full:        {t_full * 1e6:8.1f} us")
+    print(f"step(), dirty zones: {t_dirty * 1e6:8.1f} us  ({t_full / t_dirty:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
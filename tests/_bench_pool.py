@@ -0,0 +1,54 @@
+"""
+CardPool benchmark: Game() construction and roll throughput.
+
+Пул хранит счётчики копий на карту (Fenwick tree по тиру) вместо списков
+с копиями, раскладка по тирам кэшируется на модуль — Game() не пересобирает
+~2000 элементов, а roll не делает list.pop / list.append по индексу.
+
+Запуск: PYTHONPATH=src python tests/_bench_pool.py
+"""
+import time
+
+from hearthstone.engine.game import Game
+from hearthstone.engine.pool import CardPool
+
+NUM_GAMES = 500
+NUM_ROLLS = 20000
+NUM_DRAWS = 50000
+
+
+def bench_game_construction():
+    Game(seed=0)  # прогрев: кэши CARD_DB / раскладки пула
+    t0 = time.perf_counter()
+    for i in range(NUM_GAMES):
+        Game(seed=i)
+    return (time.perf_counter() - t0) / NUM_GAMES
+
+
+def bench_rolls():
+    game = Game(seed=1)
+    player = game.players[0]
+    player.tavern_tier = 6
+    t0 = time.perf_counter()
+    for _ in range(NUM_ROLLS):
+        player.gold = 10
+        game.tavern.roll_tavern(player)
+    return (time.perf_counter() - t0) / NUM_ROLLS
+
+
+def bench_draw_return():
+    pool = CardPool()
+    t0 = time.perf_counter()
+    for _ in range(NUM_DRAWS // 6):
+        pool.return_cards(pool.draw_cards(6, max_tier=6))
+    return (time.perf_counter() - t0) / (NUM_DRAWS // 6 * 6)
+
+
+def main():
+    print(f"Game() construction: {bench_game_construction() * 1e6:8.1f} us")
+    print(f"roll_tavern (tier 6): {bench_rolls() * 1e6:8.1f} us")
+    print(f"draw + return / card: {bench_draw_return() * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Reset latency benchmark: new Game(seed) vs Game.reset(seed), HearthstoneEnv.reset().
+
+Game.reset() переиспользует CardPool / SpellPool / EventManager / TavernManager /
+CombatManager: пул возвращается к закэшированной раскладке, RNG пересевается
+на месте; остаются только новые игроки и два start_turn. "env.reset(), new Game"
+— прежний HearthstoneEnv.reset(), создававший Game на каждый эпизод.
+
+Раскладка пула кэшируется на модуль с тех пор, как пул хранит счётчики
+копий, поэтому сборка менеджеров стоит десятки мкс; большую часть reset
+занимают два start_turn (заполнение магазинов + события), которые нужны
+в обоих вариантах.
+
+Запуск: PYTHONPATH=src python tests/_bench_reset.py
+"""
+import random
+import time
+
+from hearthstone.engine.game import Game
+from hearthstone.env.hs_env import HearthstoneEnv
+
+NUM_ITERS = 3000
+
+
+class RebuildGame(Game):
+    """reset() rebuilds pool and managers, like constructing a new Game."""
+
+    def reset(self, seed=None):
+        self.__init__(self.max_tier, seed)
+
+
+def timed(fn):
+    fn(0)
+    t0 = time.perf_counter()
+    for i in range(NUM_ITERS):
+        fn(i)
+    return (time.perf_counter() - t0) / NUM_ITERS
+
+
+def main():
+    game = Game(seed=0)
+    t_new = timed(lambda i: Game(seed=i))
+    t_reset = timed(lambda i: game.reset(i))
+    print(f"Game(seed):        {t_new * 1e6:8.1f} us")
+    print(f"game.reset(seed):  {t_reset * 1e6:8.1f} us  ({t_new / t_reset:.2f}x)")
+    t_build = timed(lambda i: game._init_managers(game.max_tier, random.Random(i)))
+    t_reuse = timed(game._reset_managers)
+    print(f"  managers, new:     {t_build * 1e6:8.1f} us")
+    print(f"  managers, reused:  {t_reuse * 1e6:8.1f} us  ({t_build / t_reuse:.1f}x)")
+
+    old_env = HearthstoneEnv()
+    old_env.game = RebuildGame()
+    env = HearthstoneEnv()
+    t_old = timed(lambda i: old_env.reset(seed=i))
+    t_env = timed(lambda i: env.reset(seed=i))
+    print(f"env.reset(), new Game:    {t_old * 1e6:8.1f} us")
+    print(f"env.reset(), Game.reset:  {t_env * 1e6:8.1f} us  ({t_old / t_env:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
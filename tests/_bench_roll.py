@@ -0,0 +1,53 @@
+"""
+Roll throughput benchmark: TavernManager.roll_tavern на полной доске.
+
+Рефилл магазина берёт все карты одним draw_cards и отправляет события
+MINION_ADDED_TO_SHOP одним батчем (EventManager.process_events): один
+EffectContext на рефилл, слушатели собираются один раз, пока срабатывают
+только системные триггеры. Раньше на каждый новый юнит строился свой
+контекст и заново сканировалась доска. Доска из 7 юнитов тира 4 —
+скан слушателей стоит пропорционально её размеру.
+
+Запуск: PYTHONPATH=src python tests/_bench_roll.py
+"""
+import time
+
+from hearthstone.engine.configs import CARD_DB
+from hearthstone.engine.entities import Unit
+from hearthstone.engine.game import Game
+
+NUM_ROLLS = 20000
+
+
+def make_game(tier):
+    game = Game(seed=1)
+    player = game.players[0]
+    player.tavern_tier = tier
+    board_ids = [cid for cid, data in CARD_DB.items() if data.get("tier") == 4][:7]
+    for i, cid in enumerate(board_ids):
+        player.board.append(Unit.create_from_db(cid, 50000 + i, player.uid))
+    return game, player
+
+
+def bench_rolls(tier):
+    game, player = make_game(tier)
+    roll = game.tavern.roll_tavern
+    for _ in range(500):  # прогрев
+        player.gold = 10
+        roll(player)
+    t0 = time.perf_counter()
+    for _ in range(NUM_ROLLS):
+        player.gold = 10
+        roll(player)
+    return (time.perf_counter() - t0) / NUM_ROLLS
+
+
+def main():
+    print(f"{'tier':<6} {'us/roll':>9} {'rolls/s':>10}")
+    for tier in (1, 3, 6):
+        t = bench_rolls(tier)
+        print(f"{tier:<6} {t * 1e6:>9.1f} {1 / t:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Vector env throughput: gymnasium AsyncVectorEnv против HearthstoneVectorEnv
+(все игры в одном процессе, наблюдения и маски пишутся прямо в
+предвыделенные (n, 1036) / (n, 34) массивы) и ShardedHearthstoneVectorEnv
+(те же массивы в shared memory, игры поделены между процессами).
+
+Цикл повторяет rollout train_ppo.py: маски всех env, случайное легальное
+действие на env, step. Агента нет — меряется только env + IPC. На машине с
+одним ядром шардинг и Async выигрыша от параллелизма не получают.
+
+Маски берутся из infos["action_mask"], который reset()/step() возвращают
+вместе с наблюдением; строка "call()" — старый путь с отдельным
+envs.call("action_masks"), т.е. второй круг по всем воркерам на каждый шаг.
+
+Запуск: PYTHONPATH=src python tests/_bench_vector_env.py
+"""
+
+import os
+import time
+
+import gymnasium
+import numpy as np
+
+from hearthstone.env.hs_env import HearthstoneEnv
+from hearthstone.env.vector_env import HearthstoneVectorEnv, ShardedHearthstoneVectorEnv
+
+N_ENVS = 8
+STEPS = 400
+
+
+def make_env(rank):
+    def thunk():
+        env = HearthstoneEnv()
+        env.reset(seed=rank)
+        return env
+
+    return thunk
+
+
+def bench(envs, via_call=False):
+    rng = np.random.default_rng(0)
+    _, infos = envs.reset(seed=0)
+
+    def run(n, infos):
+        for _ in range(n):
+            masks = np.array(envs.call("action_masks")) if via_call else infos["action_mask"]
+            actions = np.array([rng.choice(np.flatnonzero(m)) for m in masks])
+            _, _, _, _, infos = envs.step(actions)
+        return infos
+
+    infos = run(20, infos)  # прогрев
+    t0 = time.perf_counter()
+    run(STEPS, infos)
+    elapsed = time.perf_counter() - t0
+    envs.close()
+    return STEPS * N_ENVS / elapsed
+
+
+def main():
+    print(f"n_envs={N_ENVS} cpus={os.cpu_count()}")
+
+    def async_env():
+        return gymnasium.vector.AsyncVectorEnv([make_env(i) for i in range(N_ENVS)])
+
+    runs = [
+        ("AsyncVectorEnv call()", async_env, True),
+        ("AsyncVectorEnv", async_env, False),
+        ("HearthstoneVectorEnv", lambda: HearthstoneVectorEnv(N_ENVS), False),
+        ("Sharded x2", lambda: ShardedHearthstoneVectorEnv(N_ENVS, num_shards=2), False),
+    ]
+    for name, factory, via_call in runs:
+        print(f"{name:<22} {bench(factory(), via_call):>9,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ cpp_engine.register_all_effects()
 sys.path.insert(0, "src")
 from hearthstone.engine.combat import CombatManager
 from hearthstone.engine.entities import Player, Unit
-from hearthstone.engine.enums import CardIDs, Tags, UnitType
+from hearthstone.engine.enums import CardIDs, Tags, UnitType, tags_to_mask, types_to_mask
 
 # ============================================================
 # C++ constants (mirror types.h)
@@ -139,7 +139,8 @@ def cpp_board_to_python(cpp_board, uid_start):
                 base_hp=hp, base_atk=atk,
                 max_hp=hp, max_atk=atk,
                 cur_hp=hp, cur_atk=atk,
-                tier=tier, types=py_types, tags=py_tags,
+                tier=tier,
+                type_mask=types_to_mask(py_types), tag_mask=tags_to_mask(py_tags),
                 is_golden=golden,
             )
         uid += 1
@@ -1,7 +1,8 @@
 """Shared fixtures for the HS Autobattler test suite.
 
 Every test must use these fixtures — manual instantiation of ``Game``,
-``Player``, or ``EventManager`` inside test functions is forbidden.
+``Player``, or ``EventManager`` inside test functions is forbidden.  The one
+exception is ``Game(seed=...)`` in determinism tests, which need the seed.
 """
 
 from __future__ import annotations
@@ -15,6 +16,7 @@ from hearthstone.engine.entities import Player, Spell, StoreItem, Unit
 from hearthstone.engine.enums import CardIDs
 from hearthstone.engine.event_system import EventManager
 from hearthstone.engine.game import Game
+from hearthstone.engine.lobby import Lobby
 from hearthstone.engine.tavern import TavernManager
 
 # ---------------------------------------------------------------------------
@@ -28,6 +30,12 @@ def empty_game() -> Game:
     return Game()
 
 
+@pytest.fixture()
+def lobby() -> Lobby:
+    """Fresh seeded 8-player ``Lobby`` (turn 1 already started for everyone)."""
+    return Lobby(num_players=8, seed=0)
+
+
 @pytest.fixture()
 def player(empty_game: Game) -> Player:
     """Player 0 of *empty_game* with gold set to **10** for comfortable testing."""
@@ -0,0 +1,27 @@
+"""Plain helpers shared by tests and the ``_bench_*`` scripts (not fixtures)."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from hearthstone.engine.actions import MAX_BOARD, SELL
+
+
+def random_legal_action(
+    rng: np.random.Generator,
+    mask: np.ndarray,
+    end_turn_p: float = 1.0,
+    sell_p: float = 1.0,
+) -> int:
+    """Random legal action id of an action mask.
+
+    END_TURN (0) and SELL get weights *end_turn_p* / *sell_p*, every other legal
+    action 1.0; lower weights give long recruit phases that build a board.
+    With the default weights it is a plain ``rng.choice`` over the legal ids.
+    """
+    legal = np.flatnonzero(mask)
+    if end_turn_p == sell_p == 1.0:
+        return int(rng.choice(legal))
+    is_sell = (legal >= SELL) & (legal < SELL + MAX_BOARD)
+    p = np.where(legal == 0, end_turn_p, np.where(is_sell, sell_p, 1.0))
+    return int(rng.choice(legal, p=p / p.sum()))
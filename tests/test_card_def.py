@@ -11,9 +11,17 @@ Covers:
 
 from __future__ import annotations
 
+import copy
+import json
+import pickle
+from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
 
+import pytest
+
+from hearthstone.engine import card_features
 from hearthstone.engine.card_def import ALL_CARDS, AVENGE_REGISTRY, build_card_db, build_trigger_registry
+from hearthstone.engine.card_def import _LazyRegistry
 from hearthstone.engine.configs import CARD_DB
 from hearthstone.engine.card_def import TRIGGER_REGISTRY
 from hearthstone.engine.combat import CombatManager
@@ -69,6 +77,56 @@ class TestBuildTriggerRegistry:
                 )
 
 
+class TestLazyRegistry:
+    def test_builds_once_on_first_access(self) -> None:
+        calls: List[int] = []
+
+        def builder() -> Dict[str, int]:
+            calls.append(1)
+            return {"a": 1}
+
+        reg = _LazyRegistry("TRIGGER_REGISTRY", builder)
+        assert not reg.built and not calls
+        assert reg.get("a") == 1
+        assert reg["a"] == 1 and "a" in reg and len(reg) == 1
+        assert reg.built and len(calls) == 1
+
+    def test_pickles_as_module_global(self) -> None:
+        assert pickle.loads(pickle.dumps(TRIGGER_REGISTRY)) is TRIGGER_REGISTRY
+        assert copy.deepcopy(AVENGE_REGISTRY) is AVENGE_REGISTRY
+
+
+class TestCardFeatureCache:
+    @pytest.fixture(autouse=True)
+    def _isolated_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("HS_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(card_features, "_TRIGGER_FLAGS", None)
+
+    def test_cache_written_and_reused(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        table = card_features.trigger_flags()
+        assert card_features.cache_path().exists()
+        assert table == card_features.build_trigger_flags()
+
+        monkeypatch.setattr(card_features, "_TRIGGER_FLAGS", None)
+        monkeypatch.setattr(card_features, "build_trigger_flags", lambda: pytest.fail("rebuilt"))
+        assert card_features.trigger_flags() == table
+
+    def test_stale_key_rebuilds(self) -> None:
+        path = card_features.cache_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"card_def_sha1": "old", "trigger_flags": {}}))
+
+        table = card_features.trigger_flags()
+
+        assert table == card_features.build_trigger_flags()
+        assert json.loads(path.read_text())["card_def_sha1"] == card_features.card_def_hash()
+
+    def test_flags_look_up_by_card_id_enum(self) -> None:
+        table = card_features.trigger_flags()
+        bc, _eot, _soc, _sell, _syn = table[CardIDs.OMINOUS_SEER]
+        assert bc
+
+
 # -----------------------------------------------------------------------
 # EffectContext.make_golden
 # -----------------------------------------------------------------------
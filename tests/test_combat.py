@@ -6,10 +6,15 @@ Covers: basic attack, divine shield, deathrattle summon, outcome calculation.
 from __future__ import annotations
 
 import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Callable
 
+import numpy as np
+import pytest
+
+from hearthstone.engine import combat as combat_module
 from hearthstone.engine.combat import CombatManager
-from hearthstone.engine.entities import Unit
+from hearthstone.engine.entities import HandCard, Unit
 from hearthstone.engine.enums import BattleOutcome, CardIDs
 
 if TYPE_CHECKING:
@@ -67,3 +72,112 @@ class TestBasicCombat:
 
         assert outcome == BattleOutcome.WIN
         assert damage > 0
+
+
+class TestSimulateMany:
+    """CombatManager.simulate_many — batched Python combats."""
+
+    def test_returns_numpy_arrays(
+        self,
+        empty_game: "Game",
+        mock_unit: Callable[..., Unit],
+        combat_manager: CombatManager,
+    ) -> None:
+        p0 = empty_game.players[0]
+        p1 = empty_game.players[1]
+        p0.board = [mock_unit(CardIDs.ANNOY_O_TRON, owner_id=p0.uid)]
+        p1.board = []
+
+        outcomes, damage = combat_manager.simulate_many(p0, p1, 5, seed=1, use_cpp=False)
+
+        assert outcomes.shape == (5,) and outcomes.dtype == np.int8
+        assert damage.shape == (5,) and damage.dtype == np.int32
+        assert (outcomes == BattleOutcome.WIN.value).all()
+
+    def test_same_seed_same_results(
+        self,
+        empty_game: "Game",
+        mock_unit: Callable[..., Unit],
+        combat_manager: CombatManager,
+    ) -> None:
+        p0 = empty_game.players[0]
+        p1 = empty_game.players[1]
+        p0.board = [mock_unit(CardIDs.ANNOY_O_TRON, owner_id=p0.uid) for _ in range(3)]
+        p1.board = [mock_unit(CardIDs.HARMLESS_BONEHEAD, owner_id=p1.uid) for _ in range(3)]
+
+        first = combat_manager.simulate_many(p0, p1, 30, seed=7, use_cpp=False)
+        second = combat_manager.simulate_many(p0, p1, 30, seed=7, use_cpp=False)
+
+        assert np.array_equal(first[0], second[0])
+        assert np.array_equal(first[1], second[1])
+
+    def test_players_left_untouched(
+        self,
+        empty_game: "Game",
+        mock_unit: Callable[..., Unit],
+        combat_manager: CombatManager,
+    ) -> None:
+        p0 = empty_game.players[0]
+        p1 = empty_game.players[1]
+        p0.board = [mock_unit(CardIDs.ANNOY_O_TRON, owner_id=p0.uid)]
+        p1.board = [mock_unit(CardIDs.HARMLESS_BONEHEAD, owner_id=p1.uid)]
+        rng_before = combat_manager.rng
+        rng_state = rng_before.getstate()
+        uid_before = combat_manager.uid
+
+        combat_manager.simulate_many(p0, p1, 10, seed=3, use_cpp=False)
+
+        assert [u.card_id for u in p1.board] == [CardIDs.HARMLESS_BONEHEAD]
+        assert p0.board[0].has_divine_shield
+        assert combat_manager.rng is rng_before
+        assert rng_before.getstate() == rng_state
+        assert combat_manager.uid == uid_before
+
+    def test_concurrent_calls_match_sequential(
+        self,
+        empty_game: "Game",
+        mock_unit: Callable[..., Unit],
+        combat_manager: CombatManager,
+    ) -> None:
+        p0 = empty_game.players[0]
+        p1 = empty_game.players[1]
+        p0.board = [mock_unit(CardIDs.ANNOY_O_TRON, owner_id=p0.uid) for _ in range(4)]
+        p1.board = [mock_unit(CardIDs.HARMLESS_BONEHEAD, owner_id=p1.uid) for _ in range(4)]
+
+        def run(seed: int) -> list[int]:
+            outcomes, _ = combat_manager.simulate_many(p0, p1, 40, seed=seed, use_cpp=False)
+            return outcomes.tolist()
+
+        sequential = [run(seed) for seed in range(8)]
+        # Nothing is shared between calls: interleaved threads see the same combats
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert list(pool.map(run, range(8))) == sequential
+
+    def test_cpp_sides_include_hand_start_of_combat(
+        self,
+        empty_game: "Game",
+        mock_unit: Callable[..., Unit],
+        combat_manager: CombatManager,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        sides = []
+
+        class FakeCpp:
+            @staticmethod
+            def fast_combat_batch(side0, side1, seed, n, tavern_tier_0, tavern_tier_1):
+                sides.append((side0, side1))
+                return [(BattleOutcome.WIN.value, 1)] * n
+
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: FakeCpp())
+        p0 = empty_game.players[0]
+        p1 = empty_game.players[1]
+        scout = mock_unit(CardIDs.FLIGHTY_SCOUT, owner_id=p0.uid)
+        p0.hand = [HandCard(uid=scout.uid, unit=scout)]
+        p1.board = [mock_unit(CardIDs.MICROBOT, owner_id=p1.uid)]
+
+        combat_manager.simulate_many(p0, p1, 4, seed=0)
+
+        # The Scout copy fights like in the Python engine; the player keeps an empty board
+        ((side0, side1),) = sides
+        assert side0 == [CombatManager._unit_to_cpp(scout)] and len(side1) == 1
+        assert p0.board == []
@@ -0,0 +1,87 @@
+"""Tests for the compact tokenized observation (env/compact_obs.py, obs_mode="compact")."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from hearthstone.engine.entities import Unit
+from hearthstone.engine.enums import CardIDs
+from hearthstone.env.compact_obs import (
+    FLAG_COLS,
+    FLAT_SIZE,
+    STAT_COLS,
+    from_compact,
+    to_compact,
+)
+from hearthstone.env.hs_env import HearthstoneEnv
+from hearthstone.env.vector_env import HearthstoneVectorEnv
+from tests.helpers import random_legal_action
+
+
+def _random_flat_obs(n_steps: int = 200, seed: int = 0) -> np.ndarray:
+    env = HearthstoneEnv()
+    rng = np.random.default_rng(seed)
+    env.reset(seed=seed)
+    rows = []
+    for t in range(n_steps):
+        rows.append(env._get_obs().copy())
+        _, _, done, truncated, _ = env.step(random_legal_action(rng, env.action_masks()))
+        if done or truncated:
+            env.reset(seed=seed + t)
+    return np.stack(rows)
+
+
+class TestLayout:
+    def test_columns_cover_entity_vector(self) -> None:
+        env = HearthstoneEnv()
+        assert FLAT_SIZE == env.observation_space.shape[0]
+        covered = sorted([2, *FLAG_COLS.tolist(), *STAT_COLS.tolist()])
+        assert covered == list(range(env.entity_features))
+
+    def test_round_trip_is_exact(self) -> None:
+        flat = _random_flat_obs()
+        compact = to_compact(flat)
+        assert compact["card_ids"].shape == (len(flat), 27)
+        np.testing.assert_array_equal(from_compact(compact), flat)
+        # Same result row by row as for the batch
+        np.testing.assert_array_equal(from_compact(to_compact(flat[7])), flat[7])
+
+    def test_bytes_per_observation(self) -> None:
+        compact = to_compact(np.zeros(FLAT_SIZE, np.float32))
+        assert sum(v.nbytes for v in compact.values()) == 445  # vs 4144 flat
+
+
+class TestCompactEnv:
+    def test_env_returns_compact_obs(self) -> None:
+        env = HearthstoneEnv(obs_mode="compact")
+        ref = HearthstoneEnv()
+        obs, _ = env.reset(seed=5)
+        assert env.observation_space.contains(obs)
+        np.testing.assert_array_equal(from_compact(obs), ref.reset(seed=5)[0])
+        player = env.game.players[env.my_player_id]
+        player.board.append(Unit.create_from_db(CardIDs.MICROBOT, 9999, player.uid))
+        obs = env._get_obs()
+        assert obs["card_ids"][0] == env.static_id_map[CardIDs.MICROBOT]
+
+    def test_unknown_mode_rejected(self) -> None:
+        with pytest.raises(ValueError, match="obs_mode"):
+            HearthstoneEnv(obs_mode="tokens")
+
+    def test_vector_env_matches_flat(self) -> None:
+        flat = HearthstoneVectorEnv(3)
+        compact = HearthstoneVectorEnv(3, obs_mode="compact")
+        np.testing.assert_array_equal(from_compact(compact.reset(seed=1)[0]), flat.reset(seed=1)[0])
+        rng = np.random.default_rng(0)
+        finished = 0
+        for _ in range(300):
+            actions = [random_legal_action(rng, m) for m in flat.action_masks()]
+            obs, *_, infos = flat.step(actions)
+            c_obs, *_, c_infos = compact.step(actions)
+            assert compact.observation_space.contains(c_obs)
+            np.testing.assert_array_equal(from_compact(c_obs), obs)
+            for j in np.flatnonzero(infos.get("_final_obs", [])):
+                finished += 1
+                final = c_infos["final_obs"][j]
+                np.testing.assert_array_equal(from_compact(final), infos["final_obs"][j])
+        assert finished > 0
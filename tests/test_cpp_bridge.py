@@ -28,7 +28,7 @@ from hearthstone.engine.cpp_bridge import (
     TYPE_TO_BIT,
     get_cpp_engine,
 )
-from hearthstone.engine.entities import Player, Unit
+from hearthstone.engine.entities import HandCard, Player, Unit
 from hearthstone.engine.enums import BattleOutcome, CardIDs, Tags, UnitType
 
 
@@ -61,11 +61,15 @@ class TestMappings:
             assert TAG_TO_BIT[tag] > 0
 
     def test_type_bits_unique(self):
-        """All type bits must be powers of 2 (no collisions)."""
-        bits = list(TYPE_TO_BIT.values())
+        """All tribe bits must be powers of 2 (no collisions); ALL is their union."""
+        bits = [b for ut, b in TYPE_TO_BIT.items() if ut is not UnitType.ALL]
         assert len(bits) == len(set(bits))
         for b in bits:
             assert b & (b - 1) == 0, f"Not a power of 2: {b}"
+        union = 0
+        for b in bits:
+            union |= b
+        assert TYPE_TO_BIT[UnitType.ALL] == union
 
     def test_tag_bits_unique(self):
         """All tag bits must be powers of 2 (no collisions)."""
@@ -176,3 +180,16 @@ class TestFastCombat:
         assert abs(cpp_wr - py_wr) < 0.20, (
             f"Win rates diverge too much: C++ {cpp_wr:.2f} vs Python {py_wr:.2f}"
         )
+
+    def test_simulate_many_applies_hand_start_of_combat(self):
+        """Flighty Scout in hand summons its copy in both backends."""
+        scout = Unit.create_from_db(CardIDs.FLIGHTY_SCOUT, uid=100, owner_id=0)
+        p0 = self._make_player([], uid=0)
+        p0.hand = [HandCard(uid=scout.uid, unit=scout)]
+        p1 = self._make_player([Unit.create_from_db(CardIDs.MICROBOT, uid=200, owner_id=1)], uid=1)
+        cm = CombatManager()
+        py_outcomes, _ = cm.simulate_many(p0, p1, 200, seed=0, use_cpp=False)
+        cpp_outcomes, _ = cm.simulate_many(p0, p1, 200, seed=0, use_cpp=True)
+        assert (py_outcomes == BattleOutcome.WIN.value).all()
+        assert (cpp_outcomes == BattleOutcome.WIN.value).all()
+        assert p0.board == []
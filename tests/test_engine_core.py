@@ -5,14 +5,28 @@ Covers: Economy · Tavern logic · Triplets · Discovery · Edge-cases.
 
 from __future__ import annotations
 
+import pickle
+import random
 from typing import TYPE_CHECKING, Callable
 
+import pytest
+
+from hearthstone.engine.actions import (
+    BUY,
+    FREEZE_END_TURN,
+    NUM_ACTIONS,
+    ROLL,
+    compute_legal_actions,
+    decode_action,
+    mask_stamp,
+)
+from hearthstone.engine.codec import CODEC_VERSION, decode_player, encode_player
 from hearthstone.engine.configs import COST_BUY, COST_REROLL, TAVERN_SLOTS
-from hearthstone.engine.entities import HandCard, Player, Spell, StoreItem, Unit
+from hearthstone.engine.entities import DiscoveryRequest, HandCard, Player, Spell, StoreItem, Unit
 from hearthstone.engine.enums import CardIDs, SpellIDs
+from hearthstone.engine.game import Game
 
 if TYPE_CHECKING:
-    from hearthstone.engine.game import Game
     from hearthstone.engine.tavern import TavernManager
 
 # ---------------------------------------------------------------------------
@@ -575,3 +589,307 @@ class TestEdgeCases:
         success, _ = tavern.upgrade_tavern(player)
 
         assert not success
+
+
+# ---------------------------------------------------------------------------
+#  Per-game RNG
+# ---------------------------------------------------------------------------
+
+
+class TestGameRng:
+    """Each Game draws randomness only from its own ``Game.rng``."""
+
+    @staticmethod
+    def _store_ids(game: "Game", player_idx: int = 0) -> list:
+        return [item.unit.card_id for item in game.players[player_idx].store if item.unit]
+
+    def test_same_seed_same_shops(self) -> None:
+        game_a = Game(seed=123)
+        game_b = Game(seed=123)
+
+        for _ in range(3):
+            assert self._store_ids(game_a) == self._store_ids(game_b)
+            game_a.players[0].gold = 10
+            game_b.players[0].gold = 10
+            game_a.step(0, "ROLL")
+            # Interleaved global draws must not affect either game
+            random.random()
+            game_b.step(0, "ROLL")
+
+        assert self._store_ids(game_a) == self._store_ids(game_b)
+
+    def test_game_does_not_touch_global_random(self) -> None:
+        state = random.getstate()
+        game = Game(seed=5)
+        game.players[0].gold = 10
+        game.step(0, "ROLL")
+
+        assert random.getstate() == state
+
+    def test_managers_share_game_rng(self, empty_game: "Game") -> None:
+        rng = empty_game.rng
+        assert empty_game.pool.rng is rng
+        assert empty_game.spell_pool.rng is rng
+        assert empty_game.tavern.rng is rng
+        assert empty_game.combat.rng is rng
+
+
+class TestGameSnapshot:
+    """``Game.snapshot()`` / ``Game.restore()`` branch a game without deepcopy."""
+
+    ACTIONS = ("BUY", "BUY", "PLAY", "PLAY", "SELL", "ROLL", "UPGRADE", "SWAP", "END_TURN")
+
+    @classmethod
+    def _play(cls, game: "Game", driver: random.Random, steps: int) -> None:
+        """Drive both players with pseudo-random actions (illegal ones simply fail)."""
+        for _ in range(steps):
+            if game.game_over:
+                return
+            idx = 0 if not game.players_ready[0] else 1
+            player = game.players[idx]
+            if player.is_discovering:
+                options = len(player.discovery.options)
+                game.step(idx, "DISCOVER_CHOICE", index=driver.randrange(max(options, 1)))
+                continue
+            board, hand, store = len(player.board), len(player.hand), len(player.store)
+            game.step(
+                idx,
+                driver.choice(cls.ACTIONS),
+                index=driver.randrange(max(store, board, 1)),
+                hand_index=driver.randrange(max(hand, 1)),
+                insert_index=driver.randrange(board + 1),
+                target_index=driver.randrange(max(board, 1)),
+                index_a=driver.randrange(max(board, 1)),
+                index_b=driver.randrange(max(board, 1)),
+            )
+
+    @staticmethod
+    def _state(game: "Game") -> tuple:
+        return (
+            repr(game.players),
+            game.pool.snapshot(),
+            game.rng.getstate(),
+            game.tavern._uid_counter,
+            game.combat.uid,
+            game.turn_count,
+            game.game_over,
+            game.winner_id,
+            dict(game.players_ready),
+        )
+
+    def test_restore_continues_bit_identically(self) -> None:
+        game = Game(seed=2024)
+        self._play(game, random.Random(1), 60)
+        snap = game.snapshot()
+        before = self._state(game)
+
+        self._play(game, random.Random(2), 150)
+        branch = self._state(game)
+        assert branch != before
+
+        game.restore(snap)
+        assert self._state(game) == before
+        self._play(game, random.Random(2), 150)
+        assert self._state(game) == branch
+
+    def test_snapshot_matches_fresh_game_with_same_history(self) -> None:
+        game_a = Game(seed=7)
+        game_b = Game(seed=7)
+        self._play(game_a, random.Random(3), 60)
+        self._play(game_b, random.Random(3), 60)
+        snap = game_a.snapshot()
+
+        self._play(game_a, random.Random(99), 150)
+        game_a.restore(snap)
+        self._play(game_a, random.Random(4), 150)
+        self._play(game_b, random.Random(4), 150)
+
+        assert self._state(game_a) == self._state(game_b)
+
+    def test_snapshot_is_isolated_and_reusable(self, empty_game: "Game") -> None:
+        empty_game.players[0].gold = 10
+        empty_game.step(0, "BUY", index=0)
+        snap = empty_game.snapshot()
+        before = self._state(empty_game)
+
+        for _ in range(2):
+            player = empty_game.players[0]
+            player.hand[0].unit.perm_atk_add += 5
+            player.store.clear()
+            player.mechanics.scaling_counters["x"] = 1
+            empty_game.pool.draw_cards(5, 6)
+            empty_game.restore(snap)
+            assert self._state(empty_game) == before
+
+        assert snap.players[0] is not empty_game.players[0]
+        assert empty_game.players[0].board is not snap.players[0].board
+
+
+class TestGameReset:
+    """``Game.reset(seed)`` starts a new match on the existing managers."""
+
+    def test_reset_matches_fresh_game(self) -> None:
+        game = Game(seed=11)
+        pool, tavern, combat = game.pool, game.tavern, game.combat
+        TestGameSnapshot._play(game, random.Random(5), 200)
+
+        game.reset(31)
+        fresh = Game(seed=31)
+        assert TestGameSnapshot._state(game) == TestGameSnapshot._state(fresh)
+        assert game.pool is pool and game.tavern is tavern and game.combat is combat
+
+        TestGameSnapshot._play(game, random.Random(6), 150)
+        TestGameSnapshot._play(fresh, random.Random(6), 150)
+        assert TestGameSnapshot._state(game) == TestGameSnapshot._state(fresh)
+
+    def test_reset_without_seed_uses_global_random(self) -> None:
+        game = Game(seed=1)
+        state = random.getstate()
+        game.reset()
+        random.setstate(state)
+        fresh = Game(seed=random.getrandbits(64))
+        assert TestGameSnapshot._state(game) == TestGameSnapshot._state(fresh)
+
+
+class TestGameCodec:
+    """``Game.to_bytes()`` / ``Game.from_bytes()`` binary round trip."""
+
+    def test_round_trip_continues_bit_identically(self) -> None:
+        game = Game(seed=2024)
+        TestGameSnapshot._play(game, random.Random(1), 60)
+        data = game.to_bytes()
+        clone = type(game).from_bytes(data)
+
+        assert clone.to_bytes() == data
+        assert TestGameSnapshot._state(clone) == TestGameSnapshot._state(game)
+        TestGameSnapshot._play(game, random.Random(2), 150)
+        TestGameSnapshot._play(clone, random.Random(2), 150)
+        assert TestGameSnapshot._state(clone) == TestGameSnapshot._state(game)
+
+    def test_player_fields_survive(self, empty_game: "Game", player: Player) -> None:
+        unit = Unit.create_from_db(CardIDs.MICROBOT, 5000, 0, is_golden=True)
+        unit.attached_perm[CardIDs.ANNOY_O_TRON] = 2
+        unit.attached_turn["E_TEST"] = 1
+        unit.absorbed_pool_copies[CardIDs.ANNOY_O_TRON] = 3
+        unit.is_frozen = True
+        player.board.append(unit)
+        spell = Spell.create_from_db(SpellIDs.TAVERN_COIN)
+        spell.params["gold"] = 4
+        player.hand.append(HandCard(uid=5001, spell=spell))
+        player.mechanics.increment_scaling("elementals_played", 3)
+
+        decoded = decode_player(encode_player(player))
+
+        assert repr(decoded) == repr(player)
+        restored = decoded.board[-1]
+        assert type(next(iter(restored.attached_perm))) is CardIDs
+        assert restored.card_id is CardIDs.MICROBOT
+        assert decoded.hand[-1].spell.params["gold"] == 4
+
+    def test_pending_discovery_request_survives(self) -> None:
+        """Selling Patient Scout leaves a request that only the next spell consumes."""
+        game = Game(seed=3)
+        player = game.players[0]
+        player.board.append(Unit.create_from_db(CardIDs.PATIENT_SCOUT, 5000, 0))
+        game.step(0, "SELL", index=0)
+        assert player.pending_discovery_request is not None
+
+        data = game.to_bytes()
+        clone = type(game).from_bytes(data)
+
+        assert clone.players[0].pending_discovery_request == player.pending_discovery_request
+        assert clone.to_bytes() == data
+        TestGameSnapshot._play(game, random.Random(4), 100)
+        TestGameSnapshot._play(clone, random.Random(4), 100)
+        assert TestGameSnapshot._state(clone) == TestGameSnapshot._state(game)
+
+    def test_discovery_predicate_rejected(self, player: Player) -> None:
+        player.pending_discovery_request = DiscoveryRequest(tier=2, predicate=lambda card: True)
+        with pytest.raises(ValueError, match="predicate"):
+            encode_player(player)
+
+    def test_rejects_foreign_payloads(self, empty_game: "Game") -> None:
+        game_cls = type(empty_game)
+        data = empty_game.to_bytes()
+        with pytest.raises(ValueError, match="Not a hearthstone"):
+            game_cls.from_bytes(b"XXX" + data[3:])
+        with pytest.raises(ValueError, match="version"):
+            game_cls.from_bytes(data[:3] + bytes([CODEC_VERSION + 1]) + data[4:])
+        with pytest.raises(ValueError, match="layout"):
+            game_cls.from_bytes(data[:5] + b"\0\0\0\0" + data[9:])
+        with pytest.raises(ValueError, match="kind"):
+            game_cls.from_bytes(encode_player(empty_game.players[0]))
+
+    def test_smaller_than_pickle(self) -> None:
+        game = Game(seed=11)
+        TestGameSnapshot._play(game, random.Random(5), 60)
+
+        assert len(game.to_bytes()) * 2 < len(pickle.dumps(game, protocol=5))
+
+
+class TestActionMask:
+    """``Game.step_int()`` and the incrementally maintained legal-action bits."""
+
+    @staticmethod
+    def _play_legal(game: "Game", driver: random.Random, steps: int, check: bool) -> None:
+        """Drive both players with random legal action ids; optionally verify every mask."""
+        for _ in range(steps):
+            if game.game_over:
+                return
+            idx = 0 if not game.players_ready[0] else 1
+            player = game.players[idx]
+            bits = game.legal_actions(idx)
+            if check:
+                assert player.legal_stamp == mask_stamp(player)
+                assert bits == compute_legal_actions(player, game.max_tier)
+            legal = [a for a in range(NUM_ACTIONS) if bits >> a & 1]
+            game.step_int(idx, driver.choice(legal))
+
+    def test_incremental_mask_matches_full_recompute(self) -> None:
+        for seed in range(3):
+            game = Game(seed=seed)
+            self._play_legal(game, random.Random(seed), 300, check=True)
+
+    def test_step_int_matches_string_step(self) -> None:
+        game_a, game_b = Game(seed=5), Game(seed=5)
+        driver = random.Random(8)
+        for _ in range(200):
+            if game_a.game_over:
+                break
+            idx = 0 if not game_a.players_ready[0] else 1
+            bits = game_a.legal_actions(idx)
+            action_id = driver.choice([a for a in range(NUM_ACTIONS) if bits >> a & 1])
+            result = game_a.step_int(idx, action_id)
+            action_type, kwargs = decode_action(game_b.players[idx], action_id)
+            if action_type == "FREEZE_END_TURN":
+                game_b.step(idx, "FREEZE")
+                expected = game_b.step(idx, "END_TURN")
+            else:
+                expected = game_b.step(idx, action_type, **kwargs)
+            assert result == expected
+        assert TestGameSnapshot._state(game_a) == TestGameSnapshot._state(game_b)
+
+    def test_discovery_remaps_ids(self, empty_game: "Game", tavern: "TavernManager") -> None:
+        player = empty_game.players[0]
+        assert tavern.start_discovery(player, source="Test", tier=1, count=3)
+
+        assert empty_game.legal_actions(0) == 0b111 << BUY
+        assert decode_action(player, BUY + 1) == ("DISCOVER_CHOICE", {"index": 1})
+        success, _, _ = empty_game.step_int(0, ROLL)
+        assert not success
+        assert empty_game.step_int(0, BUY)[0]
+        assert not player.is_discovering
+
+    def test_direct_state_edit_is_detected(self, empty_game: "Game") -> None:
+        player = empty_game.players[0]
+        assert empty_game.legal_actions(0) >> ROLL & 1
+        player.gold = 0
+        assert not empty_game.legal_actions(0) >> ROLL & 1
+        player.gold = 10
+        player.store.clear()
+        assert empty_game.legal_actions(0) == compute_legal_actions(player, empty_game.max_tier)
+
+    def test_unknown_action_id_raises(self, empty_game: "Game") -> None:
+        with pytest.raises(ValueError, match="action id"):
+            empty_game.step_int(0, NUM_ACTIONS)
+        assert empty_game.step_int(0, FREEZE_END_TURN) == (True, False, "Ready")
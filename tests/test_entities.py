@@ -9,7 +9,9 @@ from __future__ import annotations
 import pytest
 
 from hearthstone.engine.entities import (
+    UNIT_PROTOTYPES,
     EconomyState,
+    Hand,
     HandCard,
     MechanicState,
     Player,
@@ -17,7 +19,16 @@ from hearthstone.engine.entities import (
     StoreItem,
     Unit,
 )
-from hearthstone.engine.enums import CardIDs, MechanicType, SpellIDs, Tags, UnitType
+from hearthstone.engine.enums import (
+    UNIT_TYPE_BITS,
+    CardIDs,
+    MechanicType,
+    SpellIDs,
+    Tags,
+    UnitType,
+    tags_from_mask,
+)
+from hearthstone.engine.game import Game
 
 # ===================================================================
 #  1. UNIT CREATION
@@ -62,6 +73,54 @@ class TestUnitCreation:
         unit = Unit.create_from_db(CardIDs.ANNOY_O_TRON, uid=1, owner_id=0)
         assert unit.tier == 1  # Annoy-o-Tron is tier 1
 
+    def test_create_sets_bitmasks(self) -> None:
+        unit = Unit.create_from_db(CardIDs.ANNOY_O_TRON, uid=1, owner_id=0)
+        assert unit.type_mask == UNIT_TYPE_BITS[UnitType.MECH]
+        assert unit.tag_mask == int(Tags.TAUNT | Tags.DIVINE_SHIELD)
+
+    def test_tag_view_round_trip(self) -> None:
+        unit = Unit.create_from_db(CardIDs.ANNOY_O_TRON, uid=1, owner_id=0)
+        unit.tags.discard(Tags.DIVINE_SHIELD)
+        unit.tags.add(Tags.REBORN)
+
+        assert not unit.has_divine_shield
+        assert unit.has_reborn
+        assert set(unit.tags) == {Tags.TAUNT, Tags.REBORN}
+
+    def test_all_type_matches_every_tribe(self) -> None:
+        unit = Unit.create_from_db(CardIDs.ANNOY_O_TRON, uid=1, owner_id=0)
+        unit.types = [UnitType.ALL]
+
+        assert unit.has_type(UnitType.BEAST)
+        assert unit.has_type(UnitType.MECH)
+        assert tags_from_mask(unit.tag_mask) == set(unit.tags)
+
+    def test_create_matches_prototype(self) -> None:
+        proto = UNIT_PROTOTYPES[CardIDs.MANASABER]
+        golden = Unit.create_from_db(CardIDs.MANASABER, uid=7, owner_id=1, is_golden=True)
+
+        assert golden.base_atk == golden.cur_atk == proto.atk * 2
+        assert golden.base_hp == golden.max_hp == proto.hp * 2
+        assert golden.tag_mask == proto.tag_mask
+        assert golden.is_golden
+
+    def test_created_units_do_not_share_state(self) -> None:
+        first = Unit.create_from_db(CardIDs.MICROBOT, uid=1, owner_id=0)
+        first.attached_perm["X"] = 1
+        first.absorbed_pool_copies[CardIDs.MICROBOT] = 1
+        first.perm_atk_add += 3
+
+        second = Unit.create_from_db(CardIDs.MICROBOT, uid=2, owner_id=0)
+        assert second.attached_perm == {}
+        assert second.absorbed_pool_copies == {}
+        assert second.perm_atk_add == 0
+        assert "X" not in UNIT_PROTOTYPES[CardIDs.MICROBOT].state["attached_perm"]
+
+    def test_create_accepts_plain_string_id(self) -> None:
+        unit = Unit.create_from_db(CardIDs.ANNOY_O_TRON.value, uid=1, owner_id=0)
+        assert unit.card_id == CardIDs.ANNOY_O_TRON
+        assert unit.has_divine_shield
+
 
 # ===================================================================
 #  2. SPELL CREATION
@@ -498,3 +557,91 @@ class TestUnitBooleanProperties:
         assert not unit.is_alive
         unit.cur_hp = -5
         assert not unit.is_alive
+
+
+# ===================================================================
+#  12. CARD COUNT INDEX (Hand / Board / Player.card_counts)
+# ===================================================================
+
+
+def _scan_counts(player: Player) -> dict:
+    counts: dict = {}
+    for u in player.board:
+        counts[u.card_id] = counts.get(u.card_id, 0) + 1
+    for c in player.hand:
+        if c.unit:
+            counts[c.unit.card_id] = counts.get(c.unit.card_id, 0) + 1
+    return counts
+
+
+class TestCardCounts:
+    """Per-player card_id -> (hand, board) copies, kept up to date by zone mutations."""
+
+    def _card(self, cid: CardIDs, uid: int) -> HandCard:
+        return HandCard(uid=uid, unit=Unit.create_from_db(cid, uid=uid, owner_id=0))
+
+    def test_zones_wrapped_on_construction(self) -> None:
+        p = Player(uid=0, board=[], hand=[self._card(CardIDs.MICROBOT, 1)])
+        assert isinstance(p.hand, Hand)
+        assert p.card_counts.zones(CardIDs.MICROBOT) == (1, 0)
+
+    def test_hand_mutations(self) -> None:
+        p = Player(uid=0, board=[], hand=[])
+        cid = CardIDs.MICROBOT
+        p.hand.append(self._card(cid, 1))
+        p.hand.insert(0, self._card(cid, 2))
+        p.hand.append(HandCard(uid=3, spell=Spell.create_from_db(SpellIDs.BANANA)))
+        assert p.card_counts.zones(cid) == (2, 0)
+        p.hand.pop(0)
+        assert p.card_counts.zones(cid) == (1, 0)
+        p.hand[:] = [c for c in p.hand if c.spell]
+        assert p.card_counts.get(cid) == 0
+        assert cid not in p.card_counts
+        assert p.hand.card_counts == {}
+
+    def test_board_mutations(self) -> None:
+        p = Player(uid=0, board=[], hand=[])
+        cid = CardIDs.WRATH_WEAVER
+        a = Unit.create_from_db(cid, uid=1, owner_id=0)
+        b = Unit.create_from_db(cid, uid=2, owner_id=0)
+        p.board.append(a)
+        p.board.insert(0, b)
+        assert p.card_counts.zones(cid) == (0, 2)
+        p.board.remove(a)
+        assert p.card_counts[cid] == 1
+        p.board.clear()
+        assert p.board.card_counts == {}
+
+    def test_plain_list_zone_falls_back_to_scan(self) -> None:
+        p = Player(uid=0, board=[], hand=[])
+        p.board = [Unit.create_from_db(CardIDs.WRATH_WEAVER, uid=1, owner_id=0)]
+        p.hand = [self._card(CardIDs.WRATH_WEAVER, 2)]
+        assert p.card_counts.zones(CardIDs.WRATH_WEAVER) == (1, 1)
+
+    def test_clone_and_pickle_keep_counts(self) -> None:
+        import pickle
+
+        p = Player(uid=0, board=[], hand=[self._card(CardIDs.MICROBOT, 1)])
+        p.board.append(Unit.create_from_db(CardIDs.MICROBOT, uid=2, owner_id=0))
+        for copy in (p.clone(), pickle.loads(pickle.dumps(p))):
+            assert copy.card_counts.zones(CardIDs.MICROBOT) == (1, 1)
+            copy.hand.pop()
+            assert copy.card_counts.zones(CardIDs.MICROBOT) == (0, 1)
+        assert p.card_counts.zones(CardIDs.MICROBOT) == (1, 1)
+
+    def test_index_matches_scan_through_a_game(self) -> None:
+        import random
+
+        game = Game(seed=3)
+        rng = random.Random(3)
+        for _ in range(400):
+            if game.game_over:
+                break
+            for idx, p in enumerate(game.players):
+                bits = game.legal_actions(idx)
+                legal = [i for i in range(34) if bits >> i & 1]
+                game.step_int(idx, rng.choice(legal))
+                scan = _scan_counts(p)
+                assert {cid: p.card_counts.get(cid) for cid in scan} == scan
+                assert sum(p.hand.card_counts.values()) == sum(1 for c in p.hand if c.unit)
+                assert sum(p.board.card_counts.values()) == len(p.board)
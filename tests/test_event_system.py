@@ -13,13 +13,15 @@ from typing import TYPE_CHECKING, Callable, Dict
 import pytest
 
 from hearthstone.engine.entities import HandCard, Player, Spell, StoreItem, Unit
-from hearthstone.engine.enums import CardIDs, EffectIDs, SpellIDs
+from hearthstone.engine.enums import CardIDs, EffectIDs, MechanicType, SpellIDs
 from hearthstone.engine.event_system import (
     EffectContext,
     EntityRef,
     Event,
     EventType,
+    PosRef,
     Zone,
+    pos_ref,
 )
 
 if TYPE_CHECKING:
@@ -437,6 +439,68 @@ class TestTriggerCollection:
         assert len(crab_trigs) == 0  # Skipped because count <= 0
 
 
+class TestProcessEvents:
+    """EventManager.process_events: one context and one trigger scan for a batch."""
+
+    @staticmethod
+    def _shop_events(player: Player, mock_unit: Callable[..., Unit]) -> list:
+        events = []
+        for cid in (CardIDs.CRACKLING_CYCLONE, CardIDs.MICROBOT, CardIDs.DUNE_DWELLER):
+            unit = mock_unit(cid, owner_id=player.uid)
+            player.store.append(StoreItem(unit=unit))
+            events.append(
+                Event(
+                    event_type=EventType.MINION_ADDED_TO_SHOP,
+                    source=EntityRef(uid=unit.uid),
+                    source_pos=pos_ref(player.uid, Zone.SHOP, len(player.store) - 1),
+                )
+            )
+        return events
+
+    def test_batch_matches_consecutive_dispatch(
+        self,
+        empty_game: "Game",
+        mock_unit: Callable[..., Unit],
+    ) -> None:
+        em = empty_game.event_manager
+        batched, single = empty_game.players
+        for p in (batched, single):
+            p.store.clear()
+            p.mechanics.modify_stat(MechanicType.ELEMENTAL_BUFF, 2, 1)
+
+        em.process_events(self._shop_events(batched, mock_unit), {batched.uid: batched}, lambda: 0)
+        for event in self._shop_events(single, mock_unit):
+            em.process_event(event, {single.uid: single}, lambda: 0)
+
+        stats = [
+            [(u.perm_atk_add, u.perm_hp_add) for u in (i.unit for i in p.store)]
+            for p in (batched, single)
+        ]
+        assert stats[0] == stats[1] == [(2, 1), (0, 0), (2, 1)]
+
+    def test_listeners_collected_once_unless_card_triggers(
+        self,
+        empty_game: "Game",
+        mock_unit: Callable[..., Unit],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        em = empty_game.event_manager
+        p = empty_game.players[0]
+        p.store.clear()
+        calls = []
+        collect = em.collect_triggers
+        monkeypatch.setattr(em, "collect_triggers", lambda e, c: calls.append(e) or collect(e, c))
+
+        em.process_events(self._shop_events(p, mock_unit), {p.uid: p}, lambda: 0)
+        assert len(calls) == 1
+
+        calls.clear()
+        p.board.append(mock_unit(CardIDs.WRATH_WEAVER, owner_id=p.uid))
+        played = [Event(event_type=EventType.MINION_PLAYED) for _ in range(3)]
+        em.process_events(played, {p.uid: p}, lambda: 0)
+        assert len(calls) == 3
+
+
 # ===================================================================
 #  6. REINDEX
 # ===================================================================
@@ -471,3 +535,29 @@ class TestReindex:
         ctx._reindex_side(0)
 
         assert ctx.resolve_unit(EntityRef(uid=1)) is None
+
+    def test_reindex_reuses_interned_pos_refs(self) -> None:
+        p = Player(uid=0, board=[], hand=[])
+        u1 = Unit.create_from_db(CardIDs.MICROBOT, uid=1, owner_id=0)
+        u2 = Unit.create_from_db(CardIDs.MICROBOT, uid=2, owner_id=0)
+        p.board = [u1, u2]
+        ctx = _make_context({0: p})
+        before = ctx.resolve_pos(EntityRef(uid=2))
+
+        p.board.reverse()
+        ctx._reindex_side(0)
+
+        assert ctx.resolve_pos(EntityRef(uid=1)) is before
+        assert before is pos_ref(0, Zone.BOARD, 1)
+        assert before == PosRef(side=0, zone=Zone.BOARD, slot=1)
+
+
+class TestEventSlots:
+    """Event bus value types are slotted (no per-instance __dict__)."""
+
+    def test_event_types_have_no_dict(self) -> None:
+        event = Event(event_type=EventType.MINION_DAMAGED, source=EntityRef(1), value=2)
+
+        assert not hasattr(event, "__dict__")
+        assert not hasattr(event.source, "__dict__")
+        assert not hasattr(pos_ref(0, Zone.HAND, 0), "__dict__")
@@ -10,12 +10,20 @@ No unittest, no mocks of core logic.
 
 from __future__ import annotations
 
+import copy
+import pickle
 import random
 from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
 
 import pytest
 
-from hearthstone.engine.auras import recalculate_board_auras
+from hearthstone.engine.auras import (
+    AURA_REGISTRY,
+    Board,
+    _adjacent_buff_aura,
+    recalculate_board_auras,
+    refresh_aura_sources,
+)
 from hearthstone.engine.combat import CombatManager
 from hearthstone.engine.entities import HandCard, Player, Spell, StoreItem, Unit
 from hearthstone.engine.enums import (
@@ -275,6 +283,77 @@ class TestAuraRecalculation:
         assert unit.aura_atk_add == 0
         assert unit.aura_hp_add == 0
 
+    def test_board_without_sources_is_never_dirty(
+        self,
+        mock_unit: Callable[..., Unit],
+    ) -> None:
+        """Boards with no aura sources skip recalculation entirely."""
+        board = Board([mock_unit(CardIDs.MICROBOT)])
+        board.append(mock_unit(CardIDs.ANNOY_O_TRON))
+        board.pop(0)
+
+        assert board.aura_sources == 0
+        assert not board.aura_dirty
+
+    def test_board_tracks_aura_source_insert_and_remove(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        mock_unit: Callable[..., Unit],
+    ) -> None:
+        """Adding/removing a source marks the board dirty; removal clears stale aura adds."""
+        monkeypatch.setitem(AURA_REGISTRY, CardIDs.FLIGHTY_SCOUT, _adjacent_buff_aura(1, 1))
+        left = mock_unit(CardIDs.MICROBOT)
+        board = Board([left])
+        source = mock_unit(CardIDs.FLIGHTY_SCOUT)
+
+        board.append(source)
+        assert board.aura_sources == 1
+        assert board.aura_dirty
+
+        recalculate_board_auras(board)
+        assert not board.aura_dirty
+        assert left.aura_atk_add == 1
+
+        board.remove(source)
+        assert board.aura_sources == 0
+        recalculate_board_auras(board)
+        assert left.aura_atk_add == 0
+        assert not board.aura_dirty
+
+    def test_attached_aura_refreshes_source_count(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        mock_unit: Callable[..., Unit],
+    ) -> None:
+        """A unit that becomes a source after insertion is picked up by refresh_aura_sources."""
+        monkeypatch.setitem(AURA_REGISTRY, "TEST_AURA", _adjacent_buff_aura(2, 0))
+        unit = mock_unit(CardIDs.MICROBOT)
+        neighbour = mock_unit(CardIDs.ANNOY_O_TRON)
+        board = Board([unit, neighbour])
+        unit.attached_perm["TEST_AURA"] = 1
+
+        refresh_aura_sources(board)
+        recalculate_board_auras(board)
+
+        assert board.aura_sources == 1
+        assert neighbour.aura_atk_add == 2
+
+    def test_board_pickles_with_aura_state(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        mock_unit: Callable[..., Unit],
+    ) -> None:
+        """Board survives pickle/deepcopy with its source count and dirty flag."""
+        monkeypatch.setitem(AURA_REGISTRY, CardIDs.FLIGHTY_SCOUT, _adjacent_buff_aura(1, 1))
+        board = Board([mock_unit(CardIDs.MICROBOT), mock_unit(CardIDs.FLIGHTY_SCOUT)])
+        recalculate_board_auras(board)
+
+        for copied in (pickle.loads(pickle.dumps(board)), copy.deepcopy(board)):
+            assert isinstance(copied, Board)
+            assert len(copied) == 2
+            assert copied.aura_sources == 1
+            assert not copied.aura_dirty
+
     @pytest.mark.skip(reason="DIRE_WOLF_ALPHA, MURLOC_WARLEADER, SOUTHSEA_CAPTAIN auras not in current patch")
     def test_type_aura_buffs_matching_type(self) -> None:
         pass
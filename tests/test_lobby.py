@@ -0,0 +1,208 @@
+"""Tests for the N-player Lobby.
+
+Covers: shared pool, round resolution, pairing (no self / repeat pairs,
+ghosts), elimination and placements, batched C++ combat submission.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from hearthstone.engine import combat as combat_module
+from hearthstone.engine.entities import HandCard, Unit
+from hearthstone.engine.enums import BattleOutcome, CardIDs
+from hearthstone.engine.lobby import GHOST, Lobby
+
+
+def _end_round(lobby: Lobby) -> None:
+    for uid in list(lobby.alive):
+        lobby.step(uid, "END_TURN")
+
+
+class _FakeCpp:
+    """Stands in for hs_engine_cpp: records batches, the bigger board wins by 5."""
+
+    def __init__(self) -> None:
+        self.batches: List[list] = []
+
+    def fast_combat_pairs(self, combats: list) -> list:
+        self.batches.append(combats)
+        results = []
+        for side0, side1, _seed, _tier0, _tier1 in combats:
+            if len(side0) > len(side1):
+                results.append((BattleOutcome.WIN.value, 5))
+            elif len(side1) > len(side0):
+                results.append((BattleOutcome.LOSE.value, -5))
+            else:
+                results.append((BattleOutcome.DRAW.value, 0))
+        return results
+
+
+# ===================================================================
+#  1. SHARED STATE
+# ===================================================================
+
+
+class TestLobbySetup:
+    def test_all_players_share_one_pool(self, lobby: Lobby) -> None:
+        assert lobby.tavern.pool is lobby.pool
+        assert len(lobby.players) == 8
+        shop_units = sum(1 for p in lobby.players for item in p.store if item.unit)
+        assert lobby.pool.total + shop_units == sum(
+            len(cards) for cards in type(lobby.pool)(rng=lobby.rng).tiers.values()
+        )
+
+    def test_round_waits_for_every_alive_player(self, lobby: Lobby) -> None:
+        for uid in range(7):
+            lobby.step(uid, "END_TURN")
+        assert lobby.turn_count == 1
+
+        lobby.step(7, "END_TURN")
+        assert lobby.turn_count == 2
+        assert not any(lobby.players_ready.values())
+
+    def test_too_few_players_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            Lobby(num_players=1)
+
+
+# ===================================================================
+#  2. PAIRING
+# ===================================================================
+
+
+class TestLobbyPairing:
+    def test_everyone_fights_exactly_once(self, lobby: Lobby) -> None:
+        _end_round(lobby)
+
+        fighters = [uid for pair in lobby.last_pairings for uid in pair]
+        assert sorted(fighters) == list(range(8))
+        assert all(a != b for a, b in lobby.last_pairings)
+
+    def test_avoids_repeat_opponent(self, lobby: Lobby) -> None:
+        for _ in range(5):
+            previous = dict(lobby.last_opponent)
+            _end_round(lobby)
+            for a, b in lobby.last_pairings:
+                assert previous.get(a) != b
+
+    def test_odd_player_fights_ghost_of_last_eliminated(self, lobby: Lobby) -> None:
+        lobby.players[5].board.append(Unit.create_from_db(CardIDs.ANNOY_O_TRON, 9000, 5))
+        lobby.players[5].health = 0
+        lobby.players[5].hand.clear()
+        for uid in range(8):
+            if uid != 5:
+                lobby.players[uid].health = 1000
+        _end_round(lobby)
+        assert 5 not in lobby.alive
+
+        _end_round(lobby)
+        ghost_pairs = [pair for pair in lobby.last_pairings if pair[1] == GHOST]
+        assert len(ghost_pairs) == 1
+        assert lobby.players[5].health <= 0
+        assert lobby.last_opponent[ghost_pairs[0][0]] == GHOST
+
+
+# ===================================================================
+#  3. ELIMINATION
+# ===================================================================
+
+
+class TestLobbyElimination:
+    def test_dead_player_is_placed_and_released(
+        self, lobby: Lobby, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: _FakeCpp())
+        for p in lobby.players:
+            if p.uid != 2:
+                p.board.append(Unit.create_from_db(CardIDs.ANNOY_O_TRON, 9000 + p.uid, p.uid))
+        loser = lobby.players[2]
+        loser.health = 1
+        shop_units = sum(1 for item in loser.store if item.unit)
+        pool_before = lobby.pool.total
+        _end_round(lobby)
+
+        assert lobby.placements == {2: 8}
+        assert 2 not in lobby.alive and len(lobby.alive) == 7
+        assert loser.store == [] and loser.hand == []
+        # Shops of the others are refreshed 1:1, the loser's shop goes back
+        assert lobby.pool.total == pool_before + shop_units
+
+    def test_last_player_standing_wins(
+        self, lobby: Lobby, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: _FakeCpp())
+        for p in lobby.players:
+            p.board.append(Unit.create_from_db(CardIDs.ANNOY_O_TRON, 9000 + p.uid, p.uid))
+            p.health = 1
+        lobby.players[0].board.append(Unit.create_from_db(CardIDs.MICROBOT, 9100, 0))
+        while not lobby.game_over:
+            _end_round(lobby)
+
+        assert lobby.winner_id == 0
+
+        assert lobby.winner_id is not None
+        assert lobby.placements[lobby.winner_id] == 1
+        assert sorted(lobby.placements.values()) == list(range(1, 9))
+        done = lobby.step(lobby.winner_id, "ROLL")
+        assert done == (True, True, "Game Over")
+
+    def test_eliminated_player_cannot_act(
+        self, lobby: Lobby, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: _FakeCpp())
+        lobby.players[4].health = 1
+        for p in lobby.players:
+            if p.uid != 4:
+                p.board.append(Unit.create_from_db(CardIDs.ANNOY_O_TRON, 9000 + p.uid, p.uid))
+        _end_round(lobby)
+        out = next(iter(lobby.placements))
+
+        assert lobby.step(out, "ROLL") == (False, False, "Player eliminated")
+
+
+# ===================================================================
+#  4. BATCHED COMBAT
+# ===================================================================
+
+
+class TestLobbyBatchedCombat:
+    def test_round_is_one_cpp_call(self, lobby: Lobby, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = _FakeCpp()
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: fake)
+        _end_round(lobby)
+
+        assert len(fake.batches) == 1
+        assert len(fake.batches[0]) == 4
+        side0, side1, seed, tier0, tier1 = fake.batches[0][0]
+        assert isinstance(seed, int) and tier0 == tier1 == 1
+
+    def test_python_fallback_resolves_every_pair(self, lobby: Lobby) -> None:
+        results = lobby.combat.resolve_combats(
+            [(lobby.players[0], lobby.players[1]), (lobby.players[2], lobby.players[3])],
+            use_cpp=False,
+        )
+        assert [r[0] for r in results] == [BattleOutcome.DRAW, BattleOutcome.DRAW]
+
+    def test_hand_start_of_combat_leaves_board_alone(
+        self, lobby: Lobby, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = _FakeCpp()
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: fake)
+        scout = Unit.create_from_db(CardIDs.FLIGHTY_SCOUT, 9000, 0)
+        lobby.players[0].hand.append(HandCard(uid=scout.uid, unit=scout))
+        for _ in range(3):
+            _end_round(lobby)
+
+        # The Flighty Scout copy fights every round but is never put on the real board
+        assert lobby.players[0].board == []
+        sides = [
+            side
+            for batch in fake.batches
+            for side0, side1, *_ in batch
+            for side in (side0, side1)
+            if side
+        ]
+        assert len(sides) == 3 and all(len(side) == 1 for side in sides)
@@ -167,6 +167,28 @@ class TestCardEmbeddings:
         assert out.shape == (1, 64)
         assert torch.isfinite(out).all()
 
+    def test_compact_obs_decodes_like_flat(self):
+        """HSTransformerAgent parses a compact obs into the same tokens as the flat one."""
+        from scripts.model import HSTransformerAgent
+        from hearthstone.env.compact_obs import to_compact
+        env = HearthstoneEnv()
+        rng = np.random.default_rng(0)
+        obs, _ = env.reset(seed=42)
+        rows = []
+        for _ in range(30):
+            rows.append(obs.copy())
+            obs, *_ = env.step(int(rng.choice(np.flatnonzero(env.action_masks()))))
+        flat = np.stack(rows)
+        agent = HSTransformerAgent(d_model=32, n_heads=2, n_layers=1, num_card_ids=env.num_card_ids)
+        compact = {k: torch.tensor(v) for k, v in to_compact(flat).items()}
+        val, team, ctx = agent._parse_obs(torch.tensor(flat))
+        c_val, c_team, c_ctx = agent._parse_obs(compact)
+        assert torch.allclose(c_val, val, atol=1e-6)
+        assert torch.equal(c_team, team)
+        assert torch.equal(c_ctx, ctx)
+        with torch.no_grad():
+            assert torch.allclose(agent(compact)[0], agent(torch.tensor(flat))[0], atol=1e-5)
+
 
 # ===================================================================
 #  3. REWARD FUNCTION
@@ -252,20 +274,18 @@ class TestMCOracle:
         """Oracle seed should change after evaluation."""
         initial_seed = env._oracle_seed
         env._oracle_prepare_ghost()
-        if env._oracle_ghost_cpp is not None:
+        if env._oracle_ghost is not None:
             player = env.game.players[env.my_player_id]
             env._oracle_eval_winrate(player)
             assert env._oracle_seed != initial_seed
 
-    def test_oracle_without_cpp_returns_half(self, env):
-        """Without C++ engine, oracle should return 0.5 (no delta)."""
-        from hearthstone.engine.cpp_bridge import get_cpp_engine
-        cpp = get_cpp_engine()
-        if cpp is None:
-            # No C++ available — oracle should be inert
-            player = env.game.players[env.my_player_id]
-            wr = env._oracle_eval_winrate(player)
-            assert wr == 0.5
+    def test_oracle_without_board_returns_half(self, env):
+        """With no board to evaluate, oracle should return 0.5 (no delta)."""
+        player = env.game.players[env.my_player_id]
+        player.board = []
+        env._oracle_prepare_ghost()
+        wr = env._oracle_eval_winrate(player)
+        assert wr == 0.5
 
     def test_oracle_reward_is_delta_based(self, env):
         """Oracle reward should be (wr_after - wr_before) * scale."""
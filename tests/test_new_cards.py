@@ -1125,7 +1125,7 @@ class TestRylakMetalhead:
                     owner_id=player.uid,
                     pos=PosRef(side=player.uid, zone=Zone.BOARD, slot=0),
                     atk=rylak.cur_atk, hp=rylak.cur_hp,
-                    types=rylak.types, tags=rylak.tags,
+                    type_mask=rylak.type_mask, tag_mask=rylak.tag_mask,
                 ),
             ),
             {player.uid: player},
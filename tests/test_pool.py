@@ -179,6 +179,63 @@ class TestCardPoolDiscovery:
         assert drawn == []
 
 
+# ===================================================================
+#  4b. COUNT-VECTOR POOL (reset / count / draw_matching)
+# ===================================================================
+
+
+class TestCardPoolCounts:
+    """Per-card copy counters behind the pool."""
+
+    def test_count_matches_tier_view(self) -> None:
+        pool = CardPool()
+        cid = CardIDs.MANASABER
+        tier = CARD_DB[cid]["tier"]
+        pool.draw_discovery_cards(
+            1, tier=tier, exact_tier=True, predicate=lambda d: d is CARD_DB[cid]
+        )
+        assert pool.count(cid) == pool.tiers[tier].count(cid) == TIER_COPIES[tier] - 1
+
+    def test_reset_restores_initial_counts(self) -> None:
+        pool = CardPool()
+        total_before = pool.total
+        pool.draw_cards(40, max_tier=6)
+        pool.return_cards([CardIDs.ANNOY_O_TRON])
+
+        pool.reset()
+
+        assert pool.total == total_before
+        expected = TIER_COPIES[CARD_DB[CardIDs.ANNOY_O_TRON]["tier"]]
+        assert pool.count(CardIDs.ANNOY_O_TRON) == expected
+
+    def test_draw_exhausts_exactly_the_pool(self) -> None:
+        pool = CardPool(max_tier=1)
+        total = pool.total
+        drawn = pool.draw_cards(total, max_tier=1)
+
+        assert pool.total == 0
+        assert sorted(drawn) == sorted(CardPool(max_tier=1).tiers[1])
+
+    def test_draw_matching_respects_predicate_and_removes_copy(self) -> None:
+        pool = CardPool()
+
+        def predicate(data: dict) -> bool:
+            return UnitType.MURLOC in data.get("type", [])
+
+        total_before = pool.total
+
+        chosen = pool.draw_matching(predicate, tier=1)
+
+        assert chosen is not None
+        assert CARD_DB[chosen]["tier"] == 1
+        assert predicate(CARD_DB[chosen])
+        assert pool.total == total_before - 1
+
+    def test_draw_matching_none_when_no_candidates(self) -> None:
+        pool = CardPool()
+        assert pool.draw_matching(lambda data: False) is None
+
+
 # ===================================================================
 #  5. SPELL POOL
 # ===================================================================
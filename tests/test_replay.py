@@ -0,0 +1,109 @@
+"""Tests for action-log replays (env/replay.py): format round-trip and determinism."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from hearthstone.env.hs_env import HearthstoneEnv
+from hearthstone.env.replay import (
+    SMART_BOT,
+    ActionLog,
+    decode_varints,
+    encode_varints,
+    load_logs,
+    replay,
+    replay_dataset,
+    save_logs,
+    weights_id,
+)
+from tests.helpers import random_legal_action
+
+
+def record(seed: int, max_steps: int = 150):
+    """Play random legal actions; returns (log, obs list, mask list)."""
+    env = HearthstoneEnv()
+    rng = np.random.default_rng(seed)
+    obs, _ = env.reset(seed=seed)
+    log = ActionLog(seed=seed, max_tier=6)
+    obs_buf, mask_buf = [], []
+    for _ in range(max_steps):
+        mask = env.action_masks()
+        action = random_legal_action(rng, mask)
+        obs_buf.append(obs.copy())
+        mask_buf.append(mask.copy())
+        log.actions.append(action)
+        obs, _, done, truncated, _ = env.step(action)
+        if done or truncated:
+            break
+    return log, obs_buf, mask_buf
+
+
+class TestFormat:
+    def test_varint_round_trip(self) -> None:
+        values = [0, 1, 33, 127, 128, 300, 1 << 20]
+        data = encode_varints(values)
+        assert len(data) == 1 + 1 + 1 + 1 + 2 + 2 + 3
+        assert decode_varints(data, len(values)) == (values, len(data))
+
+    def test_action_log_round_trip(self) -> None:
+        log = ActionLog(seed=2**63 + 5, max_tier=4, bot_id="abc", actions=[0, 1, 33, 2])
+        assert ActionLog.from_bytes(log.to_bytes()) == log
+
+    def test_one_byte_per_action(self) -> None:
+        short = ActionLog(seed=1, actions=[1] * 10).to_bytes()
+        long = ActionLog(seed=1, actions=[1] * 1010).to_bytes()
+        assert len(long) - len(short) == 1000
+
+    def test_rejects_foreign_payload(self) -> None:
+        data = bytearray(ActionLog(seed=1).to_bytes())
+        data[5] ^= 0xFF  # layout crc
+        with pytest.raises(ValueError, match="layout"):
+            ActionLog.from_bytes(bytes(data))
+        with pytest.raises(ValueError, match="action log"):
+            ActionLog.from_bytes(b"XXX" + bytes(data[3:]))
+
+    def test_file_round_trip(self, tmp_path) -> None:
+        logs = [ActionLog(seed=i, actions=list(range(i))) for i in range(5)]
+        path = tmp_path / "logs.hsr"
+        save_logs(path, logs)
+        assert load_logs(path) == logs
+
+    def test_weights_id(self) -> None:
+        w = np.arange(23, dtype=np.float32)
+        assert weights_id(None) == SMART_BOT
+        assert weights_id(w) == weights_id(w.astype(np.float64))
+        assert weights_id(w) != weights_id(w + 1)
+
+
+class TestReplay:
+    def test_replay_reproduces_observations(self) -> None:
+        log, obs_buf, mask_buf = record(seed=11)
+        steps = list(replay(ActionLog.from_bytes(log.to_bytes())))
+        assert len(steps) == len(log.actions)
+        for (obs, mask, action), ref_obs, ref_mask, ref_action in zip(
+            steps, obs_buf, mask_buf, log.actions
+        ):
+            np.testing.assert_array_equal(obs, ref_obs)
+            np.testing.assert_array_equal(mask, ref_mask)
+            assert action == ref_action
+
+    def test_replay_dataset_stacks_logs_in_order(self) -> None:
+        logs = [record(seed=s, max_steps=40)[0] for s in (3, 4)]
+        obs, masks, actions = replay_dataset(logs)
+        assert obs.shape == (len(actions), 1036) and obs.dtype == np.float32
+        assert masks.shape == (len(actions), 34) and masks.dtype == np.bool_
+        assert actions.tolist() == logs[0].actions + logs[1].actions
+        # Every recorded action was legal under its regenerated mask
+        assert masks[np.arange(len(actions)), actions].all()
+
+    def test_enemy_weights_must_match(self) -> None:
+        log = ActionLog(seed=1, enemy_id=weights_id(np.ones(23, dtype=np.float32)))
+        with pytest.raises(ValueError, match="Enemy weights"):
+            list(replay(log))
+
+    def test_divergence_detected(self) -> None:
+        log, _, _ = record(seed=5, max_steps=500)
+        log.actions += [0, 0]  # past the end of the episode
+        with pytest.raises(ValueError, match="diverged"):
+            list(replay(log))
@@ -1,19 +1,30 @@
 """Tests for the RL environment (hs_env.py).
 
 Covers: observation space shape/range, action masks for every phase,
-action mapping, step cycle, entity encoding, bot turn, auto-positioning.
+action mapping, step cycle, entity encoding, incremental obs, bot turn, auto-positioning.
 
 This is the SINGLE BIGGEST coverage gap — 834 lines of hs_env.py had ZERO tests.
 """
 
 from __future__ import annotations
 
+import multiprocessing
+import random
+import threading
+import time
+from typing import Any
+
 import numpy as np
 import pytest
 
+from hearthstone.engine import combat as combat_module
+from hearthstone.engine.actions import ZONE_STORE
 from hearthstone.engine.entities import HandCard, Spell, StoreItem, Unit
 from hearthstone.engine.enums import CardIDs, SpellIDs, Tags
+from hearthstone.env import hs_env
 from hearthstone.env.hs_env import HearthstoneEnv
+from hearthstone.env.perf_stats import PERF_PHASES
+from tests.helpers import random_legal_action
 
 
 @pytest.fixture()
@@ -50,6 +61,11 @@ class TestObservationSpace:
         obs2, _ = env.reset(seed=2)
         assert obs1.shape == obs2.shape
 
+    def test_reset_with_same_seed_is_reproducible(self, env: HearthstoneEnv) -> None:
+        obs1, _ = env.reset(seed=7)
+        obs2, _ = env.reset(seed=7)
+        np.testing.assert_array_equal(obs1, obs2)
+
     def test_obs_after_step_has_correct_shape(self, env: HearthstoneEnv) -> None:
         env.reset(seed=42)
         obs, reward, done, truncated, info = env.step(0)  # END_TURN
@@ -215,6 +231,23 @@ class TestStepCycle:
         assert isinstance(done, bool)
         assert isinstance(truncated, bool)
 
+    def test_reset_and_step_return_next_action_mask(self, env: HearthstoneEnv) -> None:
+        _, info = env.reset(seed=42)
+        np.testing.assert_array_equal(info["action_mask"], env.action_masks())
+        for action in (1, 0, 1):
+            _, _, _, _, info = env.step(action)
+            np.testing.assert_array_equal(info["action_mask"], env.action_masks())
+        env.mask_in_info = False
+        assert env.step(0)[4] == {}
+
+    def test_sync_vector_env_batches_info_masks(self) -> None:
+        import gymnasium
+
+        envs = gymnasium.vector.SyncVectorEnv([HearthstoneEnv, HearthstoneEnv])
+        _, infos = envs.reset(seed=1)
+        assert infos["action_mask"].shape == (2, 34)
+        np.testing.assert_array_equal(infos["action_mask"], np.array(envs.call("action_masks")))
+
     def test_step_roll_deducts_gold(self, env: HearthstoneEnv) -> None:
         env.reset(seed=42)
         player = env.game.players[env.my_player_id]
@@ -345,6 +378,198 @@ class TestEntityEncoding:
         vec = env._encode_single_entity(item)
         assert vec[5] == 1.0  # is_frozen
 
+    def test_template_table_static_columns(self, env: HearthstoneEnv) -> None:
+        table = env._entity_templates
+        assert table.shape == (2 * env.num_card_ids, env.entity_features)
+        assert table.dtype == np.float32
+        row = env.static_id_map[CardIDs.MICROBOT]
+        unit_vec = env._encode_single_entity(Unit.create_from_db(CardIDs.MICROBOT, 9999, 0))
+        for col in (0, 1, 2, 18, 19, 20, 21, 22, 23, 24):
+            assert table[row, col] == unit_vec[col]
+
+    def test_zone_encoding_matches_per_entity(self, env: HearthstoneEnv) -> None:
+        """_get_obs (template rows, vectorized) == _encode_entity_fast slot by slot."""
+        rng = np.random.default_rng(3)
+        env.reset(seed=3)
+        ef = env.entity_features
+        zones = (("BOARD", 0, 7), ("HAND", 7, 10), ("STORE", 17, 7), ("DISCOVER", 24, 3))
+        for t in range(400):
+            obs = env._get_obs().copy()
+            p = env.game.players[env.my_player_id]
+            items = {
+                "BOARD": p.board,
+                "HAND": p.hand,
+                "STORE": p.store,
+                "DISCOVER": p.discovery.options if p.is_discovering else [],
+            }
+            slots = obs[env._off_board : env._off_enemy].reshape(27, ef)
+            for zone, first, n_slots in zones:
+                for i in range(n_slots):
+                    ref = np.zeros(ef, dtype=np.float32)
+                    if i < len(items[zone]):
+                        env._encode_entity_fast(items[zone][i], ref, 0, i, zone)
+                    np.testing.assert_array_equal(slots[first + i], ref)
+            action = random_legal_action(rng, env.action_masks())
+            _, _, done, truncated, _ = env.step(action)
+            if done or truncated:
+                env.reset(seed=t)
+
+
+class TestIncrementalObs:
+    """step() re-encodes only dirty zones; debug_obs checks against a full encode."""
+
+    def test_random_play_matches_full_encode(self, env: HearthstoneEnv) -> None:
+        env.debug_obs = True
+        for seed in range(5):
+            rng = np.random.default_rng(seed)
+            env.reset(seed=seed)
+            done = truncated = False
+            while not (done or truncated):
+                action = random_legal_action(rng, env.action_masks(), end_turn_p=0.05)
+                _, _, done, truncated, _ = env.step(action)  # raises on stale zones
+
+    def test_out_of_band_change_forces_full_encode(self, env: HearthstoneEnv) -> None:
+        env.debug_obs = True
+        env.reset(seed=42)
+        player = env.game.players[env.my_player_id]
+        player.gold = 10
+        player.board.append(Unit.create_from_db(CardIDs.MICROBOT, 9999, player.uid))
+        obs, *_ = env.step(32)  # UPGRADE alone would re-encode no zone
+        assert env.game.players[env.my_player_id].tavern_tier == 2
+        assert obs[env._off_board] == 1.0
+
+    def test_debug_check_detects_stale_zone(self, env: HearthstoneEnv) -> None:
+        env.reset(seed=42)
+        player = env.game.players[env.my_player_id]
+        player.store[0].unit.cur_atk += 5
+        env.debug_obs = False  # also under HS_DEBUG_OBS=1
+        env._get_obs(dirty=0)  # debug off: stale store slot goes unnoticed
+        env.debug_obs = True
+        with pytest.raises(RuntimeError, match="Stale observation"):
+            env._get_obs(dirty=0)
+        env._get_obs(dirty=ZONE_STORE)
+
+
+class _FakeCombatEngine:
+    """fast_combat_batch with seed-determined outcomes; records the calling thread."""
+
+    def __init__(self) -> None:
+        self.threads: list[str] = []
+
+    def fast_combat_batch(self, side0, side1, seed, n, tavern_tier_0, tavern_tier_1):
+        self.threads.append(threading.current_thread().name)
+        rng = random.Random(seed)
+        return [(2 if rng.random() < 0.5 else 0, 0) for _ in range(n)]
+
+
+class TestAsyncOracle:
+    """END_TURN oracle evaluation runs on a worker thread and is collected lazily."""
+
+    @staticmethod
+    def _play(env: HearthstoneEnv, seed: int = 3) -> list[float]:
+        rng = np.random.default_rng(seed)
+        env.reset(seed=seed)
+        winrates = []
+        for _ in range(300):
+            # Buy and play, rarely sell
+            action = random_legal_action(rng, env.action_masks(), end_turn_p=0.05, sell_p=0.1)
+            _, _, done, truncated, _ = env.step(action)
+            if done or truncated:
+                break
+            if action == 0:
+                winrates.append(env._oracle_collect())
+        return winrates
+
+    def test_async_matches_sync(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = _FakeCombatEngine()
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: fake)
+        sync = self._play(HearthstoneEnv(oracle_async=False))
+        assert fake.threads and all(t == threading.current_thread().name for t in fake.threads)
+        fake.threads.clear()
+        assert self._play(HearthstoneEnv()) == sync
+        assert any(t != 0.5 for t in sync)
+        assert fake.threads and all(t.startswith("hs-oracle") for t in fake.threads)
+
+    def test_python_engine_without_cpp(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: None)
+        sync = self._play(HearthstoneEnv(oracle_async=False))
+        assert any(t != 0.5 for t in sync)
+        assert self._play(HearthstoneEnv()) == sync
+
+    def test_zero_combats_disables_oracle(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = _FakeCombatEngine()
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: fake)
+        assert set(self._play(HearthstoneEnv(oracle_n_combats=0))) <= {0.5}
+        assert fake.threads == []
+        with pytest.raises(ValueError, match="oracle_n_combats"):
+            HearthstoneEnv(oracle_n_combats=-1)
+
+    def test_reset_drops_pending_eval(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(combat_module, "get_cpp_engine", lambda: _FakeCombatEngine())
+        env = HearthstoneEnv()
+        self._play(env)
+        env._oracle_submit(env.game.players[env.my_player_id])
+        assert env._oracle_pending is not None
+        env.reset(seed=0)
+        assert env._oracle_pending is None
+        assert env._oracle_collect() == 0.5
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork()"
+    )
+    def test_forked_child_gets_own_executor(self) -> None:
+        assert hs_env._oracle_executor().submit(abs, -1).result() == 1
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        child = ctx.Process(target=_submit_to_oracle_executor, args=(queue,))
+        child.start()
+        try:
+            # The parent's executor has no threads in the child: without the
+            # at-fork reset this would wait forever
+            assert queue.get(timeout=30) == 1
+        finally:
+            child.join(timeout=30)
+            if child.is_alive():
+                child.kill()
+        assert child.exitcode == 0
+
+
+def _submit_to_oracle_executor(queue: Any) -> None:
+    queue.put(hs_env._oracle_executor().submit(abs, -1).result(timeout=10))
+
+
+class TestPerfStats:
+    """perf_stats=True: exclusive per-phase timers; disabled envs are not wrapped."""
+
+    def test_disabled_env_is_untouched(self, env: HearthstoneEnv) -> None:
+        env.reset(seed=0)
+        env.step(0)
+        assert env.get_perf_stats() == {}
+        assert "_get_obs" not in vars(env) and "step" not in vars(env.game)
+
+    def test_phases_cover_env_time(self) -> None:
+        env = HearthstoneEnv(perf_stats=True)
+        rng = np.random.default_rng(0)
+        t0 = time.perf_counter_ns()
+        env.reset(seed=0)
+        end_turns = 0
+        for t in range(400):
+            action = random_legal_action(rng, env.action_masks())
+            _, _, done, truncated, _ = env.step(action)
+            end_turns += action in (0, 33)
+            if done or truncated:
+                env.reset(seed=t)
+        wall = time.perf_counter_ns() - t0
+
+        stats = env.get_perf_stats()
+        assert set(stats) == {f"{p}_{k}" for p in PERF_PHASES for k in ("ns", "calls")}
+        assert stats["step_calls"] == 400
+        assert stats["combat_calls"] == stats["enemy_turn_calls"] == stats["end_turn_calls"]
+        assert 0 < stats["end_turn_calls"] <= end_turns
+        assert all(stats[f"{p}_ns"] >= 0 for p in PERF_PHASES)
+        assert 0 < sum(stats[f"{p}_ns"] for p in PERF_PHASES) <= wall
+        # take() starts a new window
+        assert env.get_perf_stats()["step_calls"] == 0
 
 # ===================================================================
 #  5. _can_play_card EDGE CASES
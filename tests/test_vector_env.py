@@ -0,0 +1,246 @@
+"""Tests for the in-process vector env (env/vector_env.py).
+
+Covers: batch buffers shared with the sub-envs, equivalence with independent
+HearthstoneEnv instances, SAME_STEP autoreset, batched enemy turns, self-play,
+sharded variant.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from hearthstone.env.ghost_pool import GhostPool
+from hearthstone.env.hs_env import HearthstoneEnv
+from hearthstone.env.perf_stats import merge_perf_stats
+from hearthstone.env.vector_env import (
+    HearthstoneVectorEnv,
+    SelfPlayVectorEnv,
+    ShardedHearthstoneVectorEnv,
+)
+from tests.helpers import random_legal_action
+
+
+def _random_actions(rng: np.random.Generator, masks: np.ndarray) -> np.ndarray:
+    return np.array([random_legal_action(rng, m) for m in masks])
+
+
+class TestHearthstoneVectorEnv:
+    def test_spaces_and_buffers(self) -> None:
+        venv = HearthstoneVectorEnv(3)
+        obs, _ = venv.reset(seed=0)
+        assert obs.shape == (3, 1036) and obs.dtype == np.float32
+        assert venv.action_masks().shape == (3, 34)
+        assert venv.observation_space.shape == (3, 1036)
+        # Sub-env buffers are rows of the batch arrays: no copy per step
+        for i, env in enumerate(venv.envs):
+            assert np.shares_memory(env._obs_buffer, obs[i])
+
+    def test_matches_independent_envs(self) -> None:
+        venv = HearthstoneVectorEnv(3)
+        refs = [HearthstoneEnv() for _ in range(3)]
+        obs, infos = venv.reset(seed=10)
+        for i, env in enumerate(refs):
+            np.testing.assert_array_equal(obs[i], env.reset(seed=10 + i)[0])
+
+        rng = np.random.default_rng(0)
+        finished = 0
+        for _ in range(300):
+            masks = infos["action_mask"]
+            for i, env in enumerate(refs):
+                np.testing.assert_array_equal(masks[i], env.action_masks())
+            actions = _random_actions(rng, masks)
+            obs, rewards, terms, truncs, infos = venv.step(actions)
+            for i, env in enumerate(refs):
+                ref_obs, ref_r, ref_term, ref_trunc, _ = env.step(int(actions[i]))
+                assert rewards[i] == ref_r
+                assert (terms[i], truncs[i]) == (ref_term, ref_trunc)
+                if ref_term or ref_trunc:
+                    finished += 1
+                    assert infos["_final_obs"][i]
+                    np.testing.assert_array_equal(infos["final_obs"][i], ref_obs)
+                    ref_obs, _ = env.reset()
+                np.testing.assert_array_equal(obs[i], ref_obs)
+        assert finished > 0
+
+    def test_seed_list_and_errors(self) -> None:
+        venv = HearthstoneVectorEnv(2)
+        obs, _ = venv.reset(seed=[7, 7])
+        np.testing.assert_array_equal(obs[0], obs[1])
+        with pytest.raises(ValueError):
+            venv.reset(seed=[1, 2, 3])
+        with pytest.raises(ValueError):
+            HearthstoneVectorEnv(2, obs_buffer=np.zeros((3, 1036), np.float32))
+
+    def test_shared_ghost_pool_and_call(self) -> None:
+        venv = HearthstoneVectorEnv(2)
+        pool = GhostPool(max_games=10)
+        venv.set_ghost_pool(pool)
+        assert all(env.ghost_pool is pool for env in venv.envs)
+        venv.reset(seed=0)
+        assert venv.get_attr("num_card_ids")[0] == venv.envs[0].num_card_ids
+        assert len(venv.call("get_board_power")) == 2
+
+    def test_perf_stats_merge_over_envs(self) -> None:
+        venv = HearthstoneVectorEnv(3, perf_stats=True)
+        venv.reset(seed=0)
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            venv.step(_random_actions(rng, venv.action_masks()))
+        stats = merge_perf_stats(list(venv.call("get_perf_stats")))
+        assert stats["step_calls"] == 60 and stats["reset_calls"] >= 3
+        assert HearthstoneVectorEnv(1).call("get_perf_stats") == ({},)
+
+
+class _LowestActionOpponent:
+    """Deterministic stand-in for MaskablePPO: lowest legal action > 0, else END_TURN."""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    def predict(self, obs, action_masks, deterministic=False):
+        self.batch_sizes.append(len(obs))
+        legal = action_masks.copy()
+        legal[:, 0] = False
+        return np.where(legal.any(axis=1), legal.argmax(axis=1), 0), None
+
+
+class TestBatchedEnemyTurns:
+    @staticmethod
+    def _compare(batched: HearthstoneVectorEnv, plain: HearthstoneVectorEnv) -> None:
+        obs, infos = batched.reset(seed=3)
+        np.testing.assert_array_equal(obs, plain.reset(seed=3)[0])
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            actions = _random_actions(rng, infos["action_mask"])
+            obs, rewards, terms, truncs, infos = batched.step(actions)
+            p_obs, p_rewards, p_terms, p_truncs, p_infos = plain.step(actions)
+            np.testing.assert_array_equal(obs, p_obs)
+            np.testing.assert_array_equal(rewards, p_rewards)
+            np.testing.assert_array_equal(terms | truncs, p_terms | p_truncs)
+            np.testing.assert_array_equal(infos["action_mask"], p_infos["action_mask"])
+
+    def test_bot_turns_match_sequential(self) -> None:
+        self._compare(HearthstoneVectorEnv(4, batch_enemy_turns=True), HearthstoneVectorEnv(4))
+
+    def test_neural_turns_share_one_predict(self) -> None:
+        batched = HearthstoneVectorEnv(4, batch_enemy_turns=True)
+        plain = HearthstoneVectorEnv(4)
+        model, ref_model = _LowestActionOpponent(), _LowestActionOpponent()
+        batched.call("set_opponent", model)
+        plain.call("set_opponent", ref_model)
+        self._compare(batched, plain)
+        assert set(ref_model.batch_sizes) == {1}
+        assert max(model.batch_sizes) > 1
+        assert sum(model.batch_sizes) == len(ref_model.batch_sizes)
+
+    def test_neural_turns_are_timed(self) -> None:
+        batched = HearthstoneVectorEnv(4, batch_enemy_turns=True, perf_stats=True)
+        plain = HearthstoneVectorEnv(4, perf_stats=True)
+        batched.call("set_opponent", _LowestActionOpponent())
+        plain.call("set_opponent", _LowestActionOpponent())
+        self._compare(batched, plain)
+        stats = merge_perf_stats(list(batched.call("get_perf_stats")))
+        ref = merge_perf_stats(list(plain.call("get_perf_stats")))
+        # One enemy_turn call per enemy turn, as when each env plays its own
+        assert stats["enemy_turn_calls"] == ref["enemy_turn_calls"] > 0
+        assert stats["enemy_turn_ns"] > 0 and stats["get_obs_calls"] == ref["get_obs_calls"]
+
+
+class TestSelfPlayVectorEnv:
+    def test_seats_share_game(self) -> None:
+        venv = SelfPlayVectorEnv(2)
+        obs, infos = venv.reset(seed=4)
+        assert venv.num_envs == 4 and obs.shape == (4, 1036)
+        host, guest = venv.envs[0], venv.envs[1]
+        assert guest.game is host.game and venv.envs[2].game is not host.game
+        assert (host.my_player_id, guest.my_player_id) == (0, 1)
+        # Row 1 is player 1's view of the same game
+        np.testing.assert_array_equal(obs[1], host._get_obs(player_idx=1))
+
+        assert infos["action_mask"][1, 1]  # ROLL on turn 1
+        _, rewards, *_, infos = venv.step([0, 1, 0, 0])
+        # Player 0 ended the turn and waits for player 1
+        assert host.game.players_ready[0] and not host.game.players_ready[1]
+        assert infos["action_mask"][0].tolist() == [True] + [False] * 33
+        assert rewards[0] == 0.0 and rewards[1] < 0.0
+        # Player 1 ends too: combat, both seats start turn 2
+        _, rewards, *_, infos = venv.step([0, 0, 0, 0])
+        assert host.game.turn_count == 2 and rewards[0] == -rewards[1]
+        assert infos["action_mask"][0, 1]
+
+    def test_perf_stats_shared_per_game(self) -> None:
+        venv = SelfPlayVectorEnv(2, perf_stats=True)
+        _, infos = venv.reset(seed=1)
+        rng = np.random.default_rng(0)
+        acting = 0
+        for _ in range(100):
+            acting += int((~venv._waiting).sum())
+            _, _, _, _, infos = venv.step(_random_actions(rng, infos["action_mask"]))
+        per_env = venv.call("get_perf_stats")
+        # Seat 1 is timed by its game's timers, reported by seat 0
+        assert per_env[1] == per_env[3] == {}
+        stats = merge_perf_stats(list(per_env))
+        assert stats["step_calls"] == acting and stats["combat_calls"] > 0
+
+    def test_round_reward_uses_hp_at_combat(self) -> None:
+        venv = SelfPlayVectorEnv(1)
+        venv.reset(seed=4)
+        game = venv.envs[0].game
+        venv.step([0, 1])
+        # Player 1 loses health during its own recruit phase, after player 0 ended
+        game.players[1].health -= 5
+        _, rewards, *_ = venv.step([0, 0])
+        assert game.turn_count == 2
+        # Empty boards tie: the recruit-phase loss is not damage dealt by player 0
+        assert rewards.tolist() == [0.0, 0.0]
+
+    def test_random_self_play(self) -> None:
+        venv = SelfPlayVectorEnv(3)
+        for env in venv.envs:
+            env.debug_obs = True  # waiting seats re-encode no zone
+        _, infos = venv.reset(seed=0)
+        rng = np.random.default_rng(0)
+        combats = np.zeros(venv.num_games, dtype=np.int64)
+        finished = 0
+        for _ in range(1500):
+            actions = _random_actions(rng, infos["action_mask"])
+            turns = [env.game.turn_count for env in venv.envs[0::2]]
+            _, rewards, terms, truncs, infos = venv.step(actions)
+            assert np.array_equal(terms[0::2], terms[1::2])
+            assert np.array_equal(truncs[0::2], truncs[1::2])
+            for g, env in enumerate(venv.envs[0::2]):
+                if terms[2 * g] or (not truncs[2 * g] and env.game.turn_count != turns[g]):
+                    combats[g] += 1
+                    # Round and terminal rewards are zero-sum between the seats
+                    assert rewards[2 * g] == -rewards[2 * g + 1]
+                if terms[2 * g] or truncs[2 * g]:
+                    finished += 1
+                    assert infos["_final_obs"][2 * g] and infos["_final_obs"][2 * g + 1]
+                    assert env.game.turn_count == 1
+        assert (combats > 0).all() and finished > 0
+
+
+class TestShardedVectorEnv:
+    def test_matches_in_process_env(self) -> None:
+        sharded = ShardedHearthstoneVectorEnv(3, num_shards=2)
+        try:
+            local = HearthstoneVectorEnv(3)
+            obs, _ = sharded.reset(seed=5)
+            np.testing.assert_array_equal(obs, local.reset(seed=5)[0])
+            rng = np.random.default_rng(1)
+            infos = {"action_mask": sharded.action_masks()}
+            for _ in range(150):
+                masks = infos["action_mask"]
+                np.testing.assert_array_equal(masks, local.action_masks())
+                actions = _random_actions(rng, masks)
+                obs, rewards, terms, truncs, infos = sharded.step(actions)
+                l_obs, l_rewards, l_terms, l_truncs, l_infos = local.step(actions)
+                np.testing.assert_array_equal(obs, l_obs)
+                np.testing.assert_array_equal(rewards, l_rewards)
+                np.testing.assert_array_equal(terms | truncs, l_terms | l_truncs)
+                if "final_obs" in l_infos:
+                    np.testing.assert_array_equal(infos["_final_obs"], l_infos["_final_obs"])
+        finally:
+            sharded.close()
+        assert sharded.closed